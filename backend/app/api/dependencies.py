@@ -4,9 +4,12 @@ from functools import lru_cache
 
 from ..application.services import ForecastingService, MetricsService
 from ..application.monitoring_service import MonitoringService
+from ..application.data_import_service import DataImportService
 from ..application.data_quality_service import DataQualityService
 from ..application.advanced_forecasting_service import AdvancedForecastingService
 from ..application.historical_analysis_service import HistoricalAnalysisService
+from ..application.history_export_service import HistoryExportService
+from ..application.model_retraining_service import ModelRetrainingService
 from ..container import Container
 
 
@@ -24,20 +27,29 @@ def get_metrics_service() -> MetricsService:
 
 
 def get_monitoring_service() -> MonitoringService:
-    container = get_container()
-    return MonitoringService(container.model_gateway)
+    return get_container().monitoring_service
 
 
 def get_data_quality_service() -> DataQualityService:
-    container = get_container()
-    return DataQualityService(container.history_gateway)
+    return get_container().data_quality_service
+
+
+def get_data_import_service() -> DataImportService:
+    return get_container().data_import_service
 
 
 def get_advanced_forecasting_service() -> AdvancedForecastingService:
-    container = get_container()
-    return AdvancedForecastingService(container.model_gateway, container.feature_engineer, container.history_gateway)
+    return get_container().advanced_forecasting_service
 
 
 def get_historical_analysis_service() -> HistoricalAnalysisService:
     container = get_container()
     return container.historical_analysis_service
+
+
+def get_history_export_service() -> HistoryExportService:
+    return get_container().history_export_service
+
+
+def get_model_retraining_service() -> ModelRetrainingService:
+    return get_container().model_retraining_service
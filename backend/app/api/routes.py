@@ -1,38 +1,57 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional
 
 from ..application.services import ForecastingService, MetricsService
 from ..application.monitoring_service import MonitoringService
+from ..application.data_import_service import DataImportService
 from ..application.data_quality_service import DataQualityService
 from ..application.advanced_forecasting_service import AdvancedForecastingService
 from ..application.historical_analysis_service import HistoricalAnalysisService
+from ..application.history_export_service import EXPORT_CHUNK_ROWS, HistoryExportService
+from ..application.model_retraining_service import ModelRetrainingService
 from ..domain.exceptions import HistoryNotAvailableError, ModelNotReadyError
 from .dependencies import (
     get_forecasting_service, 
     get_metrics_service,
     get_monitoring_service,
     get_data_quality_service,
+    get_data_import_service,
     get_advanced_forecasting_service,
     get_historical_analysis_service,
+    get_history_export_service,
+    get_model_retraining_service,
 )
 from .schemas import (
     BatchForecastRequest, 
     ForecastResponse, 
     MetricsResponse, 
     PointForecastRequest,
+    RecursiveForecastRequest,
     AdvancedForecastRequest,
     ScenarioForecastRequest,
+    ScenarioForecastResponse,
+    ScenarioGridRequest,
+    ScenarioGridResponse,
+    MonteCarloForecastRequest,
+    MonteCarloForecastResponse,
     SystemHealthResponse,
     DataQualityResponse,
+    DataQualityScanResponse,
     HistoricalAnalysisRequest,
     HistoricalAnalysisResponse,
     ModelManagementResponse,
+    RetrainJobResponse,
     DataImportRequest,
     DataImportResponse
 )
+from .serialization import serialize_many, serialize_one
+from ..infrastructure.services.export_formats import EXPORT_MEDIA_TYPES
+from ..infrastructure.services.quality_scan import MAX_SCAN_WORKERS
 
 router = APIRouter()
 
@@ -70,14 +89,28 @@ def forecast_next(
 def forecast_batch(
     payload: BatchForecastRequest,
     forecasting: ForecastingService = Depends(get_forecasting_service),
-) -> list[ForecastResponse]:
+) -> Response | list[ForecastResponse]:
     try:
         results = forecasting.forecast_batch(payload.dict(exclude_none=True))
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except (ModelNotReadyError, HistoryNotAvailableError) as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return [ForecastResponse(**item) for item in results]
+    return serialize_many(results, ForecastResponse)
+
+
+@router.post('/forecast/recursive', response_model=list[ForecastResponse])
+def forecast_recursive(
+    payload: RecursiveForecastRequest,
+    forecasting: ForecastingService = Depends(get_forecasting_service),
+) -> Response | list[ForecastResponse]:
+    try:
+        results = forecasting.forecast_recursive(payload.dict(exclude_none=True))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (ModelNotReadyError, HistoryNotAvailableError) as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return serialize_many(results, ForecastResponse)
 
 
 # Advanced forecasting endpoints
@@ -99,11 +132,11 @@ def forecast_advanced(
     return ForecastResponse(**result)
 
 
-@router.post('/forecast/scenarios', response_model=List[ForecastResponse])
+@router.post('/forecast/scenarios', response_model=List[ScenarioForecastResponse])
 def forecast_scenarios(
     payload: ScenarioForecastRequest,
     advanced_forecasting: AdvancedForecastingService = Depends(get_advanced_forecasting_service),
-) -> List[ForecastResponse]:
+) -> Response | List[ScenarioForecastResponse]:
     try:
         results = advanced_forecasting.forecast_multiple_scenarios(
             payload.weather_scenarios,
@@ -115,7 +148,48 @@ def forecast_scenarios(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except (ModelNotReadyError, HistoryNotAvailableError) as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return [ForecastResponse(**item) for item in results]
+    return serialize_many(results, ScenarioForecastResponse)
+
+
+@router.post('/forecast/scenarios/grid', response_model=ScenarioGridResponse)
+def forecast_scenario_grid(
+    payload: ScenarioGridRequest,
+    advanced_forecasting: AdvancedForecastingService = Depends(get_advanced_forecasting_service),
+) -> Response | ScenarioGridResponse:
+    try:
+        result = advanced_forecasting.forecast_scenario_grid(
+            {name: spec.dict(exclude_none=True) for name, spec in payload.drivers.items()},
+            payload.horizon,
+            include_confidence=payload.include_confidence,
+            ensemble_mode=payload.ensemble_mode,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (ModelNotReadyError, HistoryNotAvailableError) as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return serialize_one(result, ScenarioGridResponse)
+
+
+@router.post('/forecast/monte-carlo', response_model=MonteCarloForecastResponse)
+def forecast_monte_carlo(
+    payload: MonteCarloForecastRequest,
+    advanced_forecasting: AdvancedForecastingService = Depends(get_advanced_forecasting_service),
+) -> Response | MonteCarloForecastResponse:
+    try:
+        result = advanced_forecasting.forecast_monte_carlo(
+            payload.future_weather,
+            steps=payload.steps,
+            samples=payload.samples,
+            noise={name: spec.dict(exclude_none=True) for name, spec in (payload.noise or {}).items()},
+            correlation=payload.correlation,
+            percentiles=payload.percentiles,
+            seed=payload.seed,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except (ModelNotReadyError, HistoryNotAvailableError) as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return serialize_one(result, MonteCarloForecastResponse)
 
 
 # Monitoring endpoints
@@ -143,39 +217,85 @@ def get_performance_metrics(
 # Data quality endpoints
 @router.get('/data/quality', response_model=DataQualityResponse)
 def get_data_quality(
+    scope: str = Query("recent", description="recent: latest 1000 rows; all: whole history"),
     data_quality: DataQualityService = Depends(get_data_quality_service)
 ) -> DataQualityResponse:
     try:
-        quality_data = data_quality.assess_data_quality()
+        quality_data = data_quality.assess_data_quality(scope)
         return DataQualityResponse(**quality_data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@router.get('/data/quality/scan', response_model=DataQualityScanResponse)
+def scan_data_quality(
+    workers: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_SCAN_WORKERS,
+        description=f"Worker processes (defaults to the CPU count, max {MAX_SCAN_WORKERS})",
+    ),
+    chunk_rows: int = Query(250_000, ge=1_000, description="Rows per parallel chunk"),
+    data_quality: DataQualityService = Depends(get_data_quality_service)
+) -> DataQualityScanResponse:
+    try:
+        report = data_quality.scan_full_history(workers=workers, chunk_rows=chunk_rows)
+        return DataQualityScanResponse(**report)
+    except HistoryNotAvailableError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get('/data/export')
+def export_history(
+    start: Optional[datetime] = Query(None, description="First timestamp to include"),
+    end: Optional[datetime] = Query(None, description="Last timestamp to include"),
+    format: str = Query("csv", description="csv, ndjson or arrow (Arrow IPC stream, needs pyarrow)"),
+    include: str = Query("raw", description="raw, features (engineered features) or predictions (hindcasts)"),
+    horizon: Optional[int] = Query(None, ge=1, description="Forecast horizon for features/predictions"),
+    chunk_rows: int = Query(EXPORT_CHUNK_ROWS, ge=1_000, le=500_000, description="History rows read per chunk"),
+    exporter: HistoryExportService = Depends(get_history_export_service)
+) -> StreamingResponse:
+    try:
+        pieces = exporter.export(start, end, fmt=format, include=include, horizon=horizon, chunk_rows=chunk_rows)
+    except (ModelNotReadyError, HistoryNotAvailableError) as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    extension = 'arrows' if format == 'arrow' else format
+    return StreamingResponse(
+        pieces,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="history_{include}.{extension}"'},
+    )
+
+
 @router.post('/data/import', response_model=DataImportResponse)
 def import_data(
     file: UploadFile = File(...),
-    validation_rules: dict = None,
-    data_quality: DataQualityService = Depends(get_data_quality_service)
+    validation_rules: Optional[str] = Form(None, description="JSON object of validation rule overrides"),
+    data_import: DataImportService = Depends(get_data_import_service)
 ) -> DataImportResponse:
     try:
-        # Read uploaded file
-        content = file.file.read()
-        import pandas as pd
-        import io
-        
-        # Parse CSV
-        df = pd.read_csv(io.StringIO(content.decode('utf-8')))
-        
-        # Validate data
-        validation_result = data_quality.validate_import_data(df, validation_rules)
+        # The upload is already spooled to a temporary file; stream it in chunks
+        # instead of decoding the whole body into memory.
+        rules = json.loads(validation_rules) if validation_rules else None
+        result = data_import.import_csv(file.file, rules)
+        ingestion = result["ingestion"] or {}
         
         return DataImportResponse(
             import_id=f"import_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            status="completed" if validation_result["valid"] else "failed",
-            records_processed=len(df),
-            errors=validation_result["errors"],
-            quality_score=validation_result["quality_score"]
+            status="completed" if result["valid"] else "failed",
+            records_processed=result["records_processed"],
+            records_appended=ingestion.get("rows_appended", 0),
+            duplicates_skipped=ingestion.get("duplicates_skipped", 0),
+            errors=result["errors"],
+            warnings=result["warnings"],
+            violations=result["violations"],
+            quality_score=result["quality_score"]
         )
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -186,15 +306,17 @@ def import_data(
 def analyze_historical_performance(
     payload: HistoricalAnalysisRequest,
     analysis_service: HistoricalAnalysisService = Depends(get_historical_analysis_service)
-) -> HistoricalAnalysisResponse:
+) -> Response | HistoricalAnalysisResponse:
     try:
         result = analysis_service.analyse(
             start_date=payload.start_date,
             end_date=payload.end_date,
             aggregation=payload.aggregation,
             metrics=payload.metrics,
+            max_points=payload.max_points,
+            downsample=payload.downsample,
         )
-        return HistoricalAnalysisResponse(**result)
+        return serialize_one(result, HistoricalAnalysisResponse)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
@@ -222,16 +344,28 @@ def get_model_status(
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@router.post('/models/retrain')
+@router.post('/models/retrain', response_model=RetrainJobResponse, status_code=202)
 def retrain_model(
-    forecasting: ForecastingService = Depends(get_forecasting_service)
-) -> dict:
+    horizons: Optional[List[int]] = Query(None, description="Horizons to retrain (default: every trained horizon)"),
+    retraining: ModelRetrainingService = Depends(get_model_retraining_service),
+) -> Response:
     try:
-        # In production, this would trigger model retraining
-        return {
-            "status": "retraining_started",
-            "message": "Model retraining has been initiated",
-            "estimated_completion": datetime.now().isoformat()
-        }
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        response = serialize_one(retraining.enqueue(horizons), RetrainJobResponse)
+        if isinstance(response, Response):
+            response.status_code = 202
+        return response
+    except ModelNotReadyError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get('/models/retrain/{job_id}', response_model=RetrainJobResponse)
+def get_retrain_job(
+    job_id: str,
+    retraining: ModelRetrainingService = Depends(get_model_retraining_service),
+) -> Response:
+    try:
+        return serialize_one(retraining.get_job(job_id), RetrainJobResponse)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f'Unknown retraining job: {job_id}') from exc
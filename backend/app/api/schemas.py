@@ -25,6 +25,12 @@ class BatchForecastRequest(BaseModel):
     timestamps: Optional[List[str]] = None
 
 
+class RecursiveForecastRequest(BaseModel):
+    steps: int = Field(96, ge=1, description="Number of 15-minute steps to roll the horizon-1 model forward")
+    history: Optional[List[dict]] = None
+    future_weather: List[dict]
+
+
 class ForecastResponse(BaseModel):
     prediction_wh: float
     horizon_steps: int
@@ -36,6 +42,11 @@ class ForecastResponse(BaseModel):
     confidence_interval: Optional[Dict[str, float]] = None
 
 
+class ScenarioForecastResponse(ForecastResponse):
+    prediction_wh: Optional[float] = None
+    error: Optional[str] = Field(None, description="Why the scenario could not be forecast")
+
+
 class AdvancedForecastRequest(BaseModel):
     horizon: int = Field(1, description="Number of 15-minute steps ahead to forecast")
     include_confidence: bool = Field(True, description="Include confidence intervals")
@@ -50,6 +61,61 @@ class ScenarioForecastRequest(BaseModel):
     ensemble_mode: bool = Field(False, description="Use ensemble predictions for scenario forecasts")
 
 
+class GridDriverRange(BaseModel):
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    step: Optional[float] = Field(None, gt=0)
+    values: Optional[List[float]] = Field(None, description="Explicit values; overrides start/stop/step")
+
+
+class ScenarioGridRequest(BaseModel):
+    horizon: int = Field(1, description="Number of 15-minute steps ahead to forecast")
+    drivers: Dict[str, GridDriverRange] = Field(
+        ..., description="Weather driver ranges (e.g. GHI, temp, clouds_all, humidity) to sweep"
+    )
+    include_confidence: bool = Field(False, description="Include lower/upper interval arrays")
+    ensemble_mode: bool = Field(False, description="Use ensemble predictions for the grid")
+
+
+class ScenarioGridResponse(BaseModel):
+    drivers: List[str]
+    axes: Dict[str, List[float]]
+    shape: List[int] = Field(..., description="Grid axis lengths followed by the number of forecast steps")
+    horizon_steps: int
+    timestamps: List[str]
+    predictions: List[float] = Field(..., description="Row-major predictions over shape")
+    lower: Optional[List[float]] = None
+    upper: Optional[List[float]] = None
+
+
+class NoiseModelSpec(BaseModel):
+    std: Optional[float] = Field(None, ge=0, description="Noise standard deviation (fraction of the value when multiplicative)")
+    kind: Optional[str] = Field(None, description="additive or multiplicative")
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+
+class MonteCarloForecastRequest(BaseModel):
+    future_weather: List[dict]
+    steps: int = Field(96, ge=1, description="Number of 15-minute steps to simulate")
+    samples: int = Field(1000, ge=1, le=1000, description="Number of weather trajectories to draw")
+    noise: Optional[Dict[str, NoiseModelSpec]] = Field(None, description="Per-driver noise overrides")
+    correlation: float = Field(0.9, ge=0, lt=1, description="AR(1) correlation of the noise between steps")
+    percentiles: Optional[List[float]] = None
+    seed: Optional[int] = None
+
+
+class MonteCarloForecastResponse(BaseModel):
+    horizon_steps: int
+    samples: int = Field(..., description="Trajectories simulated, at most what the served model allows for the steps")
+    requested_samples: int
+    timestamps: List[str]
+    mean: List[float]
+    std: List[float]
+    percentiles: Dict[str, List[float]]
+    perturbed_drivers: List[str]
+
+
 class MetricsResponse(BaseModel):
     horizon: int
     mae: float
@@ -73,9 +139,52 @@ class DataQualityResponse(BaseModel):
     total_records: int
     missing_values: Dict[str, int]
     data_completeness: float
-    anomaly_count: int
+    lifetime_anomaly_count: int = Field(..., description="Anomalies among every row the detector has scored")
+    lifetime_scored_rows: int = 0
+    anomaly_rate: float = Field(0.0, description="lifetime_anomaly_count / lifetime_scored_rows")
     quality_score: float
     last_updated: datetime
+    scope: str = "recent"
+    range_violations: Dict[str, int] = {}
+    duplicate_timestamps: Optional[int] = None
+    gap_count: Optional[int] = None
+    missing_slots: Optional[int] = None
+    longest_gap_slots: Optional[int] = None
+    slot_coverage: Optional[float] = None
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+
+
+class FrozenRunSummary(BaseModel):
+    runs: int
+    slots: int
+    longest_slots: int
+
+
+class DataQualityScanResponse(BaseModel):
+    fingerprint: str
+    cached: bool
+    generated_at: datetime
+    total_records: int
+    missing_values: Dict[str, int]
+    data_completeness: float
+    range_violations: Dict[str, int]
+    invalid_timestamps: int
+    duplicate_timestamps: int
+    gap_count: int
+    missing_slots: int
+    longest_gap_slots: int
+    slot_coverage: float
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+    frozen_runs: Dict[str, FrozenRunSummary]
+    frozen_min_slots: int
+    scored_rows: int
+    anomaly_count: int
+    anomaly_rate: float
+    quality_score: float
+    chunks: int
+    workers: int
 
 
 class HistoricalAnalysisRequest(BaseModel):
@@ -83,6 +192,8 @@ class HistoricalAnalysisRequest(BaseModel):
     end_date: datetime
     aggregation: str = Field("hour", description="Aggregation level: minute, hour, day")
     metrics: List[str] = Field(["mae", "rmse"], description="Metrics to calculate")
+    max_points: Optional[int] = Field(None, ge=3, description="Downsample data_points to at most this many records")
+    downsample: str = Field("lttb", description="Downsampling method: lttb or minmax")
 
 
 class HistoricalAnalysisResponse(BaseModel):
@@ -90,6 +201,7 @@ class HistoricalAnalysisResponse(BaseModel):
     metrics: Dict[str, float]
     data_points: List[Dict[str, Any]]
     trends: Dict[str, str]
+    source_points: Optional[int] = None
 
 
 class ModelManagementResponse(BaseModel):
@@ -100,6 +212,19 @@ class ModelManagementResponse(BaseModel):
     training_status: str
 
 
+class RetrainJobResponse(BaseModel):
+    job_id: str
+    status: str
+    stage: str
+    progress: float
+    horizons: List[int]
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    results: List[Dict[str, Any]] = Field(default_factory=list)
+    error: Optional[str] = None
+
+
 class AlertRule(BaseModel):
     id: str
     name: str
@@ -125,9 +250,20 @@ class DataImportRequest(BaseModel):
     auto_process: bool = True
 
 
+class RuleViolation(BaseModel):
+    severity: str
+    count: int
+    rows: List[int] = Field(..., description="0-based data row indices, capped at the first 1000")
+    truncated: bool = False
+
+
 class DataImportResponse(BaseModel):
     import_id: str
     status: str
     records_processed: int
+    records_appended: int = 0
+    duplicates_skipped: int = 0
     errors: List[str]
+    warnings: List[str] = []
+    violations: Dict[str, RuleViolation] = {}
     quality_score: float
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+
+import numpy as np
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:  # orjson is optional; the stdlib encoder is used when it is not installed.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment environment
+    orjson = None
+
+
+def _fast_json_enabled() -> bool:
+    value = os.environ.get('API_FAST_JSON')
+    if value is None:
+        return True
+    return str(value).strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
+FAST_JSON_ENABLED = _fast_json_enabled()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(content: Any) -> bytes:
+    """Encode trusted response content without going through pydantic."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when available."""
+
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(model: Type[BaseModel]) -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[str, ...]]:
+    fields = []
+    required = []
+    for name, info in model.model_fields.items():
+        key = info.serialization_alias or name
+        if info.is_required():
+            required.append(key)
+            fields.append((key, None))
+        else:
+            fields.append((key, info.get_default(call_default_factory=True)))
+    return tuple(fields), tuple(required)
+
+
+def _project(record: Dict[str, Any], model: Type[BaseModel], fields, required) -> Dict[str, Any]:
+    if any(name not in record for name in required):
+        # Not trusted output after all: validate, so a bad record fails like the pydantic path.
+        return model(**record).model_dump(mode='json', by_alias=True)
+    return {name: record.get(name, default) for name, default in fields}
+
+
+def project_record(record: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """Shape a record like ``model(**record).model_dump()``, validating only records missing a required field."""
+    fields, required = _schema_fields(model)
+    return _project(record, model, fields, required)
+
+
+def project_records(records: Iterable[Dict[str, Any]], model: Type[BaseModel]) -> List[Dict[str, Any]]:
+    fields, required = _schema_fields(model)
+    return [_project(record, model, fields, required) for record in records]
+
+
+def serialize_one(record: Dict[str, Any], model: Type[BaseModel]) -> Response | BaseModel:
+    if not FAST_JSON_ENABLED:
+        return model(**record)
+    return FastJSONResponse(project_record(record, model))
+
+
+def serialize_many(records: Sequence[Dict[str, Any]], model: Type[BaseModel]) -> Response | List[BaseModel]:
+    if not FAST_JSON_ENABLED:
+        return [model(**item) for item in records]
+    return FastJSONResponse(project_records(records, model))
@@ -3,12 +3,37 @@ from __future__ import annotations
 import numpy as np
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
+from statistics import NormalDist
 from sklearn.exceptions import NotFittedError
 import pandas as pd
 
 from ..domain.interfaces import ModelGateway, HistoryGateway
-from ..infrastructure.services.feature_engineering import FeatureEngineer
+from ..infrastructure.services.feature_engineering import FeatureEngineer, feature_frame
+from ..infrastructure.services.prediction_intervals import interval_widths, quantile_bands
+from ..infrastructure.services.recursive_features import (
+    FeatureLayout,
+    RecursiveFeatureState,
+    future_feature_block,
+    roll_forward,
+)
+from ..infrastructure.services.weather_perturbation import (
+    DEFAULT_NOISE_MODELS,
+    DEFAULT_STEP_CORRELATION,
+    NoiseModel,
+    perturb_weather,
+)
+
+ENSEMBLE_WEIGHTS: Dict[str, float] = {'lightgbm': 0.7, 'random_forest': 0.3}
+MAX_GRID_POINTS = 200_000
+MAX_GRID_CELLS = 2_000_000
+GRID_CHUNK_ROWS = 65_536
+# Requests run synchronously, so the cap is the interactive target (1000 x 96
+# steps within ~2 s), tightened for larger models: tree evaluations per request
+# are bounded by what benchmarks/monte_carlo_benchmark.py measured (~4.5M/s).
+MONTE_CARLO_MAX_SAMPLES = 1000
+MONTE_CARLO_MAX_SAMPLE_STEPS = 1000 * 96
+MONTE_CARLO_TREE_BUDGET = 10_000_000
+MONTE_CARLO_PERCENTILES: tuple[float, ...] = (5.0, 10.0, 50.0, 90.0, 95.0)
 
 
 class AdvancedForecastingService:
@@ -18,8 +43,16 @@ class AdvancedForecastingService:
         self.model_gateway = model_gateway
         self.feature_engineer = feature_engineer
         self.history_gateway = history_gateway
-        self._ensemble_registry: dict[int, dict[str, Any]] = {}
     
+    def warm_up(self) -> None:
+        """Load model states and ensemble members for every trained horizon."""
+        for horizon in self.model_gateway.available_horizons():
+            try:
+                self._load_state(horizon)
+                self.model_gateway.get_ensemble_members(horizon)
+            except Exception as exc:
+                print(f'Warning: failed to warm model cache for horizon={horizon}: {exc}')
+
     def _current_timestamp(self) -> str:
         return datetime.utcnow().replace(microsecond=0).isoformat()
     
@@ -35,37 +68,9 @@ class AdvancedForecastingService:
         feature_frame = self.feature_engineer.features_from_history(prepared_history, state)
         return feature_frame, prepared_history
 
-    def _train_random_forest(self, horizon: int, target_features: list[str]) -> Optional[RandomForestRegressor]:
-        try:
-            dataset = self.history_gateway.load()
-            if dataset.empty:
-                return None
-            frame = self.feature_engineer.make_features(dataset, horizon=horizon)
-            feature_cols = [c for c in frame.columns if c not in {'energy_wh', 'target'}]
-            intersecting = [col for col in target_features if col in frame.columns]
-            if not intersecting:
-                return None
-            model = RandomForestRegressor(
-                n_estimators=200,
-                max_depth=12,
-                min_samples_split=4,
-                random_state=42,
-                n_jobs=-1,
-            )
-            model.fit(frame[intersecting], frame['target'])
-            return model
-        except Exception as exc:
-            print(f'Warning: failed to train random forest ensemble for horizon={horizon}: {exc}')
-            return None
-
     def _get_ensemble_models(self, horizon: int, state) -> dict[str, Any]:
-        if horizon in self._ensemble_registry:
-            return self._ensemble_registry[horizon]
         models = {'lightgbm': state.model}
-        rf_model = self._train_random_forest(horizon, state.features)
-        if rf_model is not None:
-            models['random_forest'] = rf_model
-        self._ensemble_registry[horizon] = models
+        models.update(self.model_gateway.get_ensemble_members(horizon))
         return models
     
     def forecast_with_confidence(
@@ -99,7 +104,7 @@ class AdvancedForecastingService:
         
         if include_confidence:
             confidence_interval = self._calculate_confidence_interval(
-                prediction, prepared_history, state
+                prediction, latest_features, state
             )
             result["confidence_interval"] = confidence_interval
         
@@ -122,10 +127,9 @@ class AdvancedForecastingService:
         if not predictions:
             raise ValueError("All ensemble models failed")
         
-        weights = {'lightgbm': 0.7, 'random_forest': 0.3}
-        total_weight = sum(weights.get(name, 0.1) for name in predictions.keys())
+        total_weight = sum(ENSEMBLE_WEIGHTS.get(name, 0.1) for name in predictions.keys())
         ensemble_prediction = sum(
-            predictions[name] * weights.get(name, 0.1)
+            predictions[name] * ENSEMBLE_WEIGHTS.get(name, 0.1)
             for name in predictions.keys()
         ) / total_weight
         
@@ -138,72 +142,124 @@ class AdvancedForecastingService:
         }
         
         if include_confidence:
-            pred_values = list(predictions.values())
-            pred_std = np.std(pred_values)
-            confidence_interval = {
-                "lower": float(ensemble_prediction - 1.96 * pred_std),
-                "upper": float(ensemble_prediction + 1.96 * pred_std),
-                "std": float(pred_std)
-            }
-            result["confidence_interval"] = confidence_interval
+            result["confidence_interval"] = self._confidence_intervals(
+                np.array([ensemble_prediction]),
+                latest_features,
+                state,
+                member_predictions=np.array(list(predictions.values()))[:, None],
+            )[0]
         
         return result
     
     def _calculate_confidence_interval(
         self, 
         prediction: float, 
-        historical_data: Any, 
+        features: pd.DataFrame, 
         state: Any
     ) -> Dict[str, float]:
         """Calculate confidence interval for prediction."""
-        try:
-            # Use historical prediction errors to estimate confidence
-            # This is a simplified approach - in production, you'd use more sophisticated methods
-            
-            # Get recent historical predictions vs actuals
-            recent_data = historical_data.tail(100)  # Last 100 points
-            if len(recent_data) < 10:
-                # Fallback to simple percentage-based confidence
-                return {
-                    "lower": float(prediction * 0.8),
-                    "upper": float(prediction * 1.2),
-                    "std": float(prediction * 0.1)
-                }
-            
-            # Calculate historical prediction errors
-            historical_features = self.feature_engineer.make_features(recent_data, horizon=state.horizon)
-            if historical_features.empty:
-                return {
-                    "lower": float(prediction * 0.8),
-                    "upper": float(prediction * 1.2),
-                    "std": float(prediction * 0.1)
-                }
-            
-            # Get predictions for historical data
-            hist_features = historical_features.drop(['energy_wh', 'target'], axis=1, errors='ignore')
-            hist_predictions = state.model.predict(hist_features)
-            
-            # Calculate errors
-            actuals = historical_features['target'].values
-            errors = actuals - hist_predictions
-            error_std = np.std(errors)
-            
-            # Calculate confidence interval
-            confidence_interval = {
-                "lower": float(prediction - 1.96 * error_std),
-                "upper": float(prediction + 1.96 * error_std),
-                "std": float(error_std)
-            }
-            
-            return confidence_interval
-        except Exception:
-            # Fallback confidence interval
-            return {
-                "lower": float(prediction * 0.8),
-                "upper": float(prediction * 1.2),
-                "std": float(prediction * 0.1)
-            }
+        return self._confidence_intervals(np.array([prediction]), features, state)[0]
+
+    def _confidence_intervals(
+        self,
+        predictions: np.ndarray,
+        features: pd.DataFrame,
+        state: Any,
+        member_predictions: Optional[np.ndarray] = None,
+    ) -> List[Dict[str, float]]:
+        """Prediction intervals for each feature row, one dict per row."""
+        columns = self._interval_columns(predictions, features, state, member_predictions)
+        names = list(columns)
+        return [
+            dict(zip(names, values))
+            for values in zip(*(columns[name].tolist() for name in names))
+        ]
+
+    def _interval_columns(
+        self,
+        predictions: np.ndarray,
+        features: pd.DataFrame,
+        state: Any,
+        member_predictions: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Interval bounds as column arrays aligned with ``predictions``.
+
+        Preference order: quantile LightGBM bands, conformal half-widths stored
+        with the artifact, ensemble member spread, then a fixed +/-20% band.
+        """
+        predictions = np.asarray(predictions, dtype=float)
+        if state.quantile_models:
+            return self._quantile_interval_columns(features, state)
+        if state.calibration:
+            halfwidths, stds = interval_widths(state.calibration, features)
+        elif member_predictions is not None and len(member_predictions) > 1:
+            stds = np.std(member_predictions, axis=0)
+            halfwidths = 1.96 * stds
+        else:
+            # Artifacts trained before interval calibration existed.
+            halfwidths = np.abs(predictions) * 0.2
+            stds = np.abs(predictions) * 0.1
+        return {
+            "lower": predictions - halfwidths,
+            "upper": predictions + halfwidths,
+            "std": np.asarray(stds, dtype=float),
+        }
+
+    def _quantile_interval_columns(
+        self,
+        features: pd.DataFrame,
+        state: Any,
+    ) -> Dict[str, np.ndarray]:
+        """The outer conformalised quantile bands, plus one ``p{level}`` column per level.
+
+        The bands come from separate quantile boosters, so the point prediction
+        (and ``p50``) may fall outside them for some rows; they are returned as
+        fitted rather than stretched to cover the prediction, which would break
+        their calibrated coverage.
+        """
+        levels, bands = quantile_bands(state.calibration, state.quantile_models, features)
+        coverage = (state.calibration.get('quantiles') or {}).get('coverage', levels[-1] - levels[0])
+        z_score = NormalDist().inv_cdf(0.5 + coverage / 2) if 0 < coverage < 1 else 1.96
+        columns = {
+            "lower": bands[:, 0],
+            "upper": bands[:, -1],
+            "std": (bands[:, -1] - bands[:, 0]) / (2 * z_score),
+        }
+        for idx, level in enumerate(levels):
+            columns[f"p{round(level * 100):g}"] = bands[:, idx]
+        return columns
     
+    def _scenario_context(self, state) -> tuple[pd.DataFrame, FeatureLayout]:
+        """Prepared history window and feature layout shared by every scenario."""
+        historical_data = self.history_gateway.load(limit=self.feature_engineer.history_window)
+        if historical_data.empty:
+            raise ValueError("No historical data available for scenario forecasting")
+        prepared_history = self.feature_engineer.normalise_history(historical_data)
+        prepared = self.feature_engineer.prepare_history(prepared_history)
+        layout = FeatureLayout.from_features(state.features, list(prepared.columns))
+        return prepared, layout
+
+    def _predict_block(
+        self,
+        models: Dict[str, Any],
+        features: pd.DataFrame,
+    ) -> tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """One predict per model over the whole block, blended with the ensemble weights."""
+        per_model_predictions: Dict[str, np.ndarray] = {}
+        for name, model in models.items():
+            try:
+                per_model_predictions[name] = np.asarray(model.predict(features), dtype=float)
+            except Exception as exc:
+                print(f'Warning: Ensemble model {name} failed during scenario forecasting: {exc}')
+        if not per_model_predictions:
+            raise ValueError("All ensemble models failed")
+
+        total_weight = sum(ENSEMBLE_WEIGHTS.get(name, 0.1) for name in per_model_predictions)
+        blended = sum(
+            preds * ENSEMBLE_WEIGHTS.get(name, 0.1) for name, preds in per_model_predictions.items()
+        ) / total_weight
+        return blended, per_model_predictions
+
     def forecast_multiple_scenarios(
         self,
         weather_scenarios: List[Dict[str, Any]],
@@ -211,109 +267,247 @@ class AdvancedForecastingService:
         include_confidence: bool = False,
         ensemble_mode: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Generate forecasts for multiple weather scenarios."""
-        historical_data = self.history_gateway.load()
-        if historical_data.empty:
-            raise ValueError("No historical data available for scenario forecasting")
+        """Generate forecasts for multiple weather scenarios.
 
-        prepared_history = self.feature_engineer.normalise_history(historical_data)
+        History features are built once over ``history_window``; every scenario's
+        future rows are stacked into one block and scored with a single predict
+        per model.
+        """
         state = self._load_state(horizon)
+        prepared, layout = self._scenario_context(state)
+        steps = max(state.horizon, 1)
 
-        base_time = prepared_history['Time'].max()
-        if pd.isna(base_time):
-            raise ValueError("Historical data is missing valid timestamps")
+        baseline = self.feature_engineer.baseline_exogenous_path(prepared, layout.exogenous_columns, steps)
+        results: List[List[Dict[str, Any]]] = [[] for _ in weather_scenarios]
+        valid_ids: List[int] = []
+        exogenous_paths: List[np.ndarray] = []
+        for i, scenario in enumerate(weather_scenarios):
+            try:
+                exogenous_paths.append(self._scenario_exogenous(scenario, layout, baseline))
+                valid_ids.append(i)
+            except Exception as e:
+                results[i].append({
+                    "scenario_id": i,
+                    "scenario_name": scenario.get('name', f'Scenario {i+1}'),
+                    "prediction_wh": None,
+                    "horizon_steps": state.horizon,
+                    "error": str(e),
+                    "timestamp": self._current_timestamp()
+                })
 
-        results: List[Dict[str, Any]] = []
-        freq = pd.to_timedelta(15, unit='m')
+        if valid_ids:
+            exogenous = np.stack(exogenous_paths)
+            features = feature_frame(future_feature_block(prepared, layout, exogenous), layout.features)
 
-        base_models = None
-        if ensemble_mode:
-            base_models = self._get_ensemble_models(state.horizon, state)
-        else:
-            base_models = {'lightgbm': state.model}
-        weights = {'lightgbm': 0.7, 'random_forest': 0.3}
-        total_weight = sum(weights.get(name, 0.1) for name in base_models.keys())
-
-        confidence_template = None
-        if include_confidence and not ensemble_mode:
-            confidence_template = self._calculate_confidence_interval(
-                state.model.predict(self.feature_engineer.features_from_history(prepared_history, state))[-1],
-                prepared_history,
-                state,
-            )
+            models = self._get_ensemble_models(state.horizon, state) if ensemble_mode else {'lightgbm': state.model}
+            preds, per_model_predictions = self._predict_block(models, features)
 
-        for i, scenario in enumerate(weather_scenarios):
-            try:
-                future_rows: List[Dict[str, Any]] = []
-                for step in range(max(state.horizon, 1)):
-                    target_time = base_time + freq * (step + 1)
-                    row: Dict[str, Any] = {'Time': target_time.isoformat()}
-                    for key, value in scenario.items():
-                        if key == 'name':
-                            continue
-                        row[key] = value
-                    future_rows.append(row)
-
-                future_df = pd.DataFrame(future_rows)
-                future_df = self.feature_engineer.normalise_future(future_df)
-
-                feature_block = self.feature_engineer.features_from_future(
-                    prepared_history,
-                    future_df,
+            intervals = None
+            if include_confidence:
+                intervals = self._confidence_intervals(
+                    preds,
+                    features,
                     state,
+                    member_predictions=np.vstack(list(per_model_predictions.values())),
                 )
-                lightgbm_preds = state.model.predict(feature_block)
-                ensemble_preds = lightgbm_preds
-                per_model_predictions = {'lightgbm': lightgbm_preds}
-
-                if ensemble_mode:
-                    summed = np.zeros_like(lightgbm_preds, dtype=float)
-                    for name, model in base_models.items():
-                        try:
-                            preds = model.predict(feature_block)
-                            per_model_predictions[name] = preds
-                            summed += preds * weights.get(name, 0.1)
-                        except Exception as exc:
-                            print(f'Warning: Ensemble model {name} failed during scenario forecasting: {exc}')
-                    ensemble_preds = summed / total_weight if total_weight else lightgbm_preds
-                else:
-                    ensemble_preds = lightgbm_preds
-
-                scenario_timestamps = self.feature_engineer.extract_timestamps(future_df)
-
-                for step_idx, pred in enumerate(ensemble_preds):
-                    timestamp = (
-                        scenario_timestamps[step_idx]
-                        if step_idx < len(scenario_timestamps)
-                        else self._current_timestamp()
-                    )
+
+            origin = prepared.index[-1]
+            timestamps = [
+                (origin + pd.Timedelta(minutes=15) * (step + 1)).isoformat() for step in range(steps)
+            ]
+            for block_idx, i in enumerate(valid_ids):
+                scenario = weather_scenarios[i]
+                for step_idx in range(steps):
+                    row = block_idx * steps + step_idx
                     record: Dict[str, Any] = {
                         "scenario_id": i,
                         "scenario_name": scenario.get('name', f'Scenario {i+1}'),
-                        "prediction_wh": float(pred),
+                        "prediction_wh": float(preds[row]),
                         "horizon_steps": state.horizon,
-                        "timestamp": timestamp,
+                        "timestamp": timestamps[step_idx],
                         "weather_conditions": scenario,
                         "step_index": step_idx + 1,
                     }
-                    if include_confidence:
-                        if ensemble_mode:
-                            candidate = [per_model_predictions[name][step_idx] for name in per_model_predictions]
-                            pred_std = float(np.std(candidate))
-                            record["confidence_interval"] = {
-                                "lower": float(pred - 1.96 * pred_std),
-                                "upper": float(pred + 1.96 * pred_std),
-                                "std": pred_std,
-                            }
-                        elif confidence_template:
-                            record["confidence_interval"] = confidence_template
-                    results.append(record)
-            except Exception as e:
-                results.append({
-                    "scenario_id": i,
-                    "scenario_name": scenario.get('name', f'Scenario {i+1}'),
-                    "error": str(e),
-                    "timestamp": self._current_timestamp()
-                })
+                    if intervals:
+                        record["confidence_interval"] = intervals[row]
+                    results[i].append(record)
+
+        return [record for records in results for record in records]
+
+    @staticmethod
+    def _scenario_exogenous(
+        scenario: Dict[str, Any],
+        layout: FeatureLayout,
+        baseline: np.ndarray,
+    ) -> np.ndarray:
+        """Exogenous ``(steps, C)`` path for a scenario, holding its values at every step.
+
+        Columns it omits follow ``baseline``: weather drivers keep their last
+        observed value, clock and sun columns advance with each step.
+        """
+        values = baseline.copy()
+        for slot, column in enumerate(layout.exogenous_columns):
+            if column in scenario and scenario[column] is not None:
+                values[:, slot] = float(scenario[column])
+        return values
+
+    @staticmethod
+    def _grid_axis(name: str, spec: Dict[str, Any]) -> np.ndarray:
+        values = spec.get('values')
+        if values:
+            return np.asarray(values, dtype=float)
+        start, stop, step = spec.get('start'), spec.get('stop'), spec.get('step')
+        if start is None or stop is None or not step or step <= 0:
+            raise ValueError(f"Grid driver {name} needs 'values' or 'start', 'stop' and a positive 'step'")
+        if stop < start:
+            raise ValueError(f"Grid driver {name} has stop < start")
+        return np.arange(start, stop + step / 2, step, dtype=float)
+
+    def forecast_scenario_grid(
+        self,
+        drivers: Dict[str, Dict[str, Any]],
+        horizon: int = 1,
+        include_confidence: bool = False,
+        ensemble_mode: bool = False,
+    ) -> Dict[str, Any]:
+        """Evaluate the cartesian product of weather driver ranges.
+
+        Results are dense arrays in row-major order over ``shape``: one axis per
+        driver (in request order) followed by the forecast step.
+        """
+        if not drivers:
+            raise ValueError("At least one grid driver is required")
+        state = self._load_state(horizon)
+        prepared, layout = self._scenario_context(state)
+        steps = max(state.horizon, 1)
 
-        return results
+        names = list(drivers)
+        unknown = [name for name in names if name not in layout.exogenous_columns]
+        if unknown:
+            raise ValueError(f"Unknown grid drivers for this model: {unknown}")
+
+        axes = [self._grid_axis(name, drivers[name]) for name in names]
+        grid_shape = tuple(len(axis) for axis in axes)
+        points = int(np.prod(grid_shape))
+        if points == 0:
+            raise ValueError("Grid is empty")
+        if points > MAX_GRID_POINTS or points * steps > MAX_GRID_CELLS:
+            raise ValueError(
+                f"Grid of {points} points x {steps} steps exceeds the limit of "
+                f"{MAX_GRID_POINTS} points / {MAX_GRID_CELLS} values"
+            )
+
+        # Drivers outside the grid follow the baseline path; clock and sun columns advance per step.
+        baseline = self.feature_engineer.baseline_exogenous_path(prepared, layout.exogenous_columns, steps)
+        mesh = [values.ravel() for values in np.meshgrid(*axes, indexing='ij')]
+        slots = [layout.exogenous_columns.index(name) for name in names]
+
+        models = self._get_ensemble_models(state.horizon, state) if ensemble_mode else {'lightgbm': state.model}
+        predictions = np.empty(points * steps, dtype=float)
+        bounds: Dict[str, np.ndarray] = {}
+        chunk_points = max(1, GRID_CHUNK_ROWS // steps)
+        for start in range(0, points, chunk_points):
+            stop = min(points, start + chunk_points)
+            chunk = np.repeat(baseline[None], stop - start, axis=0)
+            for slot, values in zip(slots, mesh):
+                chunk[:, :, slot] = values[start:stop, None]
+            features = feature_frame(future_feature_block(prepared, layout, chunk), layout.features)
+            preds, per_model_predictions = self._predict_block(models, features)
+            rows = slice(start * steps, stop * steps)
+            predictions[rows] = preds
+            if include_confidence:
+                columns = self._interval_columns(
+                    preds,
+                    features,
+                    state,
+                    member_predictions=np.vstack(list(per_model_predictions.values())),
+                )
+                for key in ('lower', 'upper'):
+                    bounds.setdefault(key, np.empty(points * steps, dtype=float))[rows] = columns[key]
+
+        origin = prepared.index[-1]
+        result: Dict[str, Any] = {
+            "drivers": names,
+            "axes": {name: axis.tolist() for name, axis in zip(names, axes)},
+            "shape": [*grid_shape, steps],
+            "horizon_steps": state.horizon,
+            "timestamps": [
+                (origin + pd.Timedelta(minutes=15) * (step + 1)).isoformat() for step in range(steps)
+            ],
+            "predictions": predictions.tolist(),
+        }
+        for key, values in bounds.items():
+            result[key] = values.tolist()
+        return result
+
+    @staticmethod
+    def _monte_carlo_limit(model: Any) -> int:
+        """Largest samples x steps the served model simulates within the interactive budget."""
+        booster = getattr(model, 'booster_', model)
+        trees = booster.num_trees() if hasattr(booster, 'num_trees') else 0
+        if not trees:
+            return MONTE_CARLO_MAX_SAMPLE_STEPS
+        return max(1, min(MONTE_CARLO_MAX_SAMPLE_STEPS, MONTE_CARLO_TREE_BUDGET // trees))
+
+    def forecast_monte_carlo(
+        self,
+        future_weather: List[Dict[str, Any]],
+        steps: int = 96,
+        samples: int = 1000,
+        noise: Optional[Dict[str, Dict[str, Any]]] = None,
+        correlation: float = DEFAULT_STEP_CORRELATION,
+        percentiles: Optional[List[float]] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Propagate weather forecast uncertainty through the recursive horizon-1 model.
+
+        The supplied weather path is perturbed with AR(1) noise (``correlation``
+        between consecutive steps) into one ``(samples, steps, drivers)`` tensor.
+        All samples then advance together, one batched predict per step, and the
+        per-step percentiles across samples form the bands. ``samples`` is
+        reduced to what the served model simulates within the interactive
+        budget; the response reports both counts.
+        """
+        if not 1 <= samples <= MONTE_CARLO_MAX_SAMPLES:
+            raise ValueError(f"samples must be between 1 and {MONTE_CARLO_MAX_SAMPLES}")
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        levels = sorted(percentiles or MONTE_CARLO_PERCENTILES)
+        if any(not 0 <= level <= 100 for level in levels):
+            raise ValueError("percentiles must be between 0 and 100")
+
+        state = self._load_state(1)
+        limit = self._monte_carlo_limit(state.model)
+        if steps > limit:
+            raise ValueError(f"steps must be at most {limit} for the served model (requested {steps})")
+        requested_samples = samples
+        samples = min(samples, limit // steps)
+        prepared, layout = self._scenario_context(state)
+        future_df = self.feature_engineer.normalise_future(
+            self.feature_engineer.future_from_payload(future_weather)
+        )
+
+        noise_models = dict(DEFAULT_NOISE_MODELS)
+        for name, spec in (noise or {}).items():
+            noise_models[name] = NoiseModel.from_dict(spec, DEFAULT_NOISE_MODELS.get(name))
+
+        feature_state = RecursiveFeatureState(prepared, layout, batch_size=samples)
+        base_path = self.feature_engineer.exogenous_path(future_df, layout.exogenous_columns, prepared, steps)
+        weather = perturb_weather(base_path, layout.exogenous_columns, noise_models, samples, correlation, seed)
+
+        origin = feature_state.timestamp
+        predictions = roll_forward(state.model, feature_state, weather, steps)
+        bands = np.percentile(predictions, levels, axis=0)
+
+        return {
+            "horizon_steps": state.horizon,
+            "samples": samples,
+            "requested_samples": requested_samples,
+            "timestamps": [
+                (origin + pd.Timedelta(minutes=15) * (step + 1)).isoformat() for step in range(steps)
+            ],
+            "mean": predictions.mean(axis=0).tolist(),
+            "std": predictions.std(axis=0).tolist(),
+            "percentiles": {f"p{level:g}": band.tolist() for level, band in zip(levels, bands)},
+            "perturbed_drivers": [name for name in layout.exogenous_columns if name in noise_models],
+        }
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import IO, Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from ..domain.interfaces import HistoryGateway
+from .data_quality_service import IMPORT_CHUNK_ROWS, DataQualityService
+
+HistoryListener = Callable[[Dict[str, Any]], None]
+
+
+class DataImportService:
+    """Validates uploaded history and appends the accepted rows to the history store."""
+
+    def __init__(
+        self,
+        history_gateway: HistoryGateway,
+        data_quality: DataQualityService,
+        listeners: Optional[List[HistoryListener]] = None,
+    ) -> None:
+        self._history_gateway = history_gateway
+        self._data_quality = data_quality
+        self._listeners = list(listeners or [])
+
+    def add_listener(self, listener: HistoryListener) -> None:
+        """Register a callback invoked with the ingestion summary after rows are appended."""
+        self._listeners.append(listener)
+
+    def import_csv(
+        self,
+        source: IO,
+        validation_rules: Dict[str, Any] = None,
+        chunk_rows: int = IMPORT_CHUNK_ROWS,
+    ) -> Dict[str, Any]:
+        """Validate ``source`` and, if it passes, append its new rows to history.
+
+        ``source`` is read twice (validation, then ingestion), so it must be
+        seekable; both passes stream it in ``chunk_rows`` chunks.
+        """
+        source.seek(0)
+        result = self._data_quality.validate_import_stream(source, validation_rules, chunk_rows=chunk_rows)
+        result["ingestion"] = None
+        if not result["valid"]:
+            return result
+
+        source.seek(0)
+        summary = self._history_gateway.append(pd.read_csv(source, chunksize=chunk_rows))
+        result["ingestion"] = summary
+        if summary["rows_appended"]:
+            self._notify(summary)
+        return result
+
+    def _notify(self, summary: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(summary)
+            except Exception as exc:
+                print(f'Warning: history listener failed after import: {exc}')
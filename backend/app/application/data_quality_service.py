@@ -2,22 +2,143 @@ from __future__ import annotations
 
 import pandas as pd
 import numpy as np
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List
-from sklearn.ensemble import IsolationForest
+from pathlib import Path
+from typing import IO, Dict, Any, List, Optional, Union
 
-from ..domain.interfaces import HistoryGateway
+from ..domain.interfaces import AnomalyDetectorGateway, HistoryGateway
+from ..infrastructure.services.anomaly_detection import (
+    DEFAULT_FIT_ROWS,
+    fit_anomaly_detector,
+    latest_timestamp,
+    score_anomalies,
+)
+from ..infrastructure.services.feature_engineering import parse_time_column
+from ..infrastructure.services.import_validation import ValidationReport, compile_rules
+from ..infrastructure.services.quality_metrics import QualityMetrics
+from ..infrastructure.services.quality_scan import (
+    FROZEN_MIN_SLOTS,
+    SCAN_CHUNK_ROWS,
+    history_fingerprint,
+    scan_history,
+)
+
+IMPORT_CHUNK_ROWS = 100_000
+SCAN_CACHE_SIZE = 8
 
 
 class DataQualityService:
     """Service for data quality assessment and anomaly detection."""
     
-    def __init__(self, history_repository: HistoryGateway):
+    def __init__(self, history_repository: HistoryGateway, detector_repository: AnomalyDetectorGateway):
         self.history_repository = history_repository
-        self.anomaly_detector = IsolationForest(contamination=0.1, random_state=42)
+        self.detector_repository = detector_repository
+        self._detector: Optional[Dict[str, Any]] = None
+        self._metrics: Optional[QualityMetrics] = None
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._scan_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def warm_up(self) -> None:
+        """Load the persisted anomaly detector (fitting one if none exists) and count the full history."""
+        try:
+            self._ensure_detector()
+        except Exception as exc:
+            print(f'Warning: anomaly detector unavailable: {exc}')
+        try:
+            self._ensure_metrics()
+        except Exception as exc:
+            print(f'Warning: quality metrics unavailable: {exc}')
+
+    def _ensure_metrics(self) -> QualityMetrics:
+        with self._metrics_lock:
+            if self._metrics is None:
+                self._metrics = QualityMetrics.from_frame(self.history_repository.load())
+            return self._metrics
+
+    def _ensure_detector(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._detector is None:
+                self._detector = self.detector_repository.load()
+            if self._detector is None:
+                self._detector = fit_anomaly_detector(self.history_repository.load(limit=DEFAULT_FIT_ROWS))
+                self.detector_repository.save(self._detector)
+            return self._detector
+
+    def refit_anomaly_detector(self, limit: int = DEFAULT_FIT_ROWS) -> Dict[str, Any]:
+        """Refit on the latest ``limit`` rows and persist; meant for scheduled jobs, not requests."""
+        payload = fit_anomaly_detector(self.history_repository.load(limit=limit))
+        self.detector_repository.save(payload)
+        with self._lock:
+            self._detector = payload
+        return self.anomaly_summary()
+
+    def record_new_rows(self, data: pd.DataFrame) -> None:
+        """Score rows newer than the detector's watermark and add them to the running totals.
+
+        The watermark is read, the rows scored and the totals updated under one
+        lock, so concurrent calls never count the same rows twice.
+        """
+        self._ensure_detector()
+        timestamps = parse_time_column(data['Time'], errors='coerce') if 'Time' in data else None
+        with self._lock:
+            detector = self._detector
+            fresh = data
+            watermark = detector.get('scored_through')
+            if watermark is not None and timestamps is not None:
+                fresh = data[timestamps > watermark]
+            if fresh.empty:
+                return
+            scored, anomalies = score_anomalies(detector, fresh)
+            newest = latest_timestamp(fresh)
+            detector['scored_rows'] += scored
+            detector['anomalies'] += anomalies
+            if newest is not None and (watermark is None or newest > watermark):
+                detector['scored_through'] = newest
+            # Persist the totals so a restart does not rescore the same rows.
+            self.detector_repository.save_counters(detector)
+
+    def on_history_appended(self, summary: Dict[str, Any]) -> None:
+        """Count and score imported rows, touching only the appended tail of history."""
+        start = summary.get("start")
+        if start is None:
+            return
+        with self._metrics_lock:
+            if self._metrics is not None and not self._metrics.accepts(start):
+                # Backfilled rows change gap statistics in the middle; recount lazily.
+                self._metrics = None
+                return
+            # Appended rows sort after all existing history, so they are the tail.
+            rows = self.history_repository.load(limit=summary["rows_appended"])
+            if self._metrics is not None:
+                self._metrics.update(rows)
+        if self._detector is not None:
+            self.record_new_rows(rows)
+
+    def anomaly_summary(self) -> Dict[str, Any]:
+        """Running detector totals over every row ever scored, whatever window is being assessed."""
+        detector = self._ensure_detector()
+        scored = detector['scored_rows']
+        return {
+            "lifetime_anomaly_count": int(detector['anomalies']),
+            "lifetime_scored_rows": int(scored),
+            "anomaly_rate": detector['anomalies'] / scored if scored else 0.0,
+        }
     
-    def assess_data_quality(self) -> Dict[str, Any]:
-        """Assess the quality of historical data."""
+    def assess_data_quality(self, scope: str = "recent") -> Dict[str, Any]:
+        """Assess the quality of historical data.
+
+        ``scope="recent"`` inspects the latest 1000 rows; ``scope="all"`` reads
+        the incrementally maintained whole-history counters. Either way the
+        anomaly figures are the detector's lifetime totals and rate, as only
+        rows newer than its watermark are scored.
+        """
+        if scope == "all":
+            return self._assess_full_history()
+        if scope != "recent":
+            raise ValueError(f"Unknown scope: {scope}")
         try:
             # Get recent data for analysis
             data = self.history_repository.load(limit=1000)
@@ -26,7 +147,7 @@ class DataQualityService:
                     "total_records": 0,
                     "missing_values": {},
                     "data_completeness": 0.0,
-                    "anomaly_count": 0,
+                    "lifetime_anomaly_count": 0,
                     "quality_score": 0.0,
                     "last_updated": datetime.now()
                 }
@@ -39,17 +160,20 @@ class DataQualityService:
             missing_cells = data.isnull().sum().sum()
             data_completeness = ((total_cells - missing_cells) / total_cells) * 100
             
-            # Detect anomalies
-            anomaly_count = self._detect_anomalies(data)
+            # Score only rows that arrived since the last call; totals are cumulative
+            self.record_new_rows(data)
+            anomalies = self.anomaly_summary()
             
             # Calculate quality score (0-100)
-            quality_score = self._calculate_quality_score(data_completeness, anomaly_count, missing_values)
+            quality_score = self._calculate_quality_score(
+                data_completeness, anomalies["anomaly_rate"], missing_values
+            )
             
             return {
                 "total_records": len(data),
                 "missing_values": missing_values,
                 "data_completeness": round(data_completeness, 2),
-                "anomaly_count": anomaly_count,
+                **anomalies,
                 "quality_score": round(quality_score, 2),
                 "last_updated": datetime.now()
             }
@@ -58,43 +182,77 @@ class DataQualityService:
                 "total_records": 0,
                 "missing_values": {},
                 "data_completeness": 0.0,
-                "anomaly_count": 0,
+                "lifetime_anomaly_count": 0,
                 "quality_score": 0.0,
                 "last_updated": datetime.now(),
                 "error": str(e)
             }
     
-    def _detect_anomalies(self, data: pd.DataFrame) -> int:
-        """Detect anomalies in the data using Isolation Forest."""
+    def _assess_full_history(self) -> Dict[str, Any]:
+        metrics = self._ensure_metrics()
+        with self._metrics_lock:
+            summary = metrics.summary()
+        anomalies = self.anomaly_summary()
+        quality_score = self._calculate_quality_score(
+            summary["data_completeness"], anomalies["anomaly_rate"], summary["missing_values"]
+        )
+        return {
+            **summary,
+            **anomalies,
+            "scope": "all",
+            "quality_score": round(quality_score, 2),
+            "last_updated": datetime.now()
+        }
+
+    def scan_full_history(
+        self,
+        workers: Optional[int] = None,
+        chunk_rows: int = SCAN_CHUNK_ROWS,
+        min_frozen_slots: int = FROZEN_MIN_SLOTS,
+    ) -> Dict[str, Any]:
+        """Audit the entire history in parallel chunks; reports are cached by data fingerprint."""
+        data = self.history_repository.load()
         try:
-            # Select numeric columns for anomaly detection
-            numeric_cols = data.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) == 0:
-                return 0
-            
-            # Remove rows with NaN values for anomaly detection
-            clean_data = data[numeric_cols].dropna()
-            if len(clean_data) == 0:
-                return 0
-            
-            # Fit anomaly detector
-            self.anomaly_detector.fit(clean_data)
-            
-            # Predict anomalies
-            anomaly_predictions = self.anomaly_detector.predict(clean_data)
-            anomaly_count = sum(1 for pred in anomaly_predictions if pred == -1)
-            
-            return anomaly_count
+            detector = self._ensure_detector()
         except Exception:
-            return 0
-    
-    def _calculate_quality_score(self, completeness: float, anomaly_count: int, missing_values: Dict[str, int]) -> float:
+            detector = None
+        rules = compile_rules()
+        fingerprint = history_fingerprint(
+            data, rules, min_frozen_slots, detector.get('fitted_at') if detector else None
+        )
+        with self._lock:
+            cached = self._scan_cache.get(fingerprint)
+            if cached is not None:
+                self._scan_cache.move_to_end(fingerprint)
+                return {**cached, "cached": True}
+
+        report = scan_history(
+            data,
+            detector=detector,
+            rules=rules,
+            workers=workers,
+            chunk_rows=chunk_rows,
+            min_frozen_slots=min_frozen_slots,
+        )
+        report["quality_score"] = round(self._calculate_quality_score(
+            report["data_completeness"], report["anomaly_rate"], report["missing_values"]
+        ), 2)
+        report["fingerprint"] = fingerprint
+        report["generated_at"] = datetime.now()
+
+        with self._lock:
+            self._scan_cache[fingerprint] = report
+            while len(self._scan_cache) > SCAN_CACHE_SIZE:
+                self._scan_cache.popitem(last=False)
+        return {**report, "cached": False}
+
+    def _calculate_quality_score(self, completeness: float, anomaly_rate: float, missing_values: Dict[str, int]) -> float:
         """Calculate overall data quality score."""
         # Base score from completeness
         base_score = completeness
         
-        # Penalty for anomalies (max 20 points)
-        anomaly_penalty = min(20, anomaly_count * 0.1)
+        # Penalty for anomalies (max 20 points; 0.1 per anomaly in 1000 rows)
+        anomaly_penalty = min(20, anomaly_rate * 100)
         
         # Penalty for missing values in critical columns
         critical_columns = ['Energy delta[Wh]', 'GHI', 'temp']
@@ -109,50 +267,48 @@ class DataQualityService:
     
     def validate_import_data(self, data: pd.DataFrame, validation_rules: Dict[str, Any] = None) -> Dict[str, Any]:
         """Validate imported data against quality rules."""
-        errors = []
-        warnings = []
-        
-        # Required columns check
-        required_columns = ['Time', 'Energy delta[Wh]', 'GHI', 'temp']
-        missing_columns = [col for col in required_columns if col not in data.columns]
-        if missing_columns:
-            errors.append(f"Missing required columns: {missing_columns}")
-        
-        # Data type validation
-        if 'Time' in data.columns:
-            try:
-                pd.to_datetime(data['Time'], dayfirst=True)
-            except Exception:
-                errors.append("Time column contains invalid datetime values")
-        
-        # Range validation for numeric columns
-        numeric_ranges = {
-            'Energy delta[Wh]': (0, 10000),  # Reasonable range for 15-min energy
-            'GHI': (0, 1500),  # Global Horizontal Irradiance range
-            'temp': (-50, 60),  # Temperature range
-            'humidity': (0, 100),  # Humidity percentage
-            'pressure': (800, 1200),  # Atmospheric pressure range
-        }
-        
-        for col, (min_val, max_val) in numeric_ranges.items():
-            if col in data.columns:
-                invalid_values = data[(data[col] < min_val) | (data[col] > max_val)]
-                if len(invalid_values) > 0:
-                    warnings.append(f"Column {col} has {len(invalid_values)} values outside expected range ({min_val}-{max_val})")
-        
-        # Missing data check
-        missing_data = data.isnull().sum()
-        high_missing = missing_data[missing_data > len(data) * 0.1]  # More than 10% missing
-        for col, count in high_missing.items():
-            warnings.append(f"Column {col} has {count} missing values ({count/len(data)*100:.1f}%)")
-        
+        validation = ValidationReport(compile_rules(validation_rules))
+        validation.update(data)
+        self._score_import_chunk(validation, data)
+        return self._import_result(validation)
+
+    def validate_import_stream(
+        self,
+        source: Union[str, Path, IO],
+        validation_rules: Dict[str, Any] = None,
+        chunk_rows: int = IMPORT_CHUNK_ROWS,
+    ) -> Dict[str, Any]:
+        """Validate a CSV source chunk by chunk, so memory is bounded by ``chunk_rows``.
+
+        Produces the same report as ``validate_import_data``, aggregated over
+        every chunk; violation row indices count from the first data row.
+        """
+        validation = ValidationReport(compile_rules(validation_rules))
+        for chunk in pd.read_csv(source, chunksize=chunk_rows):
+            validation.update(chunk)
+            self._score_import_chunk(validation, chunk)
+        return self._import_result(validation)
+
+    def _score_import_chunk(self, validation: ValidationReport, data: pd.DataFrame) -> None:
+        try:
+            scored, anomalies = score_anomalies(self._ensure_detector(), data)
+        except Exception:
+            return
+        validation.scored_rows += scored
+        validation.anomalies += anomalies
+
+    def _import_result(self, validation: ValidationReport) -> Dict[str, Any]:
+        errors, warnings = validation.messages()
         return {
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings,
+            "violations": validation.violations(),
+            "records_processed": validation.rows,
             "quality_score": self._calculate_quality_score(
-                (1 - data.isnull().sum().sum() / data.size) * 100,
-                self._detect_anomalies(data),
-                missing_data.to_dict()
+                validation.completeness,
+                validation.anomaly_rate,
+                validation.missing
             )
         }
+
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
 from ..domain.interfaces import HistoryGateway
+from ..infrastructure.services.downsampling import DOWNSAMPLING_METHODS, downsample_indices
+from ..infrastructure.services.history_rollups import BucketStats, HistoryRollups, WindowBuckets
 
 AGGREGATION_RULES: Dict[str, str] = {
-    'minute': '15T',
-    'hour': 'H',
+    'minute': '15min',
+    'hour': 'h',
     'day': 'D',
     'week': 'W',
 }
+RESULT_CACHE_SIZE = 128
 
 
 def _normalise_datetime(value: datetime) -> datetime:
@@ -22,15 +27,50 @@ def _normalise_datetime(value: datetime) -> datetime:
     return value.astimezone(timezone.utc).replace(tzinfo=None, microsecond=0)
 
 
-def _format_timestamp(value: pd.Timestamp) -> str:
-    return value.to_pydatetime().replace(tzinfo=None, microsecond=0).isoformat()
-
-
 class HistoricalAnalysisService:
     """Provides statistical summaries over historical production records."""
 
     def __init__(self, history_gateway: HistoryGateway) -> None:
         self._history_gateway = history_gateway
+        self._rollups: Optional[HistoryRollups] = None
+        # Response records for each materialized table row, aligned with the table.
+        self._table_records: Dict[str, List[Dict[str, Any]]] = {}
+        self._results: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._data_version = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Build the rollup tables so the first query does not pay for it."""
+        try:
+            self._get_rollups()
+        except Exception as exc:
+            print(f'Warning: historical rollups unavailable: {exc}')
+
+    def _get_rollups(self) -> HistoryRollups:
+        with self._lock:
+            if self._rollups is None:
+                data = self._history_gateway.load()
+                if data.empty:
+                    raise ValueError('No historical records available')
+                self._rollups = HistoryRollups.from_frame(data, AGGREGATION_RULES)
+            return self._rollups
+
+    def on_history_appended(self, summary: Dict[str, Any]) -> None:
+        """Fold newly imported rows into the rollups; backfills trigger a lazy rebuild."""
+        with self._lock:
+            self._data_version += 1
+            self._results.clear()
+            if self._rollups is None:
+                return
+            if not self._rollups.accepts(summary.get("start")):
+                self._rollups = None
+                self._table_records.clear()
+                return
+            # Appended rows sort after all existing history, so they are the tail.
+            unchanged = self._rollups.append(self._history_gateway.load(limit=summary["rows_appended"]))
+            # Records for buckets before the append stay valid; the rest are rebuilt on demand.
+            for aggregation, records in self._table_records.items():
+                del records[unchanged.get(aggregation, 0):]
 
     def analyse(
         self,
@@ -38,42 +78,54 @@ class HistoricalAnalysisService:
         end_date: datetime,
         aggregation: str,
         metrics: List[str] | None = None,
+        max_points: Optional[int] = None,
+        downsample: str = 'lttb',
     ) -> Dict[str, Any]:
+        """Summarise the window; ``max_points`` caps ``data_points`` for charting.
+
+        Series longer than ``max_points`` are reduced with ``downsample``
+        (``lttb`` or ``minmax``) on the bucket means; metrics and trends are
+        always computed from the full series.
+        """
         if start_date > end_date:
             raise ValueError('start_date must be earlier than end_date')
+        if downsample not in DOWNSAMPLING_METHODS:
+            raise ValueError(f'Unknown downsampling method: {downsample}')
 
-        data = self._history_gateway.load()
-        if data.empty:
-            raise ValueError('No historical records available')
-
-        frame = data.copy()
-        series = pd.to_datetime(frame['Time'], errors='coerce', utc=True)
-        frame['Time'] = series.dt.tz_localize(None)
-        frame = frame.dropna(subset=['Time']).sort_values('Time')
-        if frame.empty:
+        rollups = self._get_rollups()
+        if not len(rollups.times):
             raise ValueError('No valid timestamps found in historical data')
 
         start = _normalise_datetime(start_date)
         end = _normalise_datetime(end_date)
 
-        mask = (frame['Time'] >= start) & (frame['Time'] <= end)
-        filtered = frame.loc[mask]
-        if filtered.empty:
-            raise ValueError('No data points within the requested window')
-
-        filtered = filtered.set_index('Time')
-        values = filtered['Energy delta[Wh]'].astype(float)
-        if len(values) < 2:
-            raise ValueError('Not enough data points to analyse the selected window')
-
-        summary_metrics = self._compute_metrics(values, metrics or [])
-
-        freq = AGGREGATION_RULES.get(aggregation, AGGREGATION_RULES['day'])
-        grouped = filtered.resample(freq)
-        data_points = self._build_series(grouped)
+        aggregation = aggregation if aggregation in AGGREGATION_RULES else 'day'
+        with self._lock:
+            key = (start, end, aggregation, tuple(metrics or []), max_points, downsample, self._data_version)
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+            lo, hi = rollups.window(np.datetime64(start, 'ns'), np.datetime64(end, 'ns'))
+            if hi <= lo:
+                raise ValueError('No data points within the requested window')
+            if hi - lo < 2:
+                raise ValueError('Not enough data points to analyse the selected window')
+            window, totals = rollups.query(aggregation, lo, hi)
+            data_points = self._window_records(aggregation, window)
+
+        summary_metrics = self._select_metrics(totals.metrics(), metrics or [])
         trends = self._describe_trends(data_points)
-
-        return {
+        source_points = len(data_points)
+        if max_points is not None and source_points > max_points:
+            buckets = window.stats()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = buckets.total / buckets.count
+            keep = downsample_indices(buckets.labels.astype(np.int64), mean, max_points, downsample)
+            data_points = [data_points[i] for i in keep.tolist()]
+
+        result = {
             'period': {
                 'start': start,
                 'end': end,
@@ -81,30 +133,30 @@ class HistoricalAnalysisService:
             'metrics': summary_metrics,
             'data_points': data_points,
             'trends': trends,
+            'source_points': source_points,
         }
+        with self._lock:
+            if key[-1] == self._data_version:
+                self._results[key] = result
+                while len(self._results) > RESULT_CACHE_SIZE:
+                    self._results.popitem(last=False)
+        return result
+
+    def _window_records(self, aggregation: str, window: WindowBuckets) -> List[Dict[str, Any]]:
+        """Records for a window: cached table rows in the middle, edge buckets built fresh."""
+        records = self._table_records.setdefault(aggregation, [])
+        if len(records) < len(window.table):
+            records.extend(self._build_series(window.table.slice(len(records), len(window.table))))
+
+        data_points = records[window.start:window.stop]
+        if window.head is not None:
+            data_points = self._build_series(window.head) + data_points
+        if window.tail is not None:
+            data_points = data_points + self._build_series(window.tail)
+        return data_points
 
     @staticmethod
-    def _compute_metrics(values: pd.Series, metrics: List[str]) -> Dict[str, float]:
-        shifted = values.shift(1).dropna()
-        actuals = values.iloc[1:]
-        errors = actuals - shifted
-
-        mae = float(np.abs(errors).mean())
-        rmse = float(np.sqrt((errors ** 2).mean()))
-
-        denominator = np.abs(actuals.replace(0, np.nan))
-        mape = float((np.abs(errors) / denominator).dropna().mean() * 100) if not denominator.dropna().empty else float('nan')
-        ss_res = float((errors ** 2).sum())
-        ss_tot = float(((actuals - actuals.mean()) ** 2).sum())
-        r2_score = 1.0 if ss_tot == 0 else 1 - (ss_res / ss_tot)
-
-        available_metrics = {
-            'mae': mae,
-            'rmse': rmse,
-            'mape': mape,
-            'r2_score': r2_score,
-        }
-
+    def _select_metrics(available_metrics: Dict[str, float], metrics: List[str]) -> Dict[str, float]:
         if not metrics:
             return {key: value for key, value in available_metrics.items() if not np.isnan(value)}
         return {
@@ -112,28 +164,33 @@ class HistoricalAnalysisService:
         }
 
     @staticmethod
-    def _build_series(grouped: pd.core.groupby.DataFrameGroupBy) -> List[Dict[str, Any]]:
-        series: List[Dict[str, Any]] = []
-        for timestamp, group in grouped:
-            frame = group.sort_index()
-            if frame.empty:
-                continue
-            energy = frame['Energy delta[Wh]'].astype(float)
-            record: Dict[str, Any] = {
-                'timestamp': _format_timestamp(timestamp),
-                'energy_mean': float(energy.mean()),
-                'energy_sum': float(energy.sum()),
-                'energy_max': float(energy.max()),
-                'energy_min': float(energy.min()),
-            }
-            if len(energy) > 1:
-                shifted = energy.shift(1).dropna()
-                actuals = energy.iloc[1:]
-                errors = actuals - shifted
-                record['mae'] = float(np.abs(errors).mean())
-                record['rmse'] = float(np.sqrt((errors ** 2).mean()))
-            series.append(record)
-        return series
+    def _build_series(buckets: BucketStats) -> List[Dict[str, Any]]:
+        """Turn bucket statistics into response records, computing every column at once."""
+        if not len(buckets):
+            return []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = buckets.total / buckets.count
+            mae = buckets.abs_error / buckets.pairs
+            rmse = np.sqrt(buckets.sq_error / buckets.pairs)
+
+        timestamps = np.datetime_as_string(buckets.labels, unit='s').tolist()
+        base_keys = ('timestamp', 'energy_mean', 'energy_sum', 'energy_max', 'energy_min')
+        error_keys = base_keys + ('mae', 'rmse')
+        columns = zip(
+            timestamps,
+            mean.tolist(),
+            buckets.total.tolist(),
+            buckets.maximum.tolist(),
+            buckets.minimum.tolist(),
+            mae.tolist(),
+            rmse.tolist(),
+            (buckets.rows > 1).tolist(),
+        )
+        # Single-reading buckets have no persistence error, so they omit mae/rmse.
+        return [
+            dict(zip(error_keys, row[:7])) if row[7] else dict(zip(base_keys, row[:5]))
+            for row in columns
+        ]
 
     @staticmethod
     def _describe_trends(data_points: List[Dict[str, Any]]) -> Dict[str, str]:
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+from ..domain.entities import ModelState
+from ..domain.exceptions import ModelNotReadyError
+from ..domain.interfaces import HistoryGateway, ModelGateway
+from ..infrastructure.services.export_formats import check_format, encode_frames
+from ..infrastructure.services.feature_engineering import (
+    FeatureEngineer,
+    make_feature_matrix,
+    parse_time_column,
+    target_column,
+)
+
+EXPORT_CHUNK_ROWS = 50_000
+EXPORT_INCLUDES = ('raw', 'features', 'predictions')
+# Readings before each chunk needed to rebuild its lags and rolling windows.
+FEATURE_CONTEXT_ROWS = 64
+FIFTEEN_MINUTES = pd.Timedelta(minutes=15)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return pd.Timestamp(value)
+
+
+class HistoryExportService:
+    """Streams a time range of history, optionally with features or hindcasts, chunk by chunk.
+
+    Only one history chunk (plus a few rows of context around it) is held
+    at a time, so memory stays bounded by ``chunk_rows`` however long the
+    range is. Feature and prediction rows whose target reading is not in
+    history yet (the last ``horizon`` rows) are kept with an empty target.
+    """
+
+    def __init__(
+        self,
+        history_gateway: HistoryGateway,
+        model_gateway: ModelGateway,
+        feature_engineer: FeatureEngineer,
+    ) -> None:
+        self._history_gateway = history_gateway
+        self._model_gateway = model_gateway
+        self._feature_engineer = feature_engineer
+
+    def export(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fmt: str = 'csv',
+        include: str = 'raw',
+        horizon: Optional[int] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+    ) -> Iterator[bytes]:
+        """Encoded pieces of the export; argument and availability errors raise before the first piece."""
+        check_format(fmt)
+        if include not in EXPORT_INCLUDES:
+            raise ValueError(f'Unknown export include: {include}')
+        start, end = _naive_utc(start), _naive_utc(end)
+        if start is not None and end is not None and start > end:
+            raise ValueError('start must be earlier than end')
+
+        if include == 'raw':
+            frames = self._raw_frames(start, end, chunk_rows)
+        else:
+            state = None
+            if include == 'predictions':
+                if not self._model_gateway.is_ready(horizon):
+                    raise ModelNotReadyError('Model artifacts not available')
+                state = self._model_gateway.get_state(horizon)
+            frames = self._feature_frames(start, end, chunk_rows, state.horizon if state else horizon or 1, state)
+
+        pieces = encode_frames((frame for frame in frames if not frame.empty), fmt)
+        return chain([next(pieces, b'')], pieces)
+
+    def _raw_frames(
+        self,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+        chunk_rows: int,
+    ) -> Iterator[pd.DataFrame]:
+        for chunk in self._history_gateway.iter_range(start, end, chunk_rows):
+            yield chunk.assign(Time=parse_time_column(chunk['Time'], errors='coerce'))
+
+    def _feature_frames(
+        self,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp],
+        chunk_rows: int,
+        horizon: int,
+        state: Optional[ModelState],
+    ) -> Iterator[pd.DataFrame]:
+        chunk_rows = max(chunk_rows, FEATURE_CONTEXT_ROWS, horizon)
+        # Read a margin on both sides so edge rows get full lags and a target.
+        chunks = self._history_gateway.iter_range(
+            start - FEATURE_CONTEXT_ROWS * FIFTEEN_MINUTES if start is not None else None,
+            end + horizon * FIFTEEN_MINUTES if end is not None else None,
+            chunk_rows,
+        )
+        for before, chunk, after in _with_neighbours(chunks, FEATURE_CONTEXT_ROWS, horizon):
+            times = parse_time_column(chunk['Time'], errors='coerce')
+            lo, hi = times.min(), times.max()
+            lo = max(lo, start) if start is not None else lo
+            hi = min(hi, end) if end is not None else hi
+
+            # The matrix keeps rows without a target, unlike make_features.
+            matrix = make_feature_matrix(pd.concat([before, chunk, after]), (horizon,))
+            features = matrix.rename(columns={target_column(horizon): 'target'}).loc[lo:hi]
+            if state is None:
+                yield features.reset_index()
+                continue
+
+            predictions = state.model.predict(features[state.features]) if len(features) else []
+            yield pd.DataFrame({
+                'Time': features.index,
+                'target_time': features.index + horizon * FIFTEEN_MINUTES,
+                'energy_wh': features['energy_wh'].to_numpy(),
+                'target': features['target'].to_numpy(),
+                'prediction_wh': predictions,
+            })
+
+
+def _with_neighbours(
+    chunks: Iterable[pd.DataFrame],
+    before_rows: int,
+    after_rows: int,
+) -> Iterator[tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    """Pair each chunk with the tail of the previous one and the head of the next one."""
+    previous: Optional[pd.DataFrame] = None
+    current: Optional[pd.DataFrame] = None
+    for chunk in chunks:
+        if current is not None:
+            yield _tail(previous, current, before_rows), current, chunk.head(after_rows)
+        previous, current = current, chunk
+    if current is not None:
+        yield _tail(previous, current, before_rows), current, current.iloc[:0]
+
+
+def _tail(previous: Optional[pd.DataFrame], current: pd.DataFrame, rows: int) -> pd.DataFrame:
+    return previous.tail(rows) if previous is not None else current.iloc[:0]
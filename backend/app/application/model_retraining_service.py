@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..domain.entities import ModelState
+from ..domain.exceptions import ModelNotReadyError
+from ..domain.interfaces import HistoryGateway, ModelGateway
+from ..infrastructure.services.warm_start import init_worker, trained_through, warm_start_pooled
+
+JOB_HISTORY = 20
+RETRAIN_THREADS = 1
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+@dataclass
+class RetrainJob:
+    """Progress of one background warm-start retraining run."""
+
+    job_id: str
+    horizons: List[int]
+    created_at: datetime
+    status: str = 'queued'
+    stage: str = 'queued'
+    progress: float = 0.0
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class ModelRetrainingService:
+    """Runs warm-start retraining jobs in the background and publishes accepted models.
+
+    One job runs at a time on a dedicated thread, which hands the CPU-bound
+    work to a single lower-priority worker process so request threads do not
+    compete with it for the GIL. Each horizon's model continues boosting on
+    the rows appended since it was last trained; a candidate that beats the
+    served model on the newest rows is published as the next artifact
+    version, with interval half-widths recalibrated on a slice of the newest
+    rows that model selection did not see. Jobs are polled by id; the latest
+    ``JOB_HISTORY`` are kept.
+    """
+
+    def __init__(self, model_gateway: ModelGateway, history_gateway: HistoryGateway) -> None:
+        self._model_gateway = model_gateway
+        self._history_gateway = history_gateway
+        self._jobs: "OrderedDict[str, RetrainJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def enqueue(self, horizons: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Start a job for ``horizons`` (default: every trained horizon), or return the one already active."""
+        available = self._model_gateway.available_horizons()
+        if not available:
+            raise ModelNotReadyError('Model artifact missing. Run training before retraining.')
+        horizons = sorted(set(horizons or available))
+        missing = sorted(set(horizons) - set(available))
+        if missing:
+            raise ValueError(f'No trained model for horizons {missing}; available: {available}')
+
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status in ACTIVE_STATUSES:
+                    return asdict(job)
+            job = RetrainJob(job_id=uuid.uuid4().hex[:12], horizons=horizons, created_at=datetime.now())
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > JOB_HISTORY:
+                self._jobs.popitem(last=False)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-retrain')
+            self._executor.submit(self._run, job)
+            return asdict(job)
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f'Unknown retraining job: {job_id}')
+            return asdict(job)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _update(self, job: RetrainJob, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+
+    def _run(self, job: RetrainJob) -> None:
+        self._update(job, status='running', stage='loading', started_at=datetime.now())
+        try:
+            states = {horizon: self._model_gateway.get_state(horizon) for horizon in job.horizons}
+            raw = self._history_gateway.load()
+            # Forking a threaded process that has run OpenMP can deadlock the child.
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(raw, RETRAIN_THREADS),
+            ) as pool:
+                for done, horizon in enumerate(job.horizons):
+                    self._update(job, stage=f'training horizon {horizon}')
+                    result = self._retrain(pool, states[horizon])
+                    with self._lock:
+                        job.results.append({'horizon': horizon, **result})
+                        job.progress = (done + 1) / len(job.horizons)
+        except Exception as exc:
+            self._update(job, status='failed', stage='failed', error=str(exc), finished_at=datetime.now())
+            return
+        self._update(job, status='completed', stage='done', progress=1.0, finished_at=datetime.now())
+
+    def _retrain(self, pool: ProcessPoolExecutor, state: ModelState) -> Dict[str, Any]:
+        watermark = trained_through(state.trained_on)
+        if watermark is None:
+            return {'status': 'skipped', 'reason': 'artifact does not record its training data'}
+        result = pool.submit(
+            warm_start_pooled, state.horizon, state.model, state.features, watermark, state.calibration,
+        ).result()
+        model = result.pop('model')
+        calibration = result.pop('calibration', state.calibration)
+        if model is None:
+            result['version'] = state.version
+        else:
+            result['version'] = self._publish(state, model, calibration, result).version
+        return result
+
+    def _publish(
+        self,
+        state: ModelState,
+        model: Any,
+        calibration: Dict[str, Any],
+        result: Dict[str, Any],
+    ) -> ModelState:
+        version = state.version + 1
+        payload = {
+            'model': model,
+            'features': state.features,
+            'horizon': state.horizon,
+            'calibration': calibration,
+            'quantile_models': state.quantile_models,
+            'trained_on': {
+                **state.trained_on,
+                'trained_through': result['trained_through'],
+                'warm_started_from': state.version,
+            },
+            'version': version,
+        }
+        metrics = {
+            **state.metrics,
+            'version': version,
+            'n_trees': result['n_trees'],
+            'warm_start': {
+                'published_at': datetime.now().isoformat(),
+                **{key: value for key, value in result.items() if key != 'status'},
+            },
+        }
+        return self._model_gateway.publish(state.horizon, payload, metrics)
@@ -14,6 +14,12 @@ class MonitoringService:
     def __init__(self, model_gateway: ModelGateway):
         self.model_gateway = model_gateway
         self.start_time = time.time()
+        self._process = psutil.Process()
+
+    def warm_up(self) -> None:
+        """Prime psutil's CPU counters so the first reading is not a meaningless 0.0."""
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
     
     def get_system_health(self) -> Dict[str, Any]:
         """Get comprehensive system health information."""
@@ -69,9 +75,8 @@ class MonitoringService:
             disk_usage = psutil.disk_usage('/')
             
             # Process metrics
-            process = psutil.Process()
-            process_memory = process.memory_info()
-            process_cpu = process.cpu_percent()
+            process_memory = self._process.memory_info()
+            process_cpu = self._process.cpu_percent()
             
             return {
                 "system": {
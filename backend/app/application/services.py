@@ -2,10 +2,16 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+import pandas as pd
+
 from ..domain.entities import ModelState
 from ..domain.exceptions import HistoryNotAvailableError, ModelNotReadyError
 from ..domain.interfaces import HistoryGateway, ModelGateway
 from ..infrastructure.services.feature_engineering import FeatureEngineer
+from ..infrastructure.services.recursive_features import FeatureLayout, RecursiveFeatureState, roll_forward
+
+RECURSIVE_STEPS = 96
+FIFTEEN_MINUTES = pd.Timedelta(minutes=15)
 
 
 class ForecastingService:
@@ -93,6 +99,44 @@ class ForecastingService:
             results.append(record)
         return results
 
+    def forecast_recursive(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Roll the horizon-1 model forward, feeding each prediction back into its lags."""
+        state = self._load_state(1)
+        steps = int(payload.get('steps') or RECURSIVE_STEPS)
+        if steps < 1:
+            raise ValueError('steps must be at least 1')
+
+        history_payload = payload.get('history')
+        if history_payload:
+            history_df = self._feature_engineer.history_from_payload(history_payload)
+        else:
+            history_df = self._history_gateway.load(limit=self._feature_engineer.history_window)
+        if history_df.empty:
+            raise HistoryNotAvailableError('Historical data required for recursive forecasting')
+
+        prepared_history = self._feature_engineer.normalise_history(history_df)
+        prepared = self._feature_engineer.prepare_history(prepared_history)
+        future_df = self._feature_engineer.normalise_future(
+            self._feature_engineer.future_from_payload(payload.get('future_weather'))
+        )
+
+        layout = FeatureLayout.from_features(state.features, list(prepared.columns))
+        feature_state = RecursiveFeatureState(prepared, layout)
+        exogenous = self._feature_engineer.exogenous_path(future_df, layout.exogenous_columns, prepared, steps)
+
+        origin = feature_state.timestamp
+        preds = roll_forward(state.model, feature_state, exogenous, steps)[0]
+
+        return [
+            {
+                'prediction_wh': float(pred),
+                'horizon_steps': state.horizon,
+                'timestamp': (origin + (step + 1) * FIFTEEN_MINUTES).isoformat(),
+                'step_index': step + 1,
+            }
+            for step, pred in enumerate(preds)
+        ]
+
 
 class MetricsService:
     """Application service exposing evaluation metrics."""
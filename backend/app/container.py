@@ -3,7 +3,14 @@ from __future__ import annotations
 from pathlib import Path
 
 from .application.services import ForecastingService, MetricsService
+from .application.advanced_forecasting_service import AdvancedForecastingService
+from .application.data_import_service import DataImportService
+from .application.data_quality_service import DataQualityService
 from .application.historical_analysis_service import HistoricalAnalysisService
+from .application.history_export_service import HistoryExportService
+from .application.model_retraining_service import ModelRetrainingService
+from .application.monitoring_service import MonitoringService
+from .infrastructure.repositories.artifact_anomaly_detector_repository import ArtifactAnomalyDetectorRepository
 from .infrastructure.repositories.artifact_model_repository import ArtifactModelRepository
 from .infrastructure.repositories.csv_history_repository import CSVHistoryRepository
 from .infrastructure.services.feature_engineering import FeatureEngineer
@@ -26,3 +33,48 @@ class Container:
         self.forecasting_service = ForecastingService(model_gateway, history_gateway, feature_engineer)
         self.metrics_service = MetricsService(model_gateway)
         self.historical_analysis_service = HistoricalAnalysisService(history_gateway)
+        self.history_export_service = HistoryExportService(history_gateway, model_gateway, feature_engineer)
+        self.advanced_forecasting_service = AdvancedForecastingService(model_gateway, feature_engineer, history_gateway)
+        self.data_quality_service = DataQualityService(
+            history_gateway,
+            ArtifactAnomalyDetectorRepository(artifacts_dir / 'anomaly_detector.joblib'),
+        )
+        self.monitoring_service = MonitoringService(model_gateway)
+        self.model_retraining_service = ModelRetrainingService(model_gateway, history_gateway)
+        self.data_import_service = DataImportService(history_gateway, self.data_quality_service)
+        for service in self._lifecycle_services():
+            listener = getattr(service, 'on_history_appended', None)
+            if listener is not None:
+                self.data_import_service.add_listener(listener)
+
+    def _lifecycle_services(self) -> list[object]:
+        return [
+            self.forecasting_service,
+            self.metrics_service,
+            self.historical_analysis_service,
+            self.advanced_forecasting_service,
+            self.data_quality_service,
+            self.monitoring_service,
+            self.model_retraining_service,
+        ]
+
+    def startup(self) -> None:
+        """Warm per-service caches before the first request is served."""
+        if self.model_gateway.is_ready():
+            # Prime the cache to avoid load latency on first request.
+            try:
+                self.model_gateway.get_state()
+            except Exception:
+                # Allow the application to start; endpoints will surface precise errors.
+                pass
+        for service in self._lifecycle_services():
+            warm_up = getattr(service, 'warm_up', None)
+            if warm_up is not None:
+                warm_up()
+
+    def shutdown(self) -> None:
+        """Release resources held by long-lived services, in reverse start order."""
+        for service in reversed(self._lifecycle_services()):
+            shutdown = getattr(service, 'shutdown', None)
+            if shutdown is not None:
+                shutdown()
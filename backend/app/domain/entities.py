@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -12,3 +12,7 @@ class ModelState:
     features: list[str]
     horizon: int
     metrics: dict[str, Any]
+    calibration: dict[str, Any] = field(default_factory=dict)
+    quantile_models: dict[float, Any] = field(default_factory=dict)
+    trained_on: dict[str, Any] = field(default_factory=dict)
+    version: int = 1
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import pandas as pd
 
@@ -23,6 +23,15 @@ class ModelGateway(ABC):
     def available_horizons(self) -> List[int]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_ensemble_members(self, horizon: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def publish(self, horizon: int, payload: Dict[str, Any], metrics: Dict[str, Any]) -> ModelState:
+        """Persist a new model version for ``horizon`` and make it the one served."""
+        raise NotImplementedError
+
 
 class HistoryGateway(ABC):
     """Interface for accessing historical production data."""
@@ -30,3 +39,35 @@ class HistoryGateway(ABC):
     @abstractmethod
     def load(self, limit: Optional[int] = None) -> pd.DataFrame:
         raise NotImplementedError
+
+    @abstractmethod
+    def append(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """Persist rows whose timestamps are not yet in history; returns an ingestion summary."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_range(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        chunk_rows: int = 50_000,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield rows with ``start <= Time <= end`` in chronological chunks of at most ``chunk_rows``."""
+        raise NotImplementedError
+
+
+class AnomalyDetectorGateway(ABC):
+    """Interface for persisting the fitted data-quality anomaly detector."""
+
+    @abstractmethod
+    def load(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, payload: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_counters(self, counters: Dict[str, Any]) -> None:
+        """Persist only the running totals of the saved detector, without rewriting the model."""
+        raise NotImplementedError
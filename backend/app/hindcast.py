@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from .infrastructure.repositories.artifact_model_repository import ArtifactModelRepository
+from .infrastructure.repositories.csv_history_repository import CSVHistoryRepository
+from .infrastructure.services.feature_engineering import make_feature_matrix
+from .infrastructure.services.hindcast import (
+    HINDCAST_CHUNK_ROWS,
+    hindcast_errors,
+    run_hindcast,
+    write_columnar,
+)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DATA_PATH = BASE_DIR / 'Renewable.csv'
+ARTIFACTS_DIR = Path(__file__).resolve().parents[1] / 'artifacts'
+OUTPUT_DIR = ARTIFACTS_DIR / 'hindcast'
+
+BUCKET_FREQS = {'hour': 'h', 'day': 'D', 'week': 'W'}
+FIFTEEN_MINUTES = pd.Timedelta(minutes=15)
+
+
+def hindcast(
+    data_path: Path = DATA_PATH,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    horizons: Optional[list[int]] = None,
+    bucket: str = 'day',
+    workers: Optional[int] = None,
+    chunk_rows: int = HINDCAST_CHUNK_ROWS,
+    output_dir: Path = OUTPUT_DIR,
+) -> dict:
+    """Predict every origin in ``[start, end]`` for every trained horizon and score the results."""
+    models = ArtifactModelRepository(ARTIFACTS_DIR)
+    horizons = horizons or models.available_horizons()
+    states = {horizon: models.get_state(horizon) for horizon in horizons}
+
+    history = CSVHistoryRepository(data_path)
+    hi = pd.Timestamp(end) + max(horizons) * FIFTEEN_MINUTES if end is not None else None
+    # Rolling statistics carry float error from every earlier row, so features
+    # are built from the start of history, exactly as in training.
+    raw = pd.concat(list(history.iter_range(None, hi, chunk_rows=500_000)), ignore_index=True)
+
+    # One feature matrix serves every horizon; only the target columns differ.
+    matrix = make_feature_matrix(raw, horizons).loc[start:end]
+    results = run_hindcast(
+        matrix,
+        {horizon: (state.model, state.features) for horizon, state in states.items()},
+        workers=workers,
+        chunk_rows=chunk_rows,
+    )
+    errors = hindcast_errors(results, BUCKET_FREQS[bucket])
+
+    predictions_path = write_columnar(results, output_dir / 'hindcast')
+    errors_path = write_columnar(errors, output_dir / f'hindcast_errors_{bucket}')
+
+    overall = hindcast_errors(results, freq=None)
+    summary = {
+        'start': str(matrix.index.min()),
+        'end': str(matrix.index.max()),
+        'origins': len(matrix),
+        'rows': len(results),
+        'predictions': str(predictions_path),
+        'errors': str(errors_path),
+        'horizons': {int(row.pop('horizon')): row for row in overall.to_dict(orient='records')},
+    }
+    (output_dir / 'summary.json').write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Hindcast the trained models over history')
+    parser.add_argument('--data', type=Path, default=DATA_PATH, help='Path to Renewable.csv')
+    parser.add_argument('--start', type=datetime.fromisoformat, help='First origin timestamp (ISO 8601)')
+    parser.add_argument('--end', type=datetime.fromisoformat, help='Last origin timestamp (ISO 8601)')
+    parser.add_argument(
+        '--horizons',
+        type=int,
+        nargs='+',
+        help='Horizons to hindcast (defaults to every trained model)',
+    )
+    parser.add_argument(
+        '--bucket',
+        choices=sorted(BUCKET_FREQS),
+        default='day',
+        help='Bucket for the actual-vs-predicted error table',
+    )
+    parser.add_argument('--workers', type=int, help='Prediction processes (defaults to the CPU count, max 8)')
+    parser.add_argument('--chunk-rows', type=int, default=HINDCAST_CHUNK_ROWS, help='Feature rows per prediction task')
+    parser.add_argument('--output', type=Path, default=OUTPUT_DIR, help='Directory for the result files')
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    summary = hindcast(
+        args.data,
+        start=args.start,
+        end=args.end,
+        horizons=args.horizons,
+        bucket=args.bucket,
+        workers=args.workers,
+        chunk_rows=args.chunk_rows,
+        output_dir=args.output,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import joblib
+import pandas as pd
+
+from ...domain.interfaces import AnomalyDetectorGateway
+
+COUNTER_KEYS = ('scored_rows', 'anomalies', 'scored_through')
+
+
+class ArtifactAnomalyDetectorRepository(AnomalyDetectorGateway):
+    """Stores the fitted anomaly detector next to the forecasting artifacts.
+
+    The running totals live in a small JSON sidecar, so recording newly
+    scored rows does not rewrite the fitted model.
+    """
+
+    def __init__(self, artifact_path: Path):
+        self._artifact_path = artifact_path
+        self._counters_path = artifact_path.with_suffix('.counters.json')
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self._artifact_path.exists():
+            return None
+        payload = joblib.load(self._artifact_path)
+        if self._counters_path.exists():
+            counters = json.loads(self._counters_path.read_text())
+            if counters.get('scored_through') is not None:
+                counters['scored_through'] = pd.Timestamp(counters['scored_through'])
+            payload.update({key: counters[key] for key in COUNTER_KEYS if key in counters})
+        return payload
+
+    def save(self, payload: Dict[str, Any]) -> None:
+        self._artifact_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._artifact_path.with_suffix('.tmp')
+        joblib.dump(payload, tmp_path)
+        os.replace(tmp_path, self._artifact_path)
+        # A new fit starts its own totals; drop any left by the previous one.
+        self.save_counters(payload)
+
+    def save_counters(self, counters: Dict[str, Any]) -> None:
+        self._artifact_path.parent.mkdir(parents=True, exist_ok=True)
+        scored_through = counters.get('scored_through')
+        content = {
+            'scored_rows': int(counters['scored_rows']),
+            'anomalies': int(counters['anomalies']),
+            'scored_through': None if scored_through is None else str(scored_through),
+        }
+        tmp_path = self._counters_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(content))
+        os.replace(tmp_path, self._counters_path)
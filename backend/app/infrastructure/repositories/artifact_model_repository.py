@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
+import shutil
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import joblib
 
 from ...domain.entities import ModelState
 from ...domain.exceptions import ModelNotReadyError
 from ...domain.interfaces import ModelGateway
+from ..services.prediction_intervals import MIN_QUANTILE_LEVELS
 
 
 class ArtifactModelRepository(ModelGateway):
@@ -19,6 +22,7 @@ class ArtifactModelRepository(ModelGateway):
         self._legacy_model_path = artifacts_dir / 'model.joblib'
         self._legacy_metrics_path = artifacts_dir / 'metrics.json'
         self._state_cache: Dict[int, ModelState] = {}
+        self._ensemble_cache: Dict[int, Dict[str, Any]] = {}
         self._artifact_index: Dict[int, Path] = {}
         self._refresh_index()
 
@@ -77,20 +81,92 @@ class ArtifactModelRepository(ModelGateway):
         if metrics_path:
             metrics = json.loads(metrics_path.read_text())
 
-        state = ModelState(
+        state = self._state_from_payload(payload, metrics)
+        self._state_cache[target_horizon] = state
+        return state
+
+    @staticmethod
+    def _state_from_payload(payload: Dict[str, Any], metrics: Dict[str, Any]) -> ModelState:
+        quantile_models = payload.get('quantile_models', {})
+        if quantile_models and len(quantile_models) < MIN_QUANTILE_LEVELS:
+            print(
+                f"Warning: ignoring quantile models for horizon={payload['horizon']}: "
+                f"{len(quantile_models)} level(s), need {MIN_QUANTILE_LEVELS}"
+            )
+            quantile_models = {}
+        return ModelState(
             model=payload['model'],
             features=payload['features'],
             horizon=payload['horizon'],
             metrics=metrics,
+            calibration=payload.get('calibration', {}),
+            quantile_models=quantile_models,
+            trained_on=payload.get('trained_on', {}),
+            version=payload.get('version', 1),
         )
-        self._state_cache[target_horizon] = state
+
+    def get_ensemble_members(self, horizon: int) -> Dict[str, Any]:
+        """Return the secondary ensemble models trained offline for ``horizon``.
+
+        Members built for a different feature list than the served model (the
+        main model was retrained without ``--ensemble``) are skipped.
+        """
+        if horizon in self._ensemble_cache:
+            return self._ensemble_cache[horizon]
+
+        ensemble_path = self._artifacts_dir / f'ensemble_h{horizon}.joblib'
+        members: Dict[str, Any] = {}
+        if ensemble_path.exists():
+            payload = joblib.load(ensemble_path)
+            features = self.get_state(horizon).features
+            if list(payload.get('features', [])) == list(features):
+                members = dict(payload.get('models', {}))
+            else:
+                print(
+                    f'Warning: ignoring stale {ensemble_path.name}: its feature list does not match '
+                    f'the horizon={horizon} model; retrain with --ensemble to refresh it'
+                )
+        self._ensemble_cache[horizon] = members
+        return members
+
+    def publish(self, horizon: int, payload: Dict[str, Any], metrics: Dict[str, Any]) -> ModelState:
+        """Write ``payload`` as a new version of the ``horizon`` model and serve it from now on.
+
+        The version is archived under ``versions/`` and copied over the live
+        artifact with an atomic rename, so readers never see a partial file.
+        The cached state is swapped in one assignment; requests already
+        holding the previous state finish with it.
+        """
+        version = payload.get('version', 1)
+        versions_dir = self._artifacts_dir / 'versions'
+        versions_dir.mkdir(parents=True, exist_ok=True)
+        archive_path = versions_dir / f'model_h{horizon}_v{version}.joblib'
+        tmp_path = archive_path.with_suffix('.tmp')
+        joblib.dump(payload, tmp_path)
+        os.replace(tmp_path, archive_path)
+
+        model_path = self._artifacts_dir / f'model_h{horizon}.joblib'
+        tmp_path = model_path.with_suffix('.tmp')
+        shutil.copyfile(archive_path, tmp_path)
+        os.replace(tmp_path, model_path)
+
+        metrics_path = self._artifacts_dir / f'metrics_h{horizon}.json'
+        tmp_path = metrics_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(metrics, indent=2))
+        os.replace(tmp_path, metrics_path)
+
+        state = self._state_from_payload(payload, metrics)
+        self._state_cache[horizon] = state
+        self._refresh_index()
         return state
 
     def refresh(self, horizon: Optional[int] = None) -> ModelState:
         """Force a reload of the cached model state."""
         if horizon is None:
             self._state_cache.clear()
+            self._ensemble_cache.clear()
             self._refresh_index()
             return self.get_state()
         self._state_cache.pop(horizon, None)
+        self._ensemble_cache.pop(horizon, None)
         return self.get_state(horizon)
@@ -1,25 +1,271 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 from ...domain.exceptions import HistoryNotAvailableError
 from ...domain.interfaces import HistoryGateway
+from ..services.feature_engineering import parse_time_column
+
+HISTORY_TIME_FORMAT = '%d/%m/%Y %H:%M'
+
+
+COMPACT_SEGMENTS = 16
 
 
 class CSVHistoryRepository(HistoryGateway):
-    """Provides access to the persisted Renewable.csv dataset."""
+    """Provides access to the persisted Renewable.csv dataset.
+
+    Imported rows are written as sorted, append-only segment files next to the
+    base CSV, so an import costs a write proportional to its own size. Parsed
+    files are kept in memory as separate parts: an import adds a part, tail
+    reads (``load(limit=...)``) are served from the last parts, and the parts
+    are only concatenated when the whole history is requested. Once more than
+    ``COMPACT_SEGMENTS`` segment files exist they are compacted into one, which
+    bounds both the part count and what a cold start has to read.
+
+    Frames returned by ``load`` share memory with the cache and must be
+    treated as read-only; under pandas Copy-on-Write, writes to them never
+    reach the cache.
+    """
 
     def __init__(self, dataset_path: Path):
         self._dataset_path = dataset_path
+        self._segments_dir = dataset_path.with_name(f'{dataset_path.stem}_segments')
+        self._lock = threading.RLock()
+        # Parsed (frame, sorted times) per file, or a single consolidated part.
+        self._parts: list[tuple[pd.DataFrame, np.ndarray]] = []
+        # Whether every part starts after the previous one ends.
+        self._ordered = True
+        self._signature: tuple = ()
 
     def load(self, limit: Optional[int] = None) -> pd.DataFrame:
-        if not self._dataset_path.exists():
-            raise HistoryNotAvailableError(f'Dataset not found at {self._dataset_path}')
+        with self._lock:
+            self._sync()
+            if limit and self._ordered:
+                frame = self._tail(limit)
+            else:
+                frame, _ = self._consolidated()
+                if limit:
+                    frame = frame.tail(limit)
+        return frame.copy(deep=False)
+
+    def content_fingerprint(self) -> str:
+        """Hash of the raw bytes of every history file; cheap next to parsing them."""
+        digest = hashlib.sha256()
+        for path in self._files():
+            digest.update(path.name.encode('utf-8'))
+            with path.open('rb') as handle:
+                for block in iter(lambda: handle.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()[:32]
+
+    def iter_range(
+        self,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        chunk_rows: int = 50_000,
+    ) -> Iterator[pd.DataFrame]:
+        if chunk_rows < 1:
+            raise ValueError('chunk_rows must be at least 1')
+        with self._lock:
+            self._sync()
+            frame, times = self._consolidated()
+        # Work on the snapshot taken above; a concurrent import adds new parts.
+        lo = int(np.searchsorted(times, np.datetime64(start, 'ns'), side='left')) if start is not None else 0
+        # Unparseable timestamps sort last (NaT) and are never exported.
+        hi = len(times) - int(np.isnat(times).sum())
+        if end is not None:
+            hi = min(hi, int(np.searchsorted(times, np.datetime64(end, 'ns'), side='right')))
+        for offset in range(lo, hi, chunk_rows):
+            yield frame.iloc[offset:min(offset + chunk_rows, hi)]
+
+    def append(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        with self._lock:
+            self._sync(required=False)
+            columns = next((list(frame.columns) for frame, _ in self._parts if len(frame.columns)), None)
+            seen = np.empty(0, dtype='datetime64[ns]')
+
+            self._segments_dir.mkdir(parents=True, exist_ok=True)
+            name = f"segment_{datetime.now().strftime('%Y%m%d%H%M%S%f')}.csv"
+            segment_path = self._segments_dir / name
+            tmp_path = segment_path.with_suffix('.tmp')
+
+            received = appended = duplicates = rejected = 0
+            start: Optional[pd.Timestamp] = None
+            end: Optional[pd.Timestamp] = None
+            try:
+                with tmp_path.open('w', newline='', encoding='utf-8') as handle:
+                    for chunk in chunks:
+                        received += len(chunk)
+                        if columns is None:
+                            columns = list(chunk.columns)
+                        times = parse_time_column(chunk['Time'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+                        valid = ~np.isnat(times)
+                        rejected += int((~valid).sum())
+
+                        # Keep the first occurrence inside the import and never overwrite history.
+                        _, first = np.unique(times, return_index=True)
+                        keep = np.zeros(len(times), dtype=bool)
+                        keep[first] = True
+                        keep &= valid & ~_contains(seen, times)
+                        for _, part_times in self._parts:
+                            keep &= ~_contains(part_times, times)
+                        duplicates += int((valid & ~keep).sum())
+                        if not keep.any():
+                            continue
+
+                        rows = chunk.loc[keep].reindex(columns=columns)
+                        kept_times = times[keep]
+                        order = np.argsort(kept_times, kind='stable')
+                        rows = rows.iloc[order].copy()
+                        kept_times = kept_times[order]
+                        rows['Time'] = pd.DatetimeIndex(kept_times).strftime(HISTORY_TIME_FORMAT)
+                        rows.to_csv(handle, index=False, header=appended == 0)
+
+                        appended += len(rows)
+                        seen = np.union1d(seen, kept_times)
+                        start = min(start, pd.Timestamp(kept_times[0])) if start is not None else pd.Timestamp(kept_times[0])
+                        end = max(end, pd.Timestamp(kept_times[-1])) if end is not None else pd.Timestamp(kept_times[-1])
+
+                if appended:
+                    os.replace(tmp_path, segment_path)
+                    self._add_file(segment_path)
+                    self._compact_segments()
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+            return {
+                'rows_received': received,
+                'rows_appended': appended,
+                'duplicates_skipped': duplicates,
+                'rows_rejected': rejected,
+                'start': start,
+                'end': end,
+                'segment': segment_path.name if appended else None,
+            }
+
+    def _files(self) -> list[Path]:
+        files = [self._dataset_path] if self._dataset_path.exists() else []
+        if self._segments_dir.exists():
+            files.extend(sorted(self._segments_dir.glob('segment_*.csv')))
+        return files
+
+    def _file_signature(self, files: list[Path]) -> tuple:
+        signature = []
+        for path in files:
+            stat = path.stat()
+            signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _sync(self, required: bool = True) -> None:
+        """Bring the parts in line with the files on disk, reading only what changed."""
+        files = self._files()
+        if not files:
+            if required:
+                raise HistoryNotAvailableError(f'Dataset not found at {self._dataset_path}')
+            self._parts, self._ordered, self._signature = [], True, ()
+            return
+
+        signature = self._file_signature(files)
+        if self._parts and signature == self._signature:
+            return
+        if self._parts and signature[:len(self._signature)] == self._signature:
+            # Only new segments were added (e.g. by another worker): read just those.
+            for path in files[len(self._signature):]:
+                self._add_file(path)
+            return
+
+        self._parts, self._ordered, self._signature = [], True, ()
+        for path in files:
+            self._add_file(path)
+        if len(self._parts) > 1:
+            # A crash during compaction can leave rows in two files; keep the first copy.
+            frame, times = self._consolidated()
+            valid = np.flatnonzero(~np.isnat(times))
+            _, first = np.unique(times[valid], return_index=True)
+            if len(first) < len(valid):
+                keep = np.isnat(times)
+                keep[valid[first]] = True
+                self._parts = [(frame.loc[keep].reset_index(drop=True), times[keep])]
+
+    def _add_file(self, path: Path) -> None:
+        frame = pd.read_csv(path)
+        times = parse_time_column(frame['Time'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        if not _is_sorted(times):
+            order = np.argsort(times, kind='stable')
+            frame = frame.iloc[order].reset_index(drop=True)
+            times = times[order]
+        if self._parts and len(times):
+            previous = self._parts[-1][1]
+            # Unparseable base rows sort last, so the parts no longer follow each other.
+            self._ordered = self._ordered and not np.isnat(previous[-1]) and times[0] > previous[-1]
+        self._parts.append((frame, times))
+        stat = path.stat()
+        self._signature = self._signature + ((path.name, stat.st_mtime_ns, stat.st_size),)
+
+    def _consolidated(self) -> tuple[pd.DataFrame, np.ndarray]:
+        """The whole history as one sorted frame, concatenating pending parts once."""
+        if not self._parts:
+            return pd.DataFrame(), np.empty(0, dtype='datetime64[ns]')
+        if len(self._parts) > 1:
+            frame = pd.concat([frame for frame, _ in self._parts], ignore_index=True)
+            times = np.concatenate([times for _, times in self._parts])
+            if not self._ordered:
+                # Backfilled rows: restore chronological order.
+                order = np.argsort(times, kind='stable')
+                frame = frame.iloc[order].reset_index(drop=True)
+                times = times[order]
+            self._parts, self._ordered = [(frame, times)], True
+        return self._parts[0]
+
+    def _tail(self, limit: int) -> pd.DataFrame:
+        """The last ``limit`` rows, read from as few trailing parts as cover them."""
+        frames: list[pd.DataFrame] = []
+        rows = 0
+        for frame, _ in reversed(self._parts):
+            frames.append(frame)
+            rows += len(frame)
+            if rows >= limit:
+                break
+        if len(frames) == 1:
+            return frames[0].tail(limit)
+        return pd.concat(frames[::-1], ignore_index=True).tail(limit)
+
+    def _compact_segments(self) -> None:
+        """Merge the segment files into one once there are more than ``COMPACT_SEGMENTS``."""
+        segments = [path for path in self._files() if path != self._dataset_path]
+        if len(segments) <= COMPACT_SEGMENTS:
+            return
+        frame = pd.concat([pd.read_csv(path) for path in segments], ignore_index=True)
+        times = parse_time_column(frame['Time'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        frame = frame.iloc[np.argsort(times, kind='stable')]
+        # Sorts right after the newest merged segment, so later imports still follow it.
+        target = segments[-1].with_name(f'{segments[-1].stem}_compacted.csv')
+        tmp_path = target.with_suffix('.tmp')
+        frame.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, target)
+        for path in segments:
+            if path != target:
+                path.unlink()
+        # The in-memory rows are unchanged; only the file layout moved.
+        self._signature = self._file_signature(self._files())
+
+
+def _is_sorted(values: np.ndarray) -> bool:
+    return len(values) < 2 or bool((values[1:] >= values[:-1]).all())
+
 
-        frame = pd.read_csv(self._dataset_path)
-        if limit:
-            return frame.tail(limit)
-        return frame
+def _contains(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values)
+    positions = np.clip(positions, 0, len(sorted_values) - 1)
+    return sorted_values[positions] == values
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+from .feature_engineering import parse_time_column
+
+DEFAULT_CONTAMINATION = 0.1
+DEFAULT_FIT_ROWS = 10_000
+
+
+def numeric_columns(data: pd.DataFrame) -> list[str]:
+    return list(data.select_dtypes(include=[np.number]).columns)
+
+
+def latest_timestamp(data: pd.DataFrame) -> Optional[pd.Timestamp]:
+    if 'Time' not in data or data.empty:
+        return None
+    parsed = parse_time_column(data['Time'], errors='coerce').dropna()
+    return parsed.max() if not parsed.empty else None
+
+
+def fit_anomaly_detector(
+    data: pd.DataFrame,
+    contamination: float = DEFAULT_CONTAMINATION,
+) -> Dict[str, Any]:
+    """Fit an Isolation Forest on the numeric columns and score the training rows.
+
+    The returned payload is what gets persisted: the detector, its input
+    columns, and running totals seeded from the training rows.
+    """
+    columns = numeric_columns(data)
+    clean = data[columns].dropna()
+    if not columns or clean.empty:
+        raise ValueError('No numeric rows available to fit the anomaly detector')
+
+    detector = IsolationForest(contamination=contamination, random_state=42)
+    detector.fit(clean)
+    anomalies = int(np.count_nonzero(detector.predict(clean) == -1))
+    return {
+        'model': detector,
+        'columns': columns,
+        'fitted_at': datetime.now(),
+        'scored_rows': int(len(clean)),
+        'anomalies': anomalies,
+        'scored_through': latest_timestamp(data),
+    }
+
+
+def score_anomalies(payload: Dict[str, Any], data: pd.DataFrame) -> tuple[int, int]:
+    """Score ``data`` with a fitted detector; returns ``(scored_rows, anomalies)``."""
+    columns = payload['columns']
+    if data.empty or any(column not in data for column in columns):
+        return 0, 0
+    clean = data[columns].dropna()
+    if clean.empty:
+        return 0, 0
+    predictions = payload['model'].predict(clean)
+    return int(len(clean)), int(np.count_nonzero(predictions == -1))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import joblib
+import lightgbm as lgb
+import pandas as pd
+
+# Parameters that change how a Dataset is binned; boosting parameters do not.
+DATASET_PARAMS = {'max_bin': 255, 'verbosity': -1}
+
+
+class DatasetCache:
+    """On-disk cache of engineered feature matrices and binned LightGBM datasets.
+
+    Feature matrices are keyed by the raw data fingerprint and the feature
+    configuration, so new horizons reuse them. Binned train/validation
+    Datasets are stored with LightGBM's binary format per horizon and split,
+    so changing boosting hyperparameters skips histogram construction too.
+    Files are written to a temporary name and moved into place.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+    def load_features(self, key: str) -> Optional[tuple[pd.DataFrame, pd.Series]]:
+        path = self._root / key / 'features.joblib'
+        if not path.exists():
+            return None
+        payload = joblib.load(path)
+        return payload['features'], payload['energy']
+
+    def save_features(self, key: str, features: pd.DataFrame, energy: pd.Series) -> None:
+        path = self._root / key / 'features.joblib'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        joblib.dump({'features': features, 'energy': energy}, tmp_path)
+        os.replace(tmp_path, path)
+
+    def datasets(
+        self,
+        key: str,
+        train: tuple[pd.DataFrame, pd.Series],
+        valid: tuple[pd.DataFrame, pd.Series],
+    ) -> tuple[lgb.Dataset, lgb.Dataset]:
+        """Binned train/validation Datasets, loaded from disk or constructed and saved."""
+        directory = self._root / key
+        train_path, valid_path = directory / 'train.bin', directory / 'valid.bin'
+        if train_path.exists() and valid_path.exists():
+            train_set = lgb.Dataset(str(train_path), params=DATASET_PARAMS, free_raw_data=False)
+            valid_set = lgb.Dataset(str(valid_path), reference=train_set, params=DATASET_PARAMS, free_raw_data=False)
+            return train_set, valid_set
+
+        train_set, valid_set = build_datasets(train, valid)
+        directory.mkdir(parents=True, exist_ok=True)
+        for dataset, path in ((train_set, train_path), (valid_set, valid_path)):
+            tmp_path = path.with_suffix('.tmp')
+            dataset.construct().save_binary(str(tmp_path))
+            os.replace(tmp_path, path)
+        return train_set, valid_set
+
+
+def build_datasets(
+    train: tuple[pd.DataFrame, pd.Series],
+    valid: tuple[pd.DataFrame, pd.Series],
+) -> tuple[lgb.Dataset, lgb.Dataset]:
+    """Train/validation Datasets sharing the training split's bin boundaries."""
+    train_set = lgb.Dataset(*train, params=DATASET_PARAMS, free_raw_data=False)
+    valid_set = lgb.Dataset(*valid, reference=train_set, params=DATASET_PARAMS, free_raw_data=False)
+    return train_set, valid_set
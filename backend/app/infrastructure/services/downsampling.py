@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import numpy as np
+
+DOWNSAMPLING_METHODS = ('lttb', 'minmax')
+MIN_POINTS = 3
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points that keep the visual shape.
+
+    The first and last points are always kept. Each interior bucket keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket; the per-bucket search is vectorized.
+    """
+    n = len(y)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Mean of each interior bucket, plus the final point as the last "next" bucket.
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    next_x = np.append(sums_x / sizes, x[-1])[1:]
+    next_y = np.append(sums_y / sizes, y[-1])[1:]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        areas = np.abs(
+            (x[a] - next_x[bucket]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[bucket] - y[a])
+        )
+        a = lo + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of each bucket's minimum and maximum, in order, plus both end points.
+
+    Spikes and dips survive however far the series is reduced, at the cost of
+    a less even spacing than LTTB.
+    """
+    n = len(y)
+    if threshold >= n or threshold < MIN_POINTS:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+
+    buckets = max(1, (threshold - 2) // 2)
+    owner = np.linspace(0, buckets, n - 2, endpoint=False).astype(np.int64)
+    order = np.lexsort((y[1:n - 1], owner)) + 1
+    starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+    ends = np.r_[starts[1:], n - 2] - 1
+    picked = np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+    return picked
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb') -> np.ndarray:
+    """Positions to keep so that at most ``max_points`` points remain.
+
+    Missing ``y`` values are treated as zero when choosing points.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f'Unknown downsampling method: {method}')
+    y = np.nan_to_num(np.asarray(y, dtype=float), nan=0.0)
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    return lttb_indices(x, y, max_points)
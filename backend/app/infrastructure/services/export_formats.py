@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow is optional; Arrow IPC export is unavailable without it.
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on the deployment environment
+    pa = None
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+def check_format(fmt: str) -> None:
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f'Unknown export format: {fmt}')
+    if fmt == 'arrow' and pa is None:
+        raise ValueError('Arrow export requires pyarrow to be installed')
+
+
+def encode_frames(frames: Iterable[pd.DataFrame], fmt: str) -> Iterator[bytes]:
+    """Encode consecutive frames as one CSV, NDJSON or Arrow IPC stream, one piece per frame."""
+    check_format(fmt)
+    if fmt == 'arrow':
+        yield from _encode_arrow(frames)
+        return
+    header = True
+    for frame in frames:
+        if fmt == 'csv':
+            text = frame.to_csv(index=False, header=header, date_format='%Y-%m-%dT%H:%M:%S')
+            header = False
+        else:
+            text = frame.to_json(orient='records', lines=True, date_format='iso', date_unit='s')
+            text = text if text.endswith('\n') or not text else text + '\n'
+        if text:
+            yield text.encode('utf-8')
+
+
+def _encode_arrow(frames: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    sink = io.BytesIO()
+    writer = schema = None
+    for frame in frames:
+        # Chunks may infer int or float for the same column; fix every number to float64.
+        numeric = frame.select_dtypes(include=[np.number]).columns
+        frame = frame.astype({column: 'float64' for column in numeric})
+        batch = pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+        if writer is None:
+            schema = batch.schema
+            writer = pa.ipc.new_stream(sink, schema)
+        writer.write_batch(batch)
+        yield _drain(sink)
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, List, Optional
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -11,6 +11,24 @@ from ...domain.exceptions import HistoryNotAvailableError
 
 DEFAULT_LAGS: tuple[int, ...] = (1, 4, 8, 16, 24)
 DEFAULT_ROLL_WINDOWS: tuple[int, ...] = (4, 8, 16, 32)
+WEATHER_COLUMNS: tuple[str, ...] = (
+    'temp',
+    'humidity',
+    'wind_speed',
+    'GHI',
+    'clouds_all',
+    'rain_1h',
+    'snow_1h',
+    'sunlightTime',
+    'SunlightTime/daylength',
+)
+WEATHER_LAGS: tuple[int, ...] = (1, 4, 8)
+CALENDAR_FEATURES: tuple[str, ...] = ('hour_sin', 'hour_cos', 'dow_sin', 'dow_cos', 'month_sin', 'month_cos')
+# Raw columns that follow from the timestamp rather than the weather.
+CLOCK_COLUMNS: tuple[str, ...] = ('hour', 'month')
+SOLAR_COLUMNS: tuple[str, ...] = ('isSun', 'sunlightTime', 'dayLength', 'SunlightTime/daylength')
+TIME_COLUMNS: tuple[str, ...] = CLOCK_COLUMNS + SOLAR_COLUMNS
+SLOTS_PER_DAY = 96
 
 
 ISO_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
@@ -29,7 +47,7 @@ def _should_override_dayfirst(series: pd.Series) -> bool:
     return False
 
 
-def _parse_time_column(
+def parse_time_column(
     series: pd.Series,
     *,
     errors: str = 'raise',
@@ -46,18 +64,13 @@ def _parse_time_column(
     return converted
 
 
-def make_features(
-    raw: pd.DataFrame,
-    horizon: int = 1,
-    lags: Iterable[int] = DEFAULT_LAGS,
-    roll_windows: Iterable[int] = DEFAULT_ROLL_WINDOWS,
-) -> pd.DataFrame:
-    """Build lagged, rolling, and calendar features used by the forecaster."""
+def prepare_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """Parse, regularise and clean the raw dataset ahead of feature construction."""
     df = raw.copy()
     if 'Time' not in df:
         raise ValueError("Input frame must contain a 'Time' column")
 
-    df['Time'] = _parse_time_column(df['Time'])
+    df['Time'] = parse_time_column(df['Time'])
     df = df.sort_values('Time').set_index('Time').asfreq('15min')
 
     # Rename to a consistent internal name and clean obvious issues.
@@ -66,7 +79,75 @@ def make_features(
         raise ValueError("Expected 'Energy delta[Wh]' column in source data")
 
     df = df[df['energy_wh'] >= 0]
-    df = df.interpolate(limit_direction='both', limit=4)
+    return df.interpolate(limit_direction='both', limit=4)
+
+
+def calendar_features(idx: pd.DatetimeIndex) -> dict[str, np.ndarray]:
+    return {
+        'hour_sin': np.sin(2 * np.pi * idx.hour / 24),
+        'hour_cos': np.cos(2 * np.pi * idx.hour / 24),
+        'dow_sin': np.sin(2 * np.pi * idx.dayofweek / 7),
+        'dow_cos': np.cos(2 * np.pi * idx.dayofweek / 7),
+        'month_sin': np.sin(2 * np.pi * idx.month / 12),
+        'month_cos': np.cos(2 * np.pi * idx.month / 12),
+    }
+
+
+def time_columns(prepared: pd.DataFrame, steps: int) -> dict[str, np.ndarray]:
+    """Clock and sun columns for the ``steps`` slots after the end of ``prepared``.
+
+    ``hour`` and ``month`` come from each slot's timestamp. The sun columns
+    depend on the site, so each slot repeats the value recorded at the same
+    time of day on the latest day of history; they drift by minutes a day.
+    """
+    timestamps = pd.date_range(prepared.index[-1] + pd.Timedelta(minutes=15), periods=steps, freq='15min')
+    columns: dict[str, np.ndarray] = {
+        'hour': timestamps.hour.to_numpy(dtype=float),
+        'month': timestamps.month.to_numpy(dtype=float),
+    }
+    solar = [column for column in SOLAR_COLUMNS if column in prepared]
+    if solar:
+        if len(prepared) < SLOTS_PER_DAY:
+            raise HistoryNotAvailableError(
+                f'Deriving {solar} for future slots needs at least {SLOTS_PER_DAY} prepared history rows'
+            )
+        offsets = np.arange(1, steps + 1)
+        rows = len(prepared) - 1 + offsets - SLOTS_PER_DAY * np.ceil(offsets / SLOTS_PER_DAY).astype(int)
+        for column in solar:
+            columns[column] = prepared[column].to_numpy(dtype=float)[rows]
+    return columns
+
+
+def feature_frame(matrix: np.ndarray, features: list[str]) -> pd.DataFrame:
+    """Wrap a feature matrix so estimators fitted on named columns accept it."""
+    return pd.DataFrame(matrix, columns=features, copy=False)
+
+
+def target_column(horizon: int) -> str:
+    return f'target_h{horizon}'
+
+
+def feature_config(
+    lags: Iterable[int] = DEFAULT_LAGS,
+    roll_windows: Iterable[int] = DEFAULT_ROLL_WINDOWS,
+) -> dict:
+    """Everything besides the raw data that determines the feature matrix, for cache keys."""
+    return {
+        'lags': list(lags),
+        'roll_windows': list(roll_windows),
+        'weather_columns': list(WEATHER_COLUMNS),
+        'weather_lags': list(WEATHER_LAGS),
+        'calendar_features': list(CALENDAR_FEATURES),
+    }
+
+
+def make_feature_base(
+    raw: pd.DataFrame,
+    lags: Iterable[int] = DEFAULT_LAGS,
+    roll_windows: Iterable[int] = DEFAULT_ROLL_WINDOWS,
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Complete feature rows, plus the cleaned energy series every target is shifted from."""
+    df = prepare_frame(raw)
 
     for lag in lags:
         df[f'lag_{lag}'] = df['energy_wh'].shift(lag)
@@ -74,33 +155,53 @@ def make_features(
         df[f'roll_mean_{window}'] = df['energy_wh'].shift(1).rolling(window).mean()
         df[f'roll_std_{window}'] = df['energy_wh'].shift(1).rolling(window).std()
 
-    weather_cols: List[str] = [
-        'temp',
-        'humidity',
-        'wind_speed',
-        'GHI',
-        'clouds_all',
-        'rain_1h',
-        'snow_1h',
-        'sunlightTime',
-        'SunlightTime/daylength',
-    ]
-    for col in weather_cols:
+    for col in WEATHER_COLUMNS:
         if col not in df:
             continue
-        for lag in (1, 4, 8):
+        for lag in WEATHER_LAGS:
             df[f'{col}_lag_{lag}'] = df[col].shift(lag)
 
-    idx = df.index
-    df['hour_sin'] = np.sin(2 * np.pi * idx.hour / 24)
-    df['hour_cos'] = np.cos(2 * np.pi * idx.hour / 24)
-    df['dow_sin'] = np.sin(2 * np.pi * idx.dayofweek / 7)
-    df['dow_cos'] = np.cos(2 * np.pi * idx.dayofweek / 7)
-    df['month_sin'] = np.sin(2 * np.pi * idx.month / 12)
-    df['month_cos'] = np.cos(2 * np.pi * idx.month / 12)
+    for name, values in calendar_features(df.index).items():
+        df[name] = values
+
+    return df.dropna(), df['energy_wh']
+
 
-    df['target'] = df['energy_wh'].shift(-horizon)
-    return df.dropna()
+def add_targets(features: pd.DataFrame, energy: pd.Series, horizons: Iterable[int]) -> pd.DataFrame:
+    targets = {target_column(horizon): energy.shift(-horizon) for horizon in horizons}
+    return pd.concat([features, pd.DataFrame(targets, index=energy.index).loc[features.index]], axis=1)
+
+
+def make_feature_matrix(
+    raw: pd.DataFrame,
+    horizons: Iterable[int] = (1,),
+    lags: Iterable[int] = DEFAULT_LAGS,
+    roll_windows: Iterable[int] = DEFAULT_ROLL_WINDOWS,
+) -> pd.DataFrame:
+    """Build the features once, with a ``target_h{h}`` column for each horizon.
+
+    Rows missing a feature are dropped, but targets may be NaN where the
+    future reading is not available, so every horizon can share one matrix.
+    """
+    return add_targets(*make_feature_base(raw, lags, roll_windows), horizons)
+
+
+def make_features(
+    raw: pd.DataFrame,
+    horizon: int = 1,
+    lags: Iterable[int] = DEFAULT_LAGS,
+    roll_windows: Iterable[int] = DEFAULT_ROLL_WINDOWS,
+) -> pd.DataFrame:
+    """Build lagged, rolling, and calendar features used by the forecaster."""
+    return horizon_frame(make_feature_matrix(raw, (horizon,), lags, roll_windows), horizon)
+
+
+def horizon_frame(matrix: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    """The ``make_features`` frame for ``horizon``, cut from a shared feature matrix."""
+    targets = [col for col in matrix.columns if col.startswith('target_h')]
+    frame = matrix.drop(columns=targets)
+    frame['target'] = matrix[target_column(horizon)]
+    return frame.dropna(subset=['target'])
 
 
 class FeatureEngineer:
@@ -131,7 +232,7 @@ class FeatureEngineer:
         if 'Time' not in history_df:
             raise HistoryNotAvailableError("History requires a 'Time' column")
         frame = history_df.copy()
-        frame['Time'] = _parse_time_column(frame['Time'], errors='coerce')
+        frame['Time'] = parse_time_column(frame['Time'], errors='coerce')
         frame = frame.dropna(subset=['Time']).sort_values('Time')
         if frame.empty:
             raise HistoryNotAvailableError('No valid timestamps found in history payload')
@@ -141,7 +242,7 @@ class FeatureEngineer:
         if 'Time' not in future_df:
             raise ValueError("future_weather requires a 'Time' column")
         frame = future_df.copy()
-        frame['Time'] = _parse_time_column(frame['Time'], errors='coerce')
+        frame['Time'] = parse_time_column(frame['Time'], errors='coerce')
         frame = frame.dropna(subset=['Time']).sort_values('Time')
         if frame.empty:
             raise ValueError('No valid timestamps found in future_weather payload')
@@ -171,6 +272,58 @@ class FeatureEngineer:
             raise HistoryNotAvailableError('Unable to assemble features for future horizon')
         return feature_frame.tail(len(future_df))[state.features]
 
+    def prepare_history(self, history_df: pd.DataFrame) -> pd.DataFrame:
+        """Return the cleaned 15-minute frame ``make_features`` would build on."""
+        prepared = prepare_frame(history_df.tail(self.history_window))
+        if prepared.empty:
+            raise HistoryNotAvailableError('Not enough historical data to build features')
+        return prepared
+
+    def baseline_exogenous_path(self, prepared: pd.DataFrame, columns: list[str], steps: int) -> np.ndarray:
+        """Exogenous inputs for the ``steps`` slots after ``prepared`` when no weather is supplied.
+
+        Clock and sun columns follow each slot's timestamp (see ``time_columns``);
+        weather drivers hold their last observed value.
+        """
+        values = np.tile(prepared[columns].iloc[-1].to_numpy(dtype=float), (steps, 1))
+        derived = time_columns(prepared, steps) if any(column in TIME_COLUMNS for column in columns) else {}
+        for slot, column in enumerate(columns):
+            if column in derived:
+                values[:, slot] = derived[column]
+        return values
+
+    def exogenous_path(
+        self,
+        future_df: pd.DataFrame,
+        columns: list[str],
+        prepared: pd.DataFrame,
+        steps: int,
+    ) -> np.ndarray:
+        """Align future weather onto the ``steps`` slots after the end of ``prepared``.
+
+        Every weather driver must be supplied; slots before its first row carry
+        the last observed value forward. Clock and sun columns are taken from
+        the payload only at the slots it covers and otherwise derived from each
+        slot's timestamp, so they are never frozen.
+        """
+        frame = future_df.drop_duplicates('Time', keep='last').set_index('Time')
+        missing = [
+            column for column in columns
+            if column not in TIME_COLUMNS and (column not in frame or frame[column].isna().all())
+        ]
+        if missing:
+            raise ValueError(f'future_weather is missing required columns: {missing}')
+
+        grid = pd.date_range(prepared.index[-1] + pd.Timedelta(minutes=15), periods=steps, freq='15min')
+        aligned = frame.reindex(columns=columns)
+        values = aligned.reindex(grid, method='ffill').to_numpy(dtype=float)
+        exact = aligned.reindex(grid).to_numpy(dtype=float)
+        for slot, column in enumerate(columns):
+            if column in TIME_COLUMNS:
+                values[:, slot] = exact[:, slot]
+        baseline = self.baseline_exogenous_path(prepared, columns, steps)
+        return np.where(np.isnan(values), baseline, values)
+
     def extract_timestamps(self, df: pd.DataFrame) -> list[str]:
         if df.empty:
             return []
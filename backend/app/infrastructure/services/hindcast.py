@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import feature_frame, target_column
+from .history_rollups import bucket_labels
+
+try:  # pyarrow is optional; results fall back to a NumPy archive without it.
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - depends on the deployment environment
+    pyarrow = None
+
+HINDCAST_CHUNK_ROWS = 20_000
+FIFTEEN_MINUTES = np.timedelta64(15, 'm')
+
+# Horizon -> (fitted model, its feature columns)
+HorizonModels = Dict[int, Tuple[Any, List[str]]]
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def default_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _init_worker(models: HorizonModels, columns: List[str], threads: int) -> None:
+    _WORKER_STATE.update(models=models, columns=columns, threads=threads)
+
+
+def _predict_pooled_chunk(matrix: np.ndarray) -> Dict[int, np.ndarray]:
+    return _predict_chunk(matrix, _WORKER_STATE['models'], _WORKER_STATE['columns'], _WORKER_STATE['threads'])
+
+
+def _predict_chunk(
+    matrix: np.ndarray,
+    models: HorizonModels,
+    columns: List[str],
+    threads: int,
+) -> Dict[int, np.ndarray]:
+    frame = feature_frame(matrix, columns)
+    predictions = {}
+    for horizon, (model, features) in models.items():
+        block = frame if features == columns else frame[features]
+        predictions[horizon] = np.asarray(model.predict(block, num_threads=threads), dtype=float)
+    return predictions
+
+
+def run_hindcast(
+    matrix: pd.DataFrame,
+    models: HorizonModels,
+    workers: Optional[int] = None,
+    chunk_rows: int = HINDCAST_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Predict every row of a shared feature matrix with every horizon's model.
+
+    ``matrix`` comes from ``make_feature_matrix`` and is indexed by origin
+    time. Row chunks are predicted in a process pool, each worker limited to
+    its share of the cores; with one worker or one chunk everything runs
+    in-process. The result is long-form: one row per origin and horizon.
+    """
+    if not models:
+        raise ValueError('No trained horizons to hindcast')
+    if matrix.empty:
+        raise ValueError('No feature rows in the requested range')
+
+    columns = list(dict.fromkeys(col for _, features in models.values() for col in features))
+    values = matrix[columns].to_numpy(dtype=float)
+    chunks = [values[start:start + chunk_rows] for start in range(0, len(values), chunk_rows)]
+    workers = min(workers or default_workers(), len(chunks))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    if workers == 1:
+        parts = [_predict_chunk(chunk, models, columns, threads) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(models, columns, threads),
+        ) as pool:
+            parts = list(pool.map(_predict_pooled_chunk, chunks))
+
+    origins = matrix.index.to_numpy(dtype='datetime64[ns]')
+    frames = []
+    for horizon in sorted(models):
+        frames.append(pd.DataFrame({
+            'origin_time': origins,
+            'horizon': np.full(len(origins), horizon, dtype=np.int32),
+            'target_time': origins + horizon * FIFTEEN_MINUTES,
+            'prediction_wh': np.concatenate([part[horizon] for part in parts]),
+            'actual_wh': matrix[target_column(horizon)].to_numpy(dtype=float),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def hindcast_errors(results: pd.DataFrame, freq: Optional[str] = 'D') -> pd.DataFrame:
+    """Actual-vs-predicted error per target-time bucket and horizon (per horizon only if ``freq`` is None).
+
+    Rows whose actual reading is not known yet are left out; MAPE only counts
+    non-zero actuals, as in the historical analysis.
+    """
+    scored = results[results['actual_wh'].notna()]
+    error = scored['prediction_wh'].to_numpy() - scored['actual_wh'].to_numpy()
+    actual = scored['actual_wh'].to_numpy()
+    nonzero = actual != 0
+    ape = np.where(nonzero, np.abs(error) / np.where(nonzero, np.abs(actual), 1.0), 0.0)
+
+    columns = {'horizon': scored['horizon'].to_numpy()}
+    if freq is not None:
+        columns = {'bucket': bucket_labels(scored['target_time'].to_numpy(dtype='datetime64[ns]'), freq), **columns}
+    grouped = pd.DataFrame({
+        **columns,
+        'count': 1,
+        'abs_error': np.abs(error),
+        'sq_error': error ** 2,
+        'error': error,
+        'ape_count': nonzero.astype(np.int64),
+        'ape_sum': ape,
+    }).groupby(list(columns), sort=True).sum()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'count': grouped['count'],
+            'mae': grouped['abs_error'] / grouped['count'],
+            'rmse': np.sqrt(grouped['sq_error'] / grouped['count']),
+            'bias': grouped['error'] / grouped['count'],
+            'mape': grouped['ape_sum'] / grouped['ape_count'] * 100,
+        }).reset_index()
+
+
+def write_columnar(frame: pd.DataFrame, path: Path) -> Path:
+    """Write ``frame`` as Parquet, or as a ``.npz`` of column arrays when pyarrow is missing."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if pyarrow is not None:
+        target = path.with_suffix('.parquet')
+        tmp_path = target.with_suffix('.tmp')
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        target = path.with_suffix('.npz')
+        tmp_path = target.with_suffix('.tmp.npz')
+        np.savez_compressed(tmp_path, **{column: frame[column].to_numpy() for column in frame.columns})
+    os.replace(tmp_path, target)
+    return target
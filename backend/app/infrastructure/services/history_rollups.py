@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import parse_time_column
+
+ENERGY_COLUMN = 'Energy delta[Wh]'
+WEEK_DAYS = 7
+SUNDAY = 6
+
+
+def bucket_labels(times: np.ndarray, freq: str) -> np.ndarray:
+    """Bucket label for each ``datetime64[ns]`` timestamp, matching ``DataFrame.resample(freq)``.
+
+    Sub-weekly buckets are labelled by their left edge. Weekly (``W``, i.e.
+    ``W-SUN``) bins run Monday through Sunday and are labelled with that
+    Sunday's date.
+    """
+    index = pd.DatetimeIndex(times)
+    if freq == 'W':
+        days = index.floor('D')
+        labels = days + pd.to_timedelta((SUNDAY - days.dayofweek) % WEEK_DAYS, unit='D')
+    else:
+        labels = index.floor(freq)
+    return labels.to_numpy(dtype='datetime64[ns]')
+
+
+@dataclass
+class BucketStats:
+    """Column-wise statistics for consecutive buckets of the raw 15-minute series.
+
+    Persistence errors compare each reading with the previous one *in the same
+    bucket*, as the per-bucket MAE/RMSE always have; ``rows`` counts readings
+    including missing energy values.
+    """
+
+    labels: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+    count: np.ndarray
+    total: np.ndarray
+    sq_total: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    pairs: np.ndarray
+    abs_error: np.ndarray
+    sq_error: np.ndarray
+    ape_pairs: np.ndarray
+    ape_sum: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def slice(self, start: int, stop: int) -> 'BucketStats':
+        return BucketStats(**{f.name: getattr(self, f.name)[start:stop] for f in fields(self)})
+
+    @classmethod
+    def concat(cls, parts: Iterable['BucketStats']) -> 'BucketStats':
+        parts = list(parts)
+        return cls(**{f.name: np.concatenate([getattr(p, f.name) for p in parts]) for f in fields(cls)})
+
+    @classmethod
+    def aggregate(cls, energy: np.ndarray, labels: np.ndarray, base: int = 0) -> 'BucketStats':
+        """Aggregate sorted rows in one vectorized pass; ``base`` offsets the row positions."""
+        n = len(energy)
+        if n == 0:
+            empty_int = np.empty(0, dtype=np.int64)
+            empty = np.empty(0, dtype=float)
+            return cls(labels[:0], empty_int, empty_int, empty_int, empty, empty, empty, empty,
+                       empty_int, empty, empty, empty_int, empty)
+
+        starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+        bucket = np.cumsum(np.r_[False, labels[1:] != labels[:-1]])
+        buckets = len(starts)
+
+        valid = ~np.isnan(energy)
+        filled = np.where(valid, energy, 0.0)
+        count = np.add.reduceat(valid.astype(np.int64), starts)
+        total = np.add.reduceat(filled, starts)
+        sq_total = np.add.reduceat(filled ** 2, starts)
+        minimum = np.fmin.reduceat(energy, starts)
+        maximum = np.fmax.reduceat(energy, starts)
+
+        errors = energy[1:] - energy[:-1]
+        same = (bucket[1:] == bucket[:-1]) & ~np.isnan(errors)
+        owner = bucket[1:][same]
+        err = errors[same]
+        actual = energy[1:][same]
+        pairs = np.bincount(owner, minlength=buckets)
+        abs_error = np.bincount(owner, weights=np.abs(err), minlength=buckets)
+        sq_error = np.bincount(owner, weights=err ** 2, minlength=buckets)
+        nonzero = actual != 0
+        ape_pairs = np.bincount(owner[nonzero], minlength=buckets)
+        ape_sum = np.bincount(owner[nonzero], weights=np.abs(err[nonzero]) / np.abs(actual[nonzero]), minlength=buckets)
+
+        return cls(
+            labels=labels[starts],
+            offsets=starts + base,
+            rows=np.diff(np.r_[starts, n]),
+            count=count,
+            total=total,
+            sq_total=sq_total,
+            minimum=minimum,
+            maximum=maximum,
+            pairs=pairs,
+            abs_error=abs_error,
+            sq_error=sq_error,
+            ape_pairs=ape_pairs,
+            ape_sum=ape_sum,
+        )
+
+
+@dataclass
+class WindowTotals:
+    """Sums over every consecutive pair inside a query window, for the summary metrics."""
+
+    pairs: int = 0
+    abs_error: float = 0.0
+    sq_error: float = 0.0
+    ape_pairs: int = 0
+    ape_sum: float = 0.0
+    actual_count: int = 0
+    actual_total: float = 0.0
+    actual_sq_total: float = 0.0
+
+    def metrics(self) -> Dict[str, float]:
+        nan = float('nan')
+        mae = self.abs_error / self.pairs if self.pairs else nan
+        rmse = float(np.sqrt(self.sq_error / self.pairs)) if self.pairs else nan
+        mape = self.ape_sum / self.ape_pairs * 100 if self.ape_pairs else nan
+        ss_tot = self.actual_sq_total - self.actual_total ** 2 / self.actual_count if self.actual_count else 0.0
+        ss_tot = max(ss_tot, 0.0)
+        r2_score = 1.0 if ss_tot == 0 else 1 - (self.sq_error / ss_tot)
+        return {'mae': mae, 'rmse': rmse, 'mape': mape, 'r2_score': float(r2_score)}
+
+
+class HistoryRollups:
+    """Pre-aggregated bucket tables over the raw energy series, one per aggregation.
+
+    The raw timestamps and energy values are kept as sorted arrays so that a
+    query window can be located with a binary search; only the (at most two)
+    buckets cut by the window edges are aggregated from raw rows, everything
+    in between is read from the tables.
+    """
+
+    def __init__(self, freqs: Dict[str, str]) -> None:
+        self.freqs = dict(freqs)
+        self.times = np.empty(0, dtype='datetime64[ns]')
+        self.energy = np.empty(0, dtype=float)
+        self.tables: Dict[str, BucketStats] = {}
+        self.version = 0
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, freqs: Dict[str, str]) -> 'HistoryRollups':
+        rollups = cls(freqs)
+        times, energy = _raw_arrays(frame)
+        order = np.argsort(times, kind='stable')
+        rollups.times, rollups.energy = times[order], energy[order]
+        for name, freq in rollups.freqs.items():
+            rollups.tables[name] = BucketStats.aggregate(rollups.energy, bucket_labels(rollups.times, freq))
+        return rollups
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.times[-1]) if len(self.times) else None
+
+    def accepts(self, start: Optional[pd.Timestamp]) -> bool:
+        """Whether rows starting at ``start`` can be appended without a rebuild."""
+        last = self.last_timestamp
+        return last is None or (start is not None and pd.Timestamp(start) > last)
+
+    def append(self, frame: pd.DataFrame) -> Dict[str, int]:
+        """Extend every table with rows newer than the current history.
+
+        The last bucket of each table is re-aggregated together with the new
+        rows, so the cost is proportional to the appended rows plus one bucket.
+        Returns, per aggregation, how many leading buckets were left untouched.
+        """
+        times, energy = _raw_arrays(frame)
+        if not len(times):
+            return {name: len(table) for name, table in self.tables.items()}
+        unchanged: Dict[str, int] = {}
+        order = np.argsort(times, kind='stable')
+        base = len(self.times)
+        self.times = np.concatenate([self.times, times[order]])
+        self.energy = np.concatenate([self.energy, energy[order]])
+        for name, freq in self.freqs.items():
+            table = self.tables[name]
+            keep = len(table) - 1 if len(table) else 0
+            start = int(table.offsets[keep]) if len(table) else base
+            fresh = BucketStats.aggregate(
+                self.energy[start:], bucket_labels(self.times[start:], freq), base=start
+            )
+            self.tables[name] = BucketStats.concat([table.slice(0, keep), fresh])
+            unchanged[name] = keep
+        self.version += 1
+        return unchanged
+
+    def window(self, start: np.datetime64, end: np.datetime64) -> Tuple[int, int]:
+        """Row range ``[lo, hi)`` of readings with ``start <= time <= end``."""
+        return (
+            int(np.searchsorted(self.times, start, side='left')),
+            int(np.searchsorted(self.times, end, side='right')),
+        )
+
+    def query(self, aggregation: str, lo: int, hi: int) -> Tuple['WindowBuckets', WindowTotals]:
+        """Bucket statistics and summary totals for raw rows ``[lo, hi)``."""
+        freq = self.freqs[aggregation]
+        table = self.tables[aggregation]
+        ends = np.r_[table.offsets[1:], len(self.times)]
+        first = int(np.searchsorted(table.offsets, lo, side='right')) - 1
+        last = int(np.searchsorted(table.offsets, hi - 1, side='right')) - 1
+
+        def partial(row_lo: int, row_hi: int) -> BucketStats:
+            return BucketStats.aggregate(
+                self.energy[row_lo:row_hi], bucket_labels(self.times[row_lo:row_hi], freq), base=row_lo
+            )
+
+        head_complete = table.offsets[first] == lo
+        tail_complete = ends[last] == hi
+        if first == last:
+            if head_complete and tail_complete:
+                window = WindowBuckets(table, first, first + 1)
+            else:
+                window = WindowBuckets(table, first, first, head=partial(lo, hi))
+        else:
+            window = WindowBuckets(
+                table,
+                first if head_complete else first + 1,
+                last + 1 if tail_complete else last,
+                head=None if head_complete else partial(lo, int(ends[first])),
+                tail=None if tail_complete else partial(int(table.offsets[last]), hi),
+            )
+        buckets = window.stats()
+
+        totals = WindowTotals(
+            pairs=int(buckets.pairs.sum()),
+            abs_error=float(buckets.abs_error.sum()),
+            sq_error=float(buckets.sq_error.sum()),
+            ape_pairs=int(buckets.ape_pairs.sum()),
+            ape_sum=float(buckets.ape_sum.sum()),
+        )
+
+        # Pairs straddling two buckets are part of the window-wide metrics too.
+        boundary = buckets.offsets[1:]
+        errors = self.energy[boundary] - self.energy[boundary - 1]
+        defined = ~np.isnan(errors)
+        errors, actual = errors[defined], self.energy[boundary][defined]
+        totals.pairs += len(errors)
+        totals.abs_error += float(np.abs(errors).sum())
+        totals.sq_error += float((errors ** 2).sum())
+        nonzero = actual != 0
+        totals.ape_pairs += int(nonzero.sum())
+        totals.ape_sum += float((np.abs(errors[nonzero]) / np.abs(actual[nonzero])).sum())
+
+        # Actuals are every reading after the first one in the window.
+        first_value = self.energy[lo]
+        totals.actual_count = int(buckets.count.sum()) - int(not np.isnan(first_value))
+        totals.actual_total = float(buckets.total.sum()) - (0.0 if np.isnan(first_value) else first_value)
+        totals.actual_sq_total = float(buckets.sq_total.sum()) - (0.0 if np.isnan(first_value) else first_value ** 2)
+        return window, totals
+
+
+@dataclass
+class WindowBuckets:
+    """A query window as ``head`` + ``table[start:stop]`` + ``tail``.
+
+    ``head`` and ``tail`` are re-aggregated buckets cut by the window edges;
+    the interior rows come straight from the materialized table, so callers can
+    reuse anything they derived from those table rows.
+    """
+
+    table: BucketStats
+    start: int
+    stop: int
+    head: Optional[BucketStats] = None
+    tail: Optional[BucketStats] = None
+
+    def stats(self) -> BucketStats:
+        parts = [self.table.slice(self.start, self.stop)]
+        if self.head is not None:
+            parts.insert(0, self.head)
+        if self.tail is not None:
+            parts.append(self.tail)
+        return parts[0] if len(parts) == 1 else BucketStats.concat(parts)
+
+
+def _raw_arrays(frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    times = parse_time_column(frame['Time'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+    energy = pd.to_numeric(frame[ENERGY_COLUMN], errors='coerce').to_numpy(dtype=float)
+    valid = ~np.isnat(times)
+    return times[valid], energy[valid]
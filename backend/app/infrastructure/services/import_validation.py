@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import parse_time_column
+
+REQUIRED_IMPORT_COLUMNS = ('Time', 'Energy delta[Wh]', 'GHI', 'temp')
+NUMERIC_RANGES = {
+    'Energy delta[Wh]': (0, 10000),  # Reasonable range for 15-min energy
+    'GHI': (0, 1500),  # Global Horizontal Irradiance range
+    'temp': (-50, 60),  # Temperature range
+    'humidity': (0, 100),  # Humidity percentage
+    'pressure': (800, 1200),  # Atmospheric pressure range
+}
+HIGH_MISSING_RATIO = 0.1  # Warn when more than 10% of a column is missing
+MAX_REPORTED_ROWS = 1000
+SEVERITIES = ('error', 'warning')
+TIME_RULE = 'time:invalid'
+_RULE_KEYS = {'required_columns', 'ranges', 'max_missing_ratio'}
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    column: str
+    lower: float
+    upper: float
+    severity: str = 'warning'
+
+    @property
+    def name(self) -> str:
+        return f'range:{self.column}'
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """Validation rules resolved into arrays that one vectorized pass can apply."""
+
+    required_columns: tuple[str, ...]
+    ranges: tuple[RangeRule, ...]
+    max_missing_ratio: float
+
+    @cached_property
+    def range_columns(self) -> list[str]:
+        return [rule.column for rule in self.ranges]
+
+    @cached_property
+    def bounds(self) -> tuple[np.ndarray, np.ndarray]:
+        lower = np.array([rule.lower for rule in self.ranges], dtype=float)
+        upper = np.array([rule.upper for rule in self.ranges], dtype=float)
+        return lower, upper
+
+
+def _range_rule(column: str, spec: Any) -> RangeRule:
+    if isinstance(spec, Mapping):
+        # Bounds left out of an override keep the column's default.
+        default_lower, default_upper = NUMERIC_RANGES.get(column, (None, None))
+        lower, upper = spec.get('min', default_lower), spec.get('max', default_upper)
+        severity = spec.get('severity', 'warning')
+    else:
+        lower, upper = spec
+        severity = 'warning'
+    if severity not in SEVERITIES:
+        raise ValueError(f'Unknown severity for {column}: {severity}')
+    lower = -np.inf if lower is None else float(lower)
+    upper = np.inf if upper is None else float(upper)
+    if lower > upper:
+        raise ValueError(f'Range for {column} has min greater than max')
+    return RangeRule(column, lower, upper, severity)
+
+
+@lru_cache(maxsize=64)
+def _compile(key: str) -> CompiledRules:
+    overrides: Dict[str, Any] = json.loads(key) if key else {}
+    unknown = set(overrides) - _RULE_KEYS
+    if unknown:
+        raise ValueError(f'Unknown validation rule keys: {sorted(unknown)}')
+
+    ranges: Dict[str, Any] = dict(NUMERIC_RANGES)
+    for column, spec in (overrides.get('ranges') or {}).items():
+        # ``null`` switches a default range check off.
+        if spec is None:
+            ranges.pop(column, None)
+        else:
+            ranges[column] = spec
+
+    ratio = float(overrides.get('max_missing_ratio', HIGH_MISSING_RATIO))
+    if not 0.0 <= ratio <= 1.0:
+        raise ValueError('max_missing_ratio must be between 0 and 1')
+
+    return CompiledRules(
+        required_columns=tuple(overrides.get('required_columns', REQUIRED_IMPORT_COLUMNS)),
+        ranges=tuple(_range_rule(column, spec) for column, spec in ranges.items()),
+        max_missing_ratio=ratio,
+    )
+
+
+def compile_rules(validation_rules: Optional[Mapping[str, Any]] = None) -> CompiledRules:
+    """Merge user ``validation_rules`` over the defaults; identical rule sets compile once.
+
+    Accepted keys: ``required_columns`` (list), ``ranges`` (column to
+    ``[min, max]`` or ``{"min", "max", "severity"}``, ``null`` to disable) and
+    ``max_missing_ratio``.
+    """
+    key = json.dumps(validation_rules, sort_keys=True) if validation_rules else ''
+    return _compile(key)
+
+
+def numeric_block(data: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    block = data[columns]
+    try:
+        return block.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        return block.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+
+class ValidationReport:
+    """Rule results accumulated over one or more chunks of an import.
+
+    Each chunk is evaluated in a single vectorized pass: one null mask for the
+    whole frame and one broadcast comparison for every range rule. Offending
+    rows are kept as 0-based row indices into the full import.
+    """
+
+    def __init__(self, rules: Optional[CompiledRules] = None) -> None:
+        self.rules = rules or compile_rules()
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+        self.cells = 0
+        self.missing: Dict[str, int] = {}
+        self.scored_rows = 0
+        self.anomalies = 0
+        self._counts: Dict[str, int] = {}
+        self._indices: Dict[str, List[np.ndarray]] = {}
+
+    def _record(self, rule: str, mask: np.ndarray, offset: int) -> None:
+        rows = np.flatnonzero(mask)
+        self._counts[rule] = self._counts.get(rule, 0) + len(rows)
+        if len(rows):
+            self._indices.setdefault(rule, []).append(rows + offset)
+
+    def update(self, data: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(data.columns)
+        offset = self.rows
+        self.rows += len(data)
+        self.cells += data.size
+
+        nulls = data.isna().to_numpy()
+        for col, count in zip(data.columns, nulls.sum(axis=0)):
+            self.missing[col] = self.missing.get(col, 0) + int(count)
+
+        # Values that are present but do not parse; missing times are counted above
+        if 'Time' in data.columns:
+            parsed = parse_time_column(data['Time'], errors='coerce')
+            self._record(TIME_RULE, parsed.isna().to_numpy() & ~nulls[:, data.columns.get_loc('Time')], offset)
+
+        present = [idx for idx, col in enumerate(self.rules.range_columns) if col in data.columns]
+        if present:
+            lower, upper = self.rules.bounds
+            values = numeric_block(data, [self.rules.range_columns[idx] for idx in present])
+            violations = (values < lower[present]) | (values > upper[present])
+            for slot, idx in enumerate(present):
+                self._record(self.rules.ranges[idx].name, violations[:, slot], offset)
+
+    @property
+    def completeness(self) -> float:
+        if not self.cells:
+            return 0.0
+        return (1 - sum(self.missing.values()) / self.cells) * 100
+
+    @property
+    def anomaly_rate(self) -> float:
+        return self.anomalies / self.scored_rows if self.scored_rows else 0.0
+
+    def row_indices(self, rule: str) -> np.ndarray:
+        """All offending row indices for ``rule``, in import order."""
+        parts = self._indices.get(rule)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def violations(self, max_rows: int = MAX_REPORTED_ROWS) -> Dict[str, Dict[str, Any]]:
+        severities = {rule.name: rule.severity for rule in self.rules.ranges}
+        severities[TIME_RULE] = 'error'
+        report = {}
+        for rule, count in self._counts.items():
+            if not count:
+                continue
+            rows = self.row_indices(rule)
+            report[rule] = {
+                "severity": severities.get(rule, 'warning'),
+                "count": count,
+                "rows": rows[:max_rows].tolist(),
+                "truncated": count > max_rows,
+            }
+        return report
+
+    def messages(self) -> tuple[List[str], List[str]]:
+        errors: List[str] = []
+        warnings: List[str] = []
+        columns = self.columns or []
+
+        # Required columns check
+        missing_columns = [col for col in self.rules.required_columns if col not in columns]
+        if missing_columns:
+            errors.append(f"Missing required columns: {missing_columns}")
+
+        # Data type validation
+        if self._counts.get(TIME_RULE):
+            errors.append("Time column contains invalid datetime values")
+
+        # Range validation for numeric columns
+        for rule in self.rules.ranges:
+            count = self._counts.get(rule.name, 0)
+            if count > 0:
+                target = errors if rule.severity == 'error' else warnings
+                target.append(
+                    f"Column {rule.column} has {count} values outside expected range "
+                    f"({rule.lower:g}-{rule.upper:g})"
+                )
+
+        # Missing data check
+        for col, count in self.missing.items():
+            if count > self.rows * self.rules.max_missing_ratio:
+                warnings.append(f"Column {col} has {count} missing values ({count/self.rows*100:.1f}%)")
+
+        return errors, warnings
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COVERAGE = 0.95
+MIN_BUCKET_SIZE = 50
+GHI_BUCKET_EDGES: tuple[float, ...] = (50.0, 200.0, 400.0, 600.0, 800.0)
+BUCKET_MODES: tuple[str, ...] = ('none', 'hour', 'ghi')
+# The outer pair of levels spans the band, so one level has no width to report.
+MIN_QUANTILE_LEVELS = 2
+
+
+def conformal_quantile(scores: np.ndarray, coverage: float) -> float:
+    """Finite-sample split-conformal quantile of non-conformity ``scores``."""
+    scores = np.asarray(scores, dtype=float)
+    scores = scores[~np.isnan(scores)]
+    n = len(scores)
+    if n == 0:
+        return float('nan')
+    level = min(1.0, math.ceil((n + 1) * coverage) / n)
+    return float(np.quantile(scores, level, method='higher'))
+
+
+def _hours_from_features(features: pd.DataFrame) -> np.ndarray:
+    angle = np.arctan2(features['hour_sin'].to_numpy(dtype=float), features['hour_cos'].to_numpy(dtype=float))
+    return np.rint(angle * 24 / (2 * np.pi)).astype(int) % 24
+
+
+def bucket_keys(mode: str, features: pd.DataFrame) -> Optional[np.ndarray]:
+    """Bucket index for every feature row, or ``None`` if the mode cannot be applied."""
+    if mode == 'hour' and {'hour_sin', 'hour_cos'} <= set(features.columns):
+        return _hours_from_features(features)
+    if mode == 'ghi' and 'GHI' in features.columns:
+        return np.searchsorted(GHI_BUCKET_EDGES, features['GHI'].to_numpy(dtype=float), side='right')
+    return None
+
+
+def fit_interval_calibration(
+    residuals: np.ndarray,
+    features: pd.DataFrame,
+    coverage: float = DEFAULT_COVERAGE,
+    bucket: str = 'hour',
+    min_bucket_size: int = MIN_BUCKET_SIZE,
+) -> Dict[str, Any]:
+    """Summarise validation residuals into per-bucket conformal half-widths.
+
+    Buckets with fewer than ``min_bucket_size`` residuals fall back to the
+    global half-width at lookup time.
+    """
+    residuals = np.asarray(residuals, dtype=float)
+    calibration: Dict[str, Any] = {
+        'coverage': coverage,
+        'bucket': 'none',
+        'global': {
+            'halfwidth': conformal_quantile(np.abs(residuals), coverage),
+            'std': float(np.std(residuals)),
+        },
+        'buckets': {},
+    }
+
+    keys = bucket_keys(bucket, features) if bucket != 'none' else None
+    if keys is None:
+        return calibration
+
+    calibration['bucket'] = bucket
+    for key in np.unique(keys):
+        bucket_residuals = residuals[keys == key]
+        if len(bucket_residuals) < min_bucket_size:
+            continue
+        calibration['buckets'][int(key)] = {
+            'halfwidth': conformal_quantile(np.abs(bucket_residuals), coverage),
+            'std': float(np.std(bucket_residuals)),
+        }
+    return calibration
+
+
+def interval_widths(calibration: Mapping[str, Any], features: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Look up the half-width and residual std for each feature row."""
+    fallback = calibration['global']
+    halfwidths = np.full(len(features), fallback['halfwidth'], dtype=float)
+    stds = np.full(len(features), fallback['std'], dtype=float)
+
+    buckets = calibration.get('buckets') or {}
+    keys = bucket_keys(calibration.get('bucket', 'none'), features) if buckets else None
+    if keys is None:
+        return halfwidths, stds
+    for key, stats in buckets.items():
+        mask = keys == int(key)
+        halfwidths[mask] = stats['halfwidth']
+        stds[mask] = stats['std']
+    return halfwidths, stds
+
+
+def check_quantile_levels(levels: Iterable[float]) -> list[float]:
+    """Sorted distinct levels, requiring ``MIN_QUANTILE_LEVELS`` of them inside (0, 1)."""
+    levels = sorted(set(float(level) for level in levels))
+    if len(levels) < MIN_QUANTILE_LEVELS or not all(0.0 < level < 1.0 for level in levels):
+        raise ValueError(f'Quantile models need at least {MIN_QUANTILE_LEVELS} distinct levels in (0, 1), got {levels}')
+    return levels
+
+
+def predict_quantiles(models: Mapping[float, Any], features: pd.DataFrame) -> np.ndarray:
+    """Stack quantile predictions column-wise, sorted so bands never cross."""
+    stacked = np.column_stack([model.predict(features) for _, model in sorted(models.items())])
+    return np.sort(stacked, axis=1)
+
+
+def quantile_bands(
+    calibration: Mapping[str, Any],
+    models: Mapping[float, Any],
+    features: pd.DataFrame,
+) -> tuple[list[float], np.ndarray]:
+    """Quantile levels and conformally widened bands of shape ``(rows, levels)``."""
+    bands = predict_quantiles(models, features)
+    settings = calibration.get('quantiles') or {}
+    correction = settings.get('correction', 0.0)
+    if correction and not np.isnan(correction):
+        bands[:, 0] -= correction
+        bands[:, -1] += correction
+    return sorted(models), bands
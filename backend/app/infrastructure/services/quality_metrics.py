@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import parse_time_column
+from .import_validation import CompiledRules, compile_rules, numeric_block
+
+SLOT_NS = pd.Timedelta(minutes=15).value
+
+
+class QualityMetrics:
+    """Whole-history data-quality counters, extended as rows are appended.
+
+    Rows must arrive in chronological order, each batch starting after the
+    last timestamp already seen; callers rebuild from the full history when
+    rows are backfilled. Reading the summary costs the same regardless of how
+    much history has been counted.
+    """
+
+    def __init__(self, rules: Optional[CompiledRules] = None) -> None:
+        self.rules = rules or compile_rules()
+        self.rows = 0
+        self.cells = 0
+        self.nulls: Dict[str, int] = {}
+        self.range_violations: Dict[str, int] = {}
+        self.invalid_times = 0
+        self.duplicate_timestamps = 0
+        self.gap_count = 0
+        self.missing_slots = 0
+        self.longest_gap_slots = 0
+        self.first_timestamp: Optional[pd.Timestamp] = None
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, rules: Optional[CompiledRules] = None) -> 'QualityMetrics':
+        metrics = cls(rules)
+        metrics.update(frame)
+        return metrics
+
+    def accepts(self, start: Optional[pd.Timestamp]) -> bool:
+        """Whether rows starting at ``start`` can be counted without a rebuild."""
+        return self.last_timestamp is None or (start is not None and start > self.last_timestamp)
+
+    def update(self, rows: pd.DataFrame) -> None:
+        if rows.empty:
+            return
+        self.rows += len(rows)
+        self.cells += rows.size
+
+        for col, count in zip(rows.columns, rows.isna().to_numpy().sum(axis=0)):
+            self.nulls[col] = self.nulls.get(col, 0) + int(count)
+
+        columns = [col for col in self.rules.range_columns if col in rows.columns]
+        if columns:
+            positions = [self.rules.range_columns.index(col) for col in columns]
+            lower, upper = self.rules.bounds
+            values = numeric_block(rows, columns)
+            counts = ((values < lower[positions]) | (values > upper[positions])).sum(axis=0)
+            for col, count in zip(columns, counts):
+                self.range_violations[col] = self.range_violations.get(col, 0) + int(count)
+
+        if 'Time' in rows.columns:
+            self._update_gaps(parse_time_column(rows['Time'], errors='coerce'))
+
+    def _update_gaps(self, parsed: pd.Series) -> None:
+        valid = parsed.dropna()
+        self.invalid_times += int(len(parsed) - len(valid))
+        if valid.empty:
+            return
+        stamps = valid.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        if self.last_timestamp is not None:
+            stamps = np.concatenate([[pd.Timestamp(self.last_timestamp).value], stamps])
+        steps = np.diff(stamps)
+
+        self.duplicate_timestamps += int(np.count_nonzero(steps == 0))
+        gaps = steps[steps > SLOT_NS] // SLOT_NS - 1
+        if len(gaps):
+            self.gap_count += len(gaps)
+            self.missing_slots += int(gaps.sum())
+            self.longest_gap_slots = max(self.longest_gap_slots, int(gaps.max()))
+
+        if self.first_timestamp is None:
+            self.first_timestamp = pd.Timestamp(stamps[0])
+        self.last_timestamp = pd.Timestamp(stamps[-1])
+
+    def merge(self, later: 'QualityMetrics') -> None:
+        """Fold in counters computed independently over the rows that follow these."""
+        self.rows += later.rows
+        self.cells += later.cells
+        for col, count in later.nulls.items():
+            self.nulls[col] = self.nulls.get(col, 0) + count
+        for col, count in later.range_violations.items():
+            self.range_violations[col] = self.range_violations.get(col, 0) + count
+        self.invalid_times += later.invalid_times
+        self.duplicate_timestamps += later.duplicate_timestamps
+        self.gap_count += later.gap_count
+        self.missing_slots += later.missing_slots
+        self.longest_gap_slots = max(self.longest_gap_slots, later.longest_gap_slots)
+
+        if later.first_timestamp is None:
+            return
+        if self.last_timestamp is not None:
+            # The step across the boundary was not visible to either side.
+            step = (later.first_timestamp - self.last_timestamp).value
+            if step == 0:
+                self.duplicate_timestamps += 1
+            elif step > SLOT_NS:
+                gap = step // SLOT_NS - 1
+                self.gap_count += 1
+                self.missing_slots += gap
+                self.longest_gap_slots = max(self.longest_gap_slots, gap)
+        if self.first_timestamp is None:
+            self.first_timestamp = later.first_timestamp
+        self.last_timestamp = later.last_timestamp
+
+    @property
+    def completeness(self) -> float:
+        if not self.cells:
+            return 0.0
+        return (1 - sum(self.nulls.values()) / self.cells) * 100
+
+    def summary(self) -> Dict[str, Any]:
+        slots = self.rows - self.invalid_times - self.duplicate_timestamps
+        expected = slots + self.missing_slots
+        return {
+            "total_records": self.rows,
+            "missing_values": dict(self.nulls),
+            "data_completeness": round(self.completeness, 2),
+            "range_violations": {col: count for col, count in self.range_violations.items() if count},
+            "duplicate_timestamps": self.duplicate_timestamps,
+            "gap_count": self.gap_count,
+            "missing_slots": self.missing_slots,
+            "longest_gap_slots": self.longest_gap_slots,
+            "slot_coverage": round(slots / expected * 100, 2) if expected else 0.0,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+        }
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .anomaly_detection import score_anomalies
+from .import_validation import CompiledRules, compile_rules
+from .quality_metrics import QualityMetrics
+
+SCAN_CHUNK_ROWS = 250_000
+MAX_SCAN_WORKERS = 8
+FROZEN_MIN_SLOTS = 16  # Four hours of identical readings
+FROZEN_COLUMNS: Tuple[str, ...] = (
+    'Energy delta[Wh]', 'GHI', 'temp', 'pressure', 'humidity', 'wind_speed', 'clouds_all',
+)
+# Zero is a legitimate steady state for these at night, so zero runs are not flagged.
+ZERO_STEADY_COLUMNS = frozenset({'Energy delta[Wh]', 'GHI'})
+
+Run = Tuple[float, int]
+
+
+@dataclass
+class FrozenRuns:
+    """Runs of identical consecutive readings per column, long enough to suggest a stuck sensor."""
+
+    min_slots: int = FROZEN_MIN_SLOTS
+    runs: Dict[str, int] = field(default_factory=dict)
+    slots: Dict[str, int] = field(default_factory=dict)
+    longest: Dict[str, int] = field(default_factory=dict)
+
+    def close(self, column: str, run: Optional[Run]) -> None:
+        if run is None:
+            return
+        value, length = run
+        if length < self.min_slots or np.isnan(value):
+            return
+        if value == 0 and column in ZERO_STEADY_COLUMNS:
+            return
+        self.runs[column] = self.runs.get(column, 0) + 1
+        self.slots[column] = self.slots.get(column, 0) + length
+        self.longest[column] = max(self.longest.get(column, 0), length)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {
+            column: {"runs": count, "slots": self.slots[column], "longest_slots": self.longest[column]}
+            for column, count in self.runs.items()
+        }
+
+
+@dataclass
+class ChunkScan:
+    """Everything one worker learns about a contiguous slice of history."""
+
+    metrics: QualityMetrics
+    frozen: FrozenRuns
+    # Per column: the run touching the chunk start, the run touching its end,
+    # and whether a single run covers the whole chunk.
+    edges: Dict[str, Tuple[Run, Run, bool]]
+    scored_rows: int = 0
+    anomalies: int = 0
+
+
+def _column_runs(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    change = np.empty(len(values), dtype=bool)
+    change[0] = True
+    # NaN != NaN, so missing readings always break a run.
+    change[1:] = values[1:] != values[:-1]
+    starts = np.flatnonzero(change)
+    lengths = np.diff(np.append(starts, len(values)))
+    return values[starts], lengths
+
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(detector: Optional[Dict[str, Any]], rules: CompiledRules, min_slots: int) -> None:
+    _WORKER_STATE.update(detector=detector, rules=rules, min_slots=min_slots)
+
+
+def _scan_pooled_chunk(chunk: pd.DataFrame) -> ChunkScan:
+    return _scan_chunk(chunk, _WORKER_STATE['detector'], _WORKER_STATE['rules'], _WORKER_STATE['min_slots'])
+
+
+def _scan_chunk(
+    chunk: pd.DataFrame,
+    detector: Optional[Dict[str, Any]],
+    rules: CompiledRules,
+    min_slots: int,
+) -> ChunkScan:
+    frozen = FrozenRuns(min_slots=min_slots)
+    edges: Dict[str, Tuple[Run, Run, bool]] = {}
+    for column in FROZEN_COLUMNS:
+        if column not in chunk.columns or chunk.empty:
+            continue
+        values, lengths = _column_runs(pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float))
+        first = (float(values[0]), int(lengths[0]))
+        last = (float(values[-1]), int(lengths[-1]))
+        inner_values, inner_lengths = values[1:-1], lengths[1:-1]
+        long_runs = inner_lengths >= frozen.min_slots
+        for value, length in zip(inner_values[long_runs], inner_lengths[long_runs]):
+            frozen.close(column, (float(value), int(length)))
+        edges[column] = (first, last, len(values) == 1)
+
+    scan = ChunkScan(metrics=QualityMetrics.from_frame(chunk, rules), frozen=frozen, edges=edges)
+    if detector is not None:
+        scan.scored_rows, scan.anomalies = score_anomalies(detector, chunk)
+    return scan
+
+
+def _merge(scans: List[ChunkScan], min_slots: int) -> ChunkScan:
+    metrics = QualityMetrics(scans[0].metrics.rules)
+    frozen = FrozenRuns(min_slots=min_slots)
+    open_runs: Dict[str, Optional[Run]] = {}
+    scored_rows = anomalies = 0
+
+    for scan in scans:
+        metrics.merge(scan.metrics)
+        scored_rows += scan.scored_rows
+        anomalies += scan.anomalies
+        for column, count in scan.frozen.runs.items():
+            frozen.runs[column] = frozen.runs.get(column, 0) + count
+            frozen.slots[column] = frozen.slots.get(column, 0) + scan.frozen.slots[column]
+            frozen.longest[column] = max(frozen.longest.get(column, 0), scan.frozen.longest[column])
+
+        # Stitch runs that continue across the chunk boundary.
+        for column, (first, last, uniform) in scan.edges.items():
+            current = open_runs.get(column)
+            if current is not None and current[0] == first[0]:
+                first = (first[0], current[1] + first[1])
+            else:
+                frozen.close(column, current)
+            if uniform:
+                open_runs[column] = first
+            else:
+                frozen.close(column, first)
+                open_runs[column] = last
+
+    for column, run in open_runs.items():
+        frozen.close(column, run)
+    return ChunkScan(metrics, frozen, {}, scored_rows, anomalies)
+
+
+def history_fingerprint(frame: pd.DataFrame, *extra: Any) -> str:
+    """Content hash of the history (plus any scan settings), used as the report cache key."""
+    digest = hashlib.sha256()
+    digest.update(','.join(map(str, frame.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    for item in extra:
+        digest.update(repr(item).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def default_workers() -> int:
+    return max(1, min(MAX_SCAN_WORKERS, os.cpu_count() or 1))
+
+
+def scan_history(
+    frame: pd.DataFrame,
+    detector: Optional[Dict[str, Any]] = None,
+    rules: Optional[CompiledRules] = None,
+    workers: Optional[int] = None,
+    chunk_rows: int = SCAN_CHUNK_ROWS,
+    min_frozen_slots: int = FROZEN_MIN_SLOTS,
+) -> Dict[str, Any]:
+    """Scan ``frame`` in contiguous chunks across a process pool and merge the partials.
+
+    ``frame`` must be in chronological order. With one worker or a single
+    chunk the scan runs in-process, avoiding the pool start-up cost. Requests
+    for more workers than ``default_workers()`` are clamped to it.
+    """
+    rules = rules or compile_rules()
+    workers = min(workers or default_workers(), default_workers())
+    chunks = [frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows)]
+    if not chunks:
+        raise ValueError('No historical records available')
+
+    if workers == 1 or len(chunks) == 1:
+        scans = [_scan_chunk(chunk, detector, rules, min_frozen_slots) for chunk in chunks]
+        workers = 1
+    else:
+        workers = min(workers, len(chunks))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(detector, rules, min_frozen_slots),
+        ) as pool:
+            scans = list(pool.map(_scan_pooled_chunk, chunks))
+
+    merged = _merge(scans, min_frozen_slots)
+    return {
+        **merged.metrics.summary(),
+        "invalid_timestamps": merged.metrics.invalid_times,
+        "frozen_runs": merged.frozen.summary(),
+        "frozen_min_slots": min_frozen_slots,
+        "scored_rows": merged.scored_rows,
+        "anomaly_count": merged.anomalies,
+        "anomaly_rate": merged.anomalies / merged.scored_rows if merged.scored_rows else 0.0,
+        "chunks": len(chunks),
+        "workers": workers,
+    }
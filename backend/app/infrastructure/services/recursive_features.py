@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from ...domain.exceptions import HistoryNotAvailableError
+from .feature_engineering import CALENDAR_FEATURES, WEATHER_COLUMNS, calendar_features, feature_frame
+
+_ENERGY_LAG = re.compile(r'^lag_(\d+)$')
+_ROLL_STAT = re.compile(r'^roll_(mean|std)_(\d+)$')
+_EXOGENOUS_LAG = re.compile(r'^(.+)_lag_(\d+)$')
+
+
+@dataclass
+class FeatureLayout:
+    """Maps each model feature name onto the buffer it is read from."""
+
+    features: list[str]
+    energy_lags: list[tuple[int, int]] = field(default_factory=list)
+    roll_means: list[tuple[int, int]] = field(default_factory=list)
+    roll_stds: list[tuple[int, int]] = field(default_factory=list)
+    exogenous_columns: list[str] = field(default_factory=list)
+    exogenous: list[tuple[int, int, int]] = field(default_factory=list)
+    calendar: list[tuple[int, str]] = field(default_factory=list)
+
+    @classmethod
+    def from_features(cls, features: list[str], columns: list[str]) -> 'FeatureLayout':
+        """Parse the feature names produced by ``make_features``.
+
+        ``columns`` are the raw columns available in the prepared history; any
+        feature that matches one of them verbatim is treated as exogenous input.
+        """
+        layout = cls(features=list(features))
+        available = set(columns)
+        exogenous_index: dict[str, int] = {}
+
+        def exogenous_slot(column: str) -> int:
+            if column not in exogenous_index:
+                exogenous_index[column] = len(layout.exogenous_columns)
+                layout.exogenous_columns.append(column)
+            return exogenous_index[column]
+
+        for position, name in enumerate(features):
+            if match := _ENERGY_LAG.match(name):
+                layout.energy_lags.append((position, int(match.group(1))))
+            elif match := _ROLL_STAT.match(name):
+                target = layout.roll_means if match.group(1) == 'mean' else layout.roll_stds
+                target.append((position, int(match.group(2))))
+            elif name in CALENDAR_FEATURES:
+                layout.calendar.append((position, name))
+            elif name in available:
+                layout.exogenous.append((position, exogenous_slot(name), 0))
+            elif (match := _EXOGENOUS_LAG.match(name)) and match.group(1) in WEATHER_COLUMNS:
+                layout.exogenous.append((position, exogenous_slot(match.group(1)), int(match.group(2))))
+            else:
+                raise ValueError(f'Unsupported feature for recursive forecasting: {name}')
+        return layout
+
+    @property
+    def windows(self) -> list[int]:
+        return sorted({window for _, window in self.roll_means + self.roll_stds})
+
+    @property
+    def energy_depth(self) -> int:
+        depths = [lag for _, lag in self.energy_lags] + self.windows
+        return max(depths, default=1)
+
+    @property
+    def exogenous_depth(self) -> int:
+        return max((lag for _, _, lag in self.exogenous), default=0)
+
+
+class RecursiveFeatureState:
+    """Feature row for the latest timestamp, advanced one 15-minute step at a time.
+
+    The state mirrors ``make_features`` for a horizon-1 model: at row ``t`` the
+    energy lags and rolling windows read ``energy[t-1]`` and earlier, exogenous
+    columns read row ``t`` (and its lags), and calendar terms use ``t`` itself.
+    Energy and exogenous values live in ring buffers and the rolling statistics
+    are kept as running sums, so each step touches only the values that enter
+    or leave a window. A leading batch dimension lets several trajectories
+    (scenarios, Monte Carlo draws) advance together.
+    """
+
+    def __init__(self, prepared: pd.DataFrame, layout: FeatureLayout, batch_size: int = 1) -> None:
+        self.layout = layout
+        self.batch_size = batch_size
+        energy_depth = layout.energy_depth
+        exogenous_depth = layout.exogenous_depth + 1
+
+        # One extra row: energy[t] is held back until the state moves past t.
+        required = max(energy_depth + 1, exogenous_depth)
+        if len(prepared) < required:
+            raise HistoryNotAvailableError(
+                f'Recursive forecasting needs at least {required} prepared history rows'
+            )
+
+        energy = prepared['energy_wh'].to_numpy(dtype=float)
+        self._energy = np.tile(energy[-energy_depth - 1:-1], (batch_size, 1))
+        self._energy_head = energy_depth - 1
+        self._current_energy = np.full(batch_size, energy[-1], dtype=float)
+
+        columns = layout.exogenous_columns
+        exogenous = prepared[columns].to_numpy(dtype=float) if columns else np.empty((len(prepared), 0))
+        self._exogenous = np.tile(exogenous[-exogenous_depth:], (batch_size, 1, 1))
+        self._exogenous_head = exogenous_depth - 1
+
+        self._sums = {window: self._energy[:, -window:].sum(axis=1) for window in layout.windows}
+        self._squares = {window: (self._energy[:, -window:] ** 2).sum(axis=1) for window in layout.windows}
+
+        self.timestamp: pd.Timestamp = prepared.index[-1]
+        self.row = np.empty((batch_size, len(layout.features)), dtype=float)
+        self._refresh_row()
+
+    def _energy_lag(self, lag: int) -> np.ndarray:
+        return self._energy[:, (self._energy_head - lag + 1) % self._energy.shape[1]]
+
+    def _exogenous_lag(self, slot: int, lag: int) -> np.ndarray:
+        return self._exogenous[:, (self._exogenous_head - lag) % self._exogenous.shape[1], slot]
+
+    def _refresh_row(self) -> None:
+        row = self.row
+        for position, lag in self.layout.energy_lags:
+            row[:, position] = self._energy_lag(lag)
+        for position, window in self.layout.roll_means:
+            row[:, position] = self._sums[window] / window
+        for position, window in self.layout.roll_stds:
+            mean = self._sums[window] / window
+            variance = (self._squares[window] - window * mean ** 2) / (window - 1)
+            row[:, position] = np.sqrt(np.clip(variance, 0.0, None))
+        for position, slot, lag in self.layout.exogenous:
+            row[:, position] = self._exogenous_lag(slot, lag)
+        if self.layout.calendar:
+            calendar = calendar_features(pd.DatetimeIndex([self.timestamp]))
+            for position, name in self.layout.calendar:
+                row[:, position] = calendar[name][0]
+
+    def advance(self, predicted: np.ndarray, exogenous: Optional[np.ndarray] = None) -> None:
+        """Move to ``t+1`` given the predicted ``energy[t+1]`` and row ``t+1`` exogenous values."""
+        incoming = self._current_energy
+        for window in self._sums:
+            outgoing = self._energy_lag(window)
+            self._sums[window] += incoming - outgoing
+            self._squares[window] += incoming ** 2 - outgoing ** 2
+
+        self._energy_head = (self._energy_head + 1) % self._energy.shape[1]
+        self._energy[:, self._energy_head] = incoming
+        self._current_energy = np.broadcast_to(np.asarray(predicted, dtype=float), (self.batch_size,)).copy()
+
+        self._exogenous_head = (self._exogenous_head + 1) % self._exogenous.shape[1]
+        if exogenous is None:
+            exogenous = self._exogenous_lag_row(1)
+        self._exogenous[:, self._exogenous_head, :] = exogenous
+
+        self.timestamp = self.timestamp + pd.Timedelta(minutes=15)
+        self._refresh_row()
+
+    def _exogenous_lag_row(self, lag: int) -> np.ndarray:
+        return self._exogenous[:, (self._exogenous_head - lag) % self._exogenous.shape[1], :].copy()
+
+
+def future_feature_block(prepared: pd.DataFrame, layout: FeatureLayout, exogenous: np.ndarray) -> np.ndarray:
+    """Feature rows for ``steps`` future slots of ``S`` weather trajectories at once.
+
+    ``exogenous`` has shape ``(S, steps, C)`` with columns ordered as
+    ``layout.exogenous_columns``. Energy after the last observation is unknown,
+    so the energy lags and rolling windows hold the last observed value
+    (persistence); these columns are computed once and shared by every
+    trajectory. Rows come back trajectory-major: ``S * steps`` by feature.
+    """
+    exogenous = np.asarray(exogenous, dtype=float)
+    trajectories, steps, _ = exogenous.shape
+    energy_depth = layout.energy_depth
+    exogenous_depth = layout.exogenous_depth
+
+    required = max(energy_depth, exogenous_depth) + 1
+    if len(prepared) < required:
+        raise HistoryNotAvailableError(f'Scenario forecasting needs at least {required} prepared history rows')
+
+    history_energy = prepared['energy_wh'].to_numpy(dtype=float)
+    energy = np.concatenate([history_energy[-energy_depth - 1:], np.full(steps, history_energy[-1])])
+    # Row k (1-based) sits at index energy_depth + k of ``energy``.
+    rows = energy_depth + np.arange(1, steps + 1)
+
+    block = np.empty((trajectories, steps, len(layout.features)), dtype=float)
+    for position, lag in layout.energy_lags:
+        block[:, :, position] = energy[rows - lag]
+    for window in layout.windows:
+        windows = np.lib.stride_tricks.sliding_window_view(energy, window)[rows - window]
+        for position, target in layout.roll_means:
+            if target == window:
+                block[:, :, position] = windows.mean(axis=1)
+        for position, target in layout.roll_stds:
+            if target == window:
+                block[:, :, position] = windows.std(axis=1, ddof=1)
+
+    if layout.exogenous:
+        history_exogenous = prepared[layout.exogenous_columns].to_numpy(dtype=float)[-exogenous_depth - 1:]
+        path = np.concatenate(
+            [np.broadcast_to(history_exogenous, (trajectories,) + history_exogenous.shape), exogenous],
+            axis=1,
+        )
+        for position, slot, lag in layout.exogenous:
+            block[:, :, position] = path[:, exogenous_depth + np.arange(1, steps + 1) - lag, slot]
+
+    if layout.calendar:
+        timestamps = pd.date_range(prepared.index[-1] + pd.Timedelta(minutes=15), periods=steps, freq='15min')
+        calendar = calendar_features(timestamps)
+        for position, name in layout.calendar:
+            block[:, :, position] = calendar[name]
+
+    return block.reshape(trajectories * steps, len(layout.features))
+
+
+def roll_forward(
+    model: Any,
+    feature_state: RecursiveFeatureState,
+    exogenous: np.ndarray,
+    steps: int,
+) -> np.ndarray:
+    """Run ``steps`` recursive predictions, one batched predict per step.
+
+    ``exogenous`` holds the inputs for slots ``t+1 .. t+steps`` with shape
+    ``(steps, C)`` shared by the whole batch, or ``(batch, steps, C)``.
+    Slots with ``isSun`` at 0 produce no energy in the history, so they are
+    predicted as 0; otherwise an error at dusk would be fed back through the
+    energy lags all night. Returns predictions of shape ``(batch, steps)``.
+    """
+    per_trajectory = exogenous.ndim == 3
+    columns = feature_state.layout.exogenous_columns
+    sun = columns.index('isSun') if 'isSun' in columns else None
+    preds = np.empty((feature_state.batch_size, steps), dtype=float)
+    for step in range(steps):
+        preds[:, step] = model.predict(feature_frame(feature_state.row, feature_state.layout.features))
+        if sun is not None:
+            is_sun = exogenous[:, step, sun] if per_trajectory else exogenous[step, sun]
+            preds[:, step] = np.where(is_sun > 0, preds[:, step], 0.0)
+        if step + 1 < steps:
+            feature_state.advance(preds[:, step], exogenous[:, step] if per_trajectory else exogenous[step])
+    return preds
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from .dataset_cache import DATASET_PARAMS
+from .feature_engineering import add_targets, horizon_frame, make_feature_base
+from .prediction_intervals import DEFAULT_COVERAGE, fit_interval_calibration
+
+# Continued boosting adds small corrections on top of the served model, so it
+# uses a lower learning rate than a full training run and a fixed round count.
+WARM_START_PARAMS = {
+    'objective': 'regression',
+    'learning_rate': 0.02,
+    'num_leaves': 31,
+    'min_data_in_leaf': 40,
+    'bagging_fraction': 0.9,
+    'bagging_freq': 1,
+    'feature_fraction': 0.8,
+    'lambda_l2': 1.0,
+    'verbosity': -1,
+}
+WARM_START_ROUNDS = 50
+MIN_NEW_ROWS = 192  # Two days of 15-minute readings
+HOLDOUT_FRACTION = 0.25
+MIN_HOLDOUT_ROWS = 96
+# Residuals on rows that also chose the candidate would be optimistically small,
+# so the intervals are refitted on a separate, newest slice; below two weeks
+# (under ~50 residuals per hour bucket) the served calibration is kept instead.
+CALIBRATION_FRACTION = 0.25
+MIN_CALIBRATION_ROWS = 14 * 96
+WORKER_NICENESS = 10
+
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def trained_through(trained_on: Dict[str, Any]) -> Optional[pd.Timestamp]:
+    """Newest feature row a model's training or calibration used, if its artifact records one."""
+    if trained_on.get('trained_through'):
+        return pd.Timestamp(trained_on['trained_through'])
+    if trained_on.get('val_end'):
+        # Artifacts from full training runs before the watermark was recorded;
+        # the validation split calibrated their intervals, so it is not new.
+        return pd.Timestamp(trained_on['val_end']) + pd.Timedelta(hours=23, minutes=45)
+    return None
+
+
+def init_worker(raw: pd.DataFrame, threads: int) -> None:
+    """Build the shared feature rows once per retraining process, below the API's priority."""
+    if hasattr(os, 'nice'):
+        os.nice(WORKER_NICENESS)
+    features, energy = make_feature_base(raw)
+    _WORKER_STATE.update(features=features, energy=energy, threads=threads)
+
+
+def warm_start_pooled(
+    horizon: int,
+    model: Any,
+    feature_cols: List[str],
+    watermark: pd.Timestamp,
+    calibration: Dict[str, Any],
+) -> Dict[str, Any]:
+    frame = horizon_frame(add_targets(_WORKER_STATE['features'], _WORKER_STATE['energy'], [horizon]), horizon)
+    return warm_start(frame, model, feature_cols, watermark, calibration, threads=_WORKER_STATE['threads'])
+
+
+def warm_start(
+    frame: pd.DataFrame,
+    model: Any,
+    feature_cols: List[str],
+    watermark: pd.Timestamp,
+    calibration: Dict[str, Any],
+    rounds: int = WARM_START_ROUNDS,
+    threads: int = 1,
+) -> Dict[str, Any]:
+    """Continue boosting ``model`` on the rows of ``frame`` newer than ``watermark``.
+
+    The newest ``CALIBRATION_FRACTION`` of those rows is set aside for
+    interval calibration when it spans at least ``MIN_CALIBRATION_ROWS``, and
+    the ``HOLDOUT_FRACTION`` before it is held out: the candidate is accepted
+    only if its MAE there does not exceed the current model's. An accepted
+    candidate's conformal half-widths are refitted on its calibration-slice
+    residuals, with the coverage and bucketing of the current ``calibration``
+    and its quantile-model correction, as those models do not change; without
+    a calibration slice the current ``calibration`` is kept. Only the
+    returned candidate is new; ``model`` is not modified.
+    """
+    fresh = frame.loc[frame.index > watermark]
+    result: Dict[str, Any] = {
+        'new_rows': int(len(fresh)),
+        'trained_through': str(watermark),
+        'model': None,
+    }
+    if len(fresh) < MIN_NEW_ROWS:
+        return {**result, 'status': 'skipped', 'reason': f'{len(fresh)} new rows, need {MIN_NEW_ROWS}'}
+
+    calibration_rows = int(len(fresh) * CALIBRATION_FRACTION)
+    if calibration_rows < MIN_CALIBRATION_ROWS:
+        calibration_rows = 0
+    holdout_rows = max(MIN_HOLDOUT_ROWS, int(len(fresh) * HOLDOUT_FRACTION))
+    train = fresh.iloc[:len(fresh) - calibration_rows - holdout_rows]
+    holdout = fresh.iloc[len(train):len(fresh) - calibration_rows]
+    calibration_slice = fresh.iloc[len(fresh) - calibration_rows:]
+    booster = getattr(model, 'booster_', model)  # Artifacts may hold an sklearn wrapper.
+
+    params = {**WARM_START_PARAMS, **DATASET_PARAMS, 'num_threads': threads}
+    candidate = lgb.train(
+        params,
+        lgb.Dataset(train[feature_cols], train['target'], params=DATASET_PARAMS),
+        num_boost_round=rounds,
+        init_model=booster,
+        keep_training_booster=False,
+    )
+
+    actual = holdout['target'].to_numpy()
+    current_mae = float(np.mean(np.abs(booster.predict(holdout[feature_cols], num_threads=threads) - actual)))
+    candidate_mae = float(np.mean(np.abs(candidate.predict(holdout[feature_cols], num_threads=threads) - actual)))
+    accepted = candidate_mae <= current_mae
+    if not accepted:
+        trained_through = watermark
+    elif calibration_rows:
+        residuals = calibration_slice['target'].to_numpy() - candidate.predict(
+            calibration_slice[feature_cols], num_threads=threads
+        )
+        refitted = fit_interval_calibration(
+            residuals,
+            calibration_slice[feature_cols],
+            calibration.get('coverage', DEFAULT_COVERAGE),
+            calibration.get('bucket', 'hour'),
+        )
+        if 'quantiles' in calibration:
+            refitted['quantiles'] = calibration['quantiles']
+        result['calibration'] = refitted
+        # The calibration slice must stay unseen by the published model.
+        trained_through = fresh.index.max()
+    else:
+        result['calibration'] = calibration
+        trained_through = train.index.max()
+    return {
+        **result,
+        'status': 'accepted' if accepted else 'rejected',
+        'model': candidate if accepted else None,
+        'trained_through': str(trained_through),
+        'train_rows': int(len(train)),
+        'holdout_rows': int(len(holdout)),
+        'holdout_start': str(holdout.index.min()),
+        'calibration_rows': calibration_rows,
+        'current_mae': current_mae,
+        'candidate_mae': candidate_mae,
+        'n_trees': candidate.num_trees(),
+    }
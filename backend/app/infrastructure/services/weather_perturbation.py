@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+DEFAULT_STEP_CORRELATION = 0.9
+
+
+@dataclass(frozen=True)
+class NoiseModel:
+    """Forecast error model for one weather driver.
+
+    ``additive`` noise is added in the driver's units; ``multiplicative`` noise
+    scales the value by ``1 + noise``. Samples are clipped to ``[lower, upper]``.
+    """
+
+    std: float
+    kind: str = 'additive'
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any], default: Optional['NoiseModel'] = None) -> 'NoiseModel':
+        base = default or cls(std=0.0)
+        kind = payload.get('kind', base.kind)
+        if kind not in {'additive', 'multiplicative'}:
+            raise ValueError(f'Unknown noise kind: {kind}')
+        std = float(payload.get('std', base.std))
+        if std < 0:
+            raise ValueError('Noise std must be non-negative')
+        return cls(
+            std=std,
+            kind=kind,
+            lower=payload.get('lower', base.lower),
+            upper=payload.get('upper', base.upper),
+        )
+
+
+DEFAULT_NOISE_MODELS: Dict[str, NoiseModel] = {
+    'GHI': NoiseModel(std=0.25, kind='multiplicative', lower=0.0, upper=1500.0),
+    'temp': NoiseModel(std=1.5),
+    'clouds_all': NoiseModel(std=15.0, lower=0.0, upper=100.0),
+    'humidity': NoiseModel(std=8.0, lower=0.0, upper=100.0),
+    'wind_speed': NoiseModel(std=1.0, lower=0.0),
+}
+
+
+def correlated_noise(
+    samples: int,
+    steps: int,
+    drivers: int,
+    correlation: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Unit-variance AR(1) noise of shape ``(samples, steps, drivers)``."""
+    if not 0.0 <= correlation < 1.0:
+        raise ValueError('correlation must be in [0, 1)')
+    innovations = rng.standard_normal((samples, steps, drivers))
+    scale = np.sqrt(1.0 - correlation ** 2)
+    noise = np.empty_like(innovations)
+    noise[:, 0] = innovations[:, 0]
+    for step in range(1, steps):
+        noise[:, step] = correlation * noise[:, step - 1] + scale * innovations[:, step]
+    return noise
+
+
+def perturb_weather(
+    base: np.ndarray,
+    columns: list[str],
+    noise_models: Mapping[str, NoiseModel],
+    samples: int,
+    correlation: float = DEFAULT_STEP_CORRELATION,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Draw ``samples`` perturbed copies of a ``(steps, C)`` weather path.
+
+    Columns without a noise model are copied unchanged. Returns one tensor of
+    shape ``(samples, steps, C)``.
+    """
+    steps, _ = base.shape
+    sampled = np.broadcast_to(base, (samples,) + base.shape).copy()
+    perturbed = [(idx, noise_models[name]) for idx, name in enumerate(columns) if name in noise_models]
+    if not perturbed:
+        return sampled
+
+    rng = np.random.default_rng(seed)
+    noise = correlated_noise(samples, steps, len(perturbed), correlation, rng)
+    for slot, (idx, model) in enumerate(perturbed):
+        scaled = noise[:, :, slot] * model.std
+        if model.kind == 'multiplicative':
+            sampled[:, :, idx] *= 1.0 + scaled
+        else:
+            sampled[:, :, idx] += scaled
+        if model.lower is not None or model.upper is not None:
+            np.clip(sampled[:, :, idx], model.lower, model.upper, out=sampled[:, :, idx])
+    return sampled
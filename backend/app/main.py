@@ -20,11 +20,9 @@ app.include_router(router)
 
 @app.on_event('startup')
 def startup_event() -> None:
-    container = get_container()
-    if container.model_gateway.is_ready():
-        # Prime the cache to avoid load latency on first request.
-        try:
-            container.model_gateway.get_state()
-        except Exception:
-            # Allow the application to start; endpoints will surface precise errors.
-            pass
+    get_container().startup()
+
+
+@app.on_event('shutdown')
+def shutdown_event() -> None:
+    get_container().shutdown()
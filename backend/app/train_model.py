@@ -2,34 +2,104 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 import joblib
 import numpy as np
+import lightgbm as lgb
 import pandas as pd
-from lightgbm import LGBMRegressor
+from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 
-from .infrastructure.services.feature_engineering import make_features
+from .infrastructure.repositories.artifact_anomaly_detector_repository import ArtifactAnomalyDetectorRepository
+from .infrastructure.repositories.csv_history_repository import CSVHistoryRepository
+from .infrastructure.services.anomaly_detection import DEFAULT_FIT_ROWS, fit_anomaly_detector
+from .infrastructure.services.dataset_cache import DATASET_PARAMS, DatasetCache, build_datasets
+from .infrastructure.services.feature_engineering import (
+    add_targets,
+    feature_config,
+    horizon_frame,
+    make_feature_base,
+    make_feature_matrix,
+    make_features,
+)
+from .infrastructure.services.prediction_intervals import (
+    BUCKET_MODES,
+    DEFAULT_COVERAGE,
+    check_quantile_levels,
+    conformal_quantile,
+    fit_interval_calibration,
+    interval_widths,
+    predict_quantiles,
+)
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DATA_PATH = BASE_DIR / 'Renewable.csv'
 ARTIFACTS_DIR = Path(__file__).resolve().parents[1] / 'artifacts'
+DATASET_CACHE_DIR = ARTIFACTS_DIR / 'dataset_cache'
+# Early stopping watches the last month of the training period, so the
+# validation split stays held out for the conformal interval calibration.
+STOP_START = '2021-12-01'
+TRAIN_END = '2022-01-01'
+VAL_END = '2022-07-01'
+
+QUANTILE_PARAMS = {
+    'objective': 'quantile',
+    'learning_rate': 0.05,
+    'num_leaves': 64,
+    'max_depth': -1,
+    'bagging_fraction': 0.9,
+    'feature_fraction': 0.8,
+    'lambda_l2': 0.1,
+    'lambda_l1': 0.05,
+    'verbosity': -1,
+}
+QUANTILE_ROUNDS = 2000
+QUANTILE_EARLY_STOPPING = 100
+
+MODEL_PARAMS = {
+    'objective': 'regression',
+    'metric': 'l2',
+    'learning_rate': 0.05,
+    'num_leaves': 64,
+    'max_depth': -1,
+    'bagging_fraction': 0.9,
+    'feature_fraction': 0.8,
+    'lambda_l2': 0.1,
+    'lambda_l1': 0.05,
+    'verbosity': -1,
+}
+MAX_ROUNDS = 2000
+EARLY_STOPPING_ROUNDS = 100
+LOSS_TOLERANCE = 0.01  # Accept up to 1% worse early-stopping loss for fewer trees
+LATENCY_REPEATS = 50
+LATENCY_BATCH_ROWS = 1000
 
 
 @dataclass
 class DatasetSplits:
     train_idx: pd.Index
+    stop_idx: pd.Index
     val_idx: pd.Index
     test_idx: pd.Index
 
 
+def _last_day(boundary: str) -> str:
+    """The calendar day before an exclusive split boundary."""
+    return (pd.Timestamp(boundary) - pd.Timedelta(days=1)).date().isoformat()
+
+
 def split_frame(frame: pd.DataFrame) -> DatasetSplits:
-    train_idx = frame.index < '2022-01-01'
-    val_idx = (frame.index >= '2022-01-01') & (frame.index < '2022-07-01')
-    test_idx = frame.index >= '2022-07-01'
-    return DatasetSplits(train_idx, val_idx, test_idx)
+    train_idx = frame.index < STOP_START
+    stop_idx = (frame.index >= STOP_START) & (frame.index < TRAIN_END)
+    val_idx = (frame.index >= TRAIN_END) & (frame.index < VAL_END)
+    test_idx = frame.index >= VAL_END
+    return DatasetSplits(train_idx, stop_idx, val_idx, test_idx)
 
 
 def _model_filename(horizon: int) -> Path:
@@ -40,35 +110,187 @@ def _metrics_filename(horizon: int) -> Path:
     return ARTIFACTS_DIR / f'metrics_h{horizon}.json'
 
 
-def train_model(data_path: Path = DATA_PATH, horizon: int = 1) -> dict:
+def _ensemble_filename(horizon: int) -> Path:
+    return ARTIFACTS_DIR / f'ensemble_h{horizon}.joblib'
+
+
+def train_ensemble_members(
+    frame: pd.DataFrame,
+    splits: DatasetSplits,
+    feature_cols: list[str],
+    n_jobs: Optional[int] = None,
+) -> dict:
+    """Fit the secondary ensemble members alongside the LightGBM model."""
+    random_forest = RandomForestRegressor(
+        n_estimators=200,
+        max_depth=12,
+        min_samples_split=4,
+        random_state=42,
+        n_jobs=n_jobs or -1,
+    )
+    # No early stopping here, so the forest also learns from the stopping slice.
+    fit_idx = splits.train_idx | splits.stop_idx
+    random_forest.fit(frame.loc[fit_idx, feature_cols], frame.loc[fit_idx, 'target'])
+    return {'random_forest': random_forest}
+
+
+def train_quantile_models(
+    frame: pd.DataFrame,
+    splits: DatasetSplits,
+    feature_cols: list[str],
+    quantiles: list[float],
+    n_jobs: Optional[int] = None,
+    datasets: Optional[tuple[lgb.Dataset, lgb.Dataset]] = None,
+) -> dict[float, lgb.Booster]:
+    """Fit one quantile-objective booster per level over a single binned Dataset.
+
+    Boosters early-stop on the stopping slice, keeping the validation split
+    unseen for the conformal correction.
+    """
+    levels = check_quantile_levels(quantiles)
+    params = {**QUANTILE_PARAMS, 'num_threads': n_jobs} if n_jobs else QUANTILE_PARAMS
+    train_set, valid_set = datasets or build_datasets(
+        (frame.loc[splits.train_idx, feature_cols], frame.loc[splits.train_idx, 'target']),
+        (frame.loc[splits.stop_idx, feature_cols], frame.loc[splits.stop_idx, 'target']),
+    )
+    boosters: dict[float, lgb.Booster] = {}
+    for alpha in levels:
+        boosters[alpha] = lgb.train(
+            {**params, 'alpha': alpha},
+            train_set,
+            num_boost_round=QUANTILE_ROUNDS,
+            valid_sets=[valid_set],
+            callbacks=[lgb.early_stopping(QUANTILE_EARLY_STOPPING, verbose=False)],
+        )
+    return boosters
+
+
+def select_tree_count(curve: np.ndarray, tolerance: float) -> int:
+    """Smallest number of trees whose early-stopping loss is within ``tolerance`` of the best."""
+    best = float(np.min(curve))
+    return int(np.argmax(curve <= best + tolerance * abs(best))) + 1
+
+
+def _single_row_ms(model: lgb.Booster, row: pd.DataFrame, num_iteration: Optional[int] = None) -> list[float]:
+    model.predict(row, num_iteration=num_iteration)
+    timings = []
+    for _ in range(LATENCY_REPEATS):
+        started = time.perf_counter()
+        model.predict(row, num_iteration=num_iteration)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def measure_predict_latency(model: lgb.Booster, features: pd.DataFrame) -> dict:
+    """Single-row and batch predict latency, timed the way the API calls the model."""
+    single = _single_row_ms(model, features.iloc[:1])
+    batch = features.iloc[:LATENCY_BATCH_ROWS]
+    started = time.perf_counter()
+    model.predict(batch)
+    batch_seconds = time.perf_counter() - started
+    return {
+        'single_row_p50_ms': float(np.percentile(single, 50)),
+        'single_row_p95_ms': float(np.percentile(single, 95)),
+        'batch_rows': len(batch),
+        'batch_ms': batch_seconds * 1000,
+        'batch_per_row_us': batch_seconds / len(batch) * 1e6,
+    }
+
+
+def fit_latency_budget(model: lgb.Booster, row: pd.DataFrame, n_trees: int, budget_ms: float) -> tuple[int, bool]:
+    """Largest tree count up to ``n_trees`` whose median single-row latency fits ``budget_ms``.
+
+    When even one tree misses the budget, per-call overhead dominates and
+    dropping trees would only cost accuracy, so ``n_trees`` is kept.
+    """
+    def fits(trees: int) -> bool:
+        return float(np.median(_single_row_ms(model, row, trees))) <= budget_ms
+
+    if fits(n_trees):
+        return n_trees, True
+    if not fits(1):
+        return n_trees, False
+    lo, hi = 1, n_trees
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        lo, hi = (mid, hi) if fits(mid) else (lo, mid)
+    return lo, True
+
+
+def train_model(
+    data_path: Path = DATA_PATH,
+    horizon: int = 1,
+    ensemble: bool = False,
+    coverage: float = DEFAULT_COVERAGE,
+    calibration_bucket: str = 'hour',
+    quantiles: Optional[list[float]] = None,
+) -> dict:
+    frame = make_features(_load_history(data_path), horizon=horizon)
+    return fit_horizon(frame, horizon, ensemble, coverage, calibration_bucket, quantiles)
+
+
+def _load_history(data_path: Path) -> pd.DataFrame:
     if not data_path.exists():
         raise FileNotFoundError(f'Dataset not found at {data_path}')
+    return CSVHistoryRepository(data_path).load()
+
+
+def fit_horizon(
+    frame: pd.DataFrame,
+    horizon: int,
+    ensemble: bool = False,
+    coverage: float = DEFAULT_COVERAGE,
+    calibration_bucket: str = 'hour',
+    quantiles: Optional[list[float]] = None,
+    n_jobs: Optional[int] = None,
+    early_stopping_rounds: Optional[int] = EARLY_STOPPING_ROUNDS,
+    latency_budget_ms: Optional[float] = None,
+    loss_tolerance: float = LOSS_TOLERANCE,
+    dataset_cache: Optional[DatasetCache] = None,
+    cache_key: Optional[str] = None,
+) -> dict:
+    """Train, evaluate and persist the models for one horizon from its feature frame.
 
-    raw = pd.read_csv(data_path)
-    frame = make_features(raw, horizon=horizon)
+    Boosting stops once the loss on the stopping slice has not improved for
+    ``early_stopping_rounds``; the validation split is only used for interval
+    calibration. With a ``latency_budget_ms`` the model is cut to the
+    smallest tree count within ``loss_tolerance`` of the best stopping
+    loss, and further if its single-row latency would still
+    exceed the budget. Given a ``dataset_cache`` and the ``cache_key`` of
+    the feature matrix, binned Datasets are reused across runs.
+    """
     splits = split_frame(frame)
     feature_cols = [c for c in frame.columns if c not in {'energy_wh', 'target'}]
+    train = frame.loc[splits.train_idx, feature_cols], frame.loc[splits.train_idx, 'target']
+    stop = frame.loc[splits.stop_idx, feature_cols], frame.loc[splits.stop_idx, 'target']
 
-    model = LGBMRegressor(
-        n_estimators=2000,
-        learning_rate=0.05,
-        num_leaves=64,
-        max_depth=-1,
-        subsample=0.9,
-        colsample_bytree=0.8,
-        reg_lambda=0.1,
-        reg_alpha=0.05,
-    )
+    if dataset_cache is not None and cache_key is not None:
+        datasets = dataset_cache.datasets(
+            DatasetCache.key(cache_key, horizon, STOP_START, TRAIN_END, DATASET_PARAMS),
+            train,
+            stop,
+        )
+    else:
+        datasets = build_datasets(train, stop)
 
-    model.fit(
-        frame.loc[splits.train_idx, feature_cols],
-        frame.loc[splits.train_idx, 'target'],
-        eval_set=[(
-            frame.loc[splits.val_idx, feature_cols],
-            frame.loc[splits.val_idx, 'target'],
-        )],
-        eval_metric='l2',
-    )
+    evals: dict = {}
+    callbacks = [lgb.record_evaluation(evals)]
+    if early_stopping_rounds:
+        callbacks.append(lgb.early_stopping(early_stopping_rounds, verbose=False))
+    params = {**MODEL_PARAMS, 'num_threads': n_jobs} if n_jobs else MODEL_PARAMS
+    model = lgb.train(params, datasets[0], num_boost_round=MAX_ROUNDS, valid_sets=[datasets[1]], callbacks=callbacks)
+
+    curve = np.asarray(evals['valid_0']['l2'])
+    fitted_trees = len(curve)
+    best_trees = int(model.best_iteration or fitted_trees)
+    n_trees = best_trees
+    latency_budget_met = None
+    if latency_budget_ms is not None:
+        n_trees = min(n_trees, select_tree_count(curve, loss_tolerance))
+        n_trees, latency_budget_met = fit_latency_budget(model, stop[0].iloc[:1], n_trees, latency_budget_ms)
+    if n_trees < fitted_trees:
+        # Keep only the trees predict will use, so the artifact carries nothing extra.
+        model = lgb.Booster(model_str=model.model_to_string(num_iteration=n_trees))
 
     preds = model.predict(frame.loc[splits.test_idx, feature_cols])
     y_true = frame.loc[splits.test_idx, 'target']
@@ -76,27 +298,173 @@ def train_model(data_path: Path = DATA_PATH, horizon: int = 1) -> dict:
     mse = mean_squared_error(y_true, preds)
     rmse = float(np.sqrt(mse))
 
+    val_features = frame.loc[splits.val_idx, feature_cols]
+    val_residuals = frame.loc[splits.val_idx, 'target'].to_numpy() - model.predict(val_features)
+    calibration = fit_interval_calibration(val_residuals, val_features, coverage, calibration_bucket)
+    halfwidths, _ = interval_widths(calibration, frame.loc[splits.test_idx, feature_cols])
+    interval_coverage = float(np.mean(np.abs(y_true.to_numpy() - preds) <= halfwidths))
+
+    quantile_models: dict[float, lgb.Booster] = {}
+    quantile_coverage = None
+    if quantiles:
+        quantile_models = train_quantile_models(frame, splits, feature_cols, quantiles, n_jobs, datasets)
+        # Conformalised quantile regression: widen the outer band by the validation miss margin.
+        val_bands = predict_quantiles(quantile_models, val_features)
+        val_target = frame.loc[splits.val_idx, 'target'].to_numpy()
+        nominal = max(quantile_models) - min(quantile_models)
+        scores = np.maximum(val_bands[:, 0] - val_target, val_target - val_bands[:, -1])
+        correction = conformal_quantile(scores, nominal)
+        calibration['quantiles'] = {
+            'levels': sorted(quantile_models),
+            'coverage': nominal,
+            'correction': correction,
+        }
+        test_bands = predict_quantiles(quantile_models, frame.loc[splits.test_idx, feature_cols])
+        y_test = y_true.to_numpy()
+        quantile_coverage = float(np.mean(
+            (y_test >= test_bands[:, 0] - correction) & (y_test <= test_bands[:, -1] + correction)
+        ))
+
     ARTIFACTS_DIR.mkdir(exist_ok=True)
     payload = {
         'model': model,
         'features': feature_cols,
         'horizon': horizon,
+        'calibration': calibration,
+        'quantile_models': quantile_models,
+        # Last calendar day of each split; the booster is fitted on the rows through
+        # train_end and early-stopped on stop_start..stop_end.
         'trained_on': {
-            'train_end': '2021-12-31',
-            'val_end': '2022-06-30',
+            'train_end': _last_day(STOP_START),
+            'stop_start': STOP_START,
+            'stop_end': _last_day(TRAIN_END),
+            'val_end': _last_day(VAL_END),
+            # Training and interval calibration consumed everything up to the end of validation.
+            'trained_through': str(frame.index[splits.val_idx].max()),
         },
+        'version': 1,
     }
     joblib.dump(payload, _model_filename(horizon))
     if horizon == 1:
         joblib.dump(payload, ARTIFACTS_DIR / 'model.joblib')
 
-    metrics = {'horizon': horizon, 'mae': mae, 'rmse': rmse}
+    metrics = {
+        'horizon': horizon,
+        'mae': mae,
+        'rmse': rmse,
+        'interval_coverage_target': coverage,
+        'interval_coverage': interval_coverage,
+        'n_trees': model.num_trees(),
+        'best_iteration': best_trees,
+        'rounds_fitted': fitted_trees,
+        'stop_l2_best': float(curve[best_trees - 1]),
+        'stop_l2_selected': float(curve[n_trees - 1]),
+        'model_size_bytes': len(model.model_to_string().encode('utf-8')),
+        'artifact_size_bytes': _model_filename(horizon).stat().st_size,
+        'predict_latency': measure_predict_latency(model, frame.loc[splits.test_idx, feature_cols]),
+    }
+    if latency_budget_ms is not None:
+        metrics['latency_budget_ms'] = latency_budget_ms
+        metrics['loss_tolerance'] = loss_tolerance
+        metrics['latency_budget_met'] = latency_budget_met
+    if quantile_coverage is not None:
+        metrics['quantile_levels'] = sorted(quantile_models)
+        metrics['quantile_coverage'] = quantile_coverage
+
+    if ensemble:
+        members = train_ensemble_members(frame, splits, feature_cols, n_jobs)
+        joblib.dump(
+            {'models': members, 'features': feature_cols, 'horizon': horizon},
+            _ensemble_filename(horizon),
+        )
+        member_metrics = {}
+        for name, member in members.items():
+            member_preds = member.predict(frame.loc[splits.test_idx, feature_cols])
+            member_metrics[name] = {
+                'mae': float(mean_absolute_error(y_true, member_preds)),
+                'rmse': float(np.sqrt(mean_squared_error(y_true, member_preds))),
+            }
+        metrics['ensemble'] = member_metrics
     _metrics_filename(horizon).write_text(json.dumps(metrics, indent=2))
     if horizon == 1:
         (ARTIFACTS_DIR / 'metrics.json').write_text(json.dumps(metrics, indent=2))
     return metrics
 
 
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_training_worker(matrix: pd.DataFrame, options: Dict[str, Any], threads: int) -> None:
+    _WORKER_STATE.update(matrix=matrix, options=options, threads=threads)
+
+
+def _train_pooled_horizon(horizon: int) -> dict:
+    frame = horizon_frame(_WORKER_STATE['matrix'], horizon)
+    return fit_horizon(frame, horizon, n_jobs=_WORKER_STATE['threads'], **_WORKER_STATE['options'])
+
+
+def train_horizons(
+    data_path: Path = DATA_PATH,
+    horizons: Optional[list[int]] = None,
+    workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    cache_dir: Optional[Path] = DATASET_CACHE_DIR,
+    **options: Any,
+) -> Dict[int, dict]:
+    """Parse the data and build features once, then train the horizons in parallel processes.
+
+    Each worker gets ``threads_per_worker`` LightGBM/sklearn threads
+    (default: an even share of the cores) so the processes do not
+    oversubscribe the CPU. With one worker the horizons train in-process.
+    With a ``cache_dir`` the feature matrix and binned Datasets are keyed by
+    the raw data fingerprint and reused until the data or feature
+    configuration changes. ``options`` are passed through to ``fit_horizon``.
+    """
+    horizons = sorted(set(horizons or [1]))
+    if options.get('quantiles'):
+        # Fail before the feature matrix is built rather than after the main models train.
+        check_quantile_levels(options['quantiles'])
+    if cache_dir is None:
+        matrix = make_feature_matrix(_load_history(data_path), horizons)
+    else:
+        cache = DatasetCache(cache_dir)
+        cache_key = DatasetCache.key(CSVHistoryRepository(data_path).content_fingerprint(), feature_config())
+        cached = cache.load_features(cache_key)
+        if cached is None:
+            cached = make_feature_base(_load_history(data_path))
+            cache.save_features(cache_key, *cached)
+        matrix = add_targets(*cached, horizons)
+        options = {**options, 'dataset_cache': cache, 'cache_key': cache_key}
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or cores, len(horizons)))
+    threads = threads_per_worker or max(1, cores // workers)
+
+    if workers == 1:
+        return {
+            horizon: fit_horizon(horizon_frame(matrix, horizon), horizon, n_jobs=threads, **options)
+            for horizon in horizons
+        }
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_training_worker,
+        initargs=(matrix, options, threads),
+    ) as pool:
+        return dict(zip(horizons, pool.map(_train_pooled_horizon, horizons)))
+
+
+def train_anomaly_detector(data_path: Path, rows: int = DEFAULT_FIT_ROWS) -> dict:
+    """Fit the data-quality anomaly detector on the latest ``rows`` and persist it."""
+    data = CSVHistoryRepository(data_path).load(limit=rows)
+    payload = fit_anomaly_detector(data)
+    ArtifactAnomalyDetectorRepository(ARTIFACTS_DIR / 'anomaly_detector.joblib').save(payload)
+    return {
+        'columns': payload['columns'],
+        'scored_rows': payload['scored_rows'],
+        'anomalies': payload['anomalies'],
+        'scored_through': str(payload['scored_through']),
+    }
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description='Train LightGBM forecaster')
     parser.add_argument('--data', type=Path, default=DATA_PATH, help='Path to Renewable.csv')
@@ -112,16 +480,94 @@ def parse_args() -> argparse.Namespace:
         nargs='+',
         help='Train multiple horizons in one go (e.g. --horizons 1 4 8 24 48)',
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Horizons trained in parallel processes (defaults to the CPU count)',
+    )
+    parser.add_argument(
+        '--threads-per-worker',
+        type=int,
+        help='LightGBM/sklearn threads per training process (defaults to an even share of the cores)',
+    )
+    parser.add_argument(
+        '--early-stopping-rounds',
+        type=int,
+        default=EARLY_STOPPING_ROUNDS,
+        help='Stop boosting after this many rounds without improvement on the stopping slice (0 disables)',
+    )
+    parser.add_argument(
+        '--latency-budget-ms',
+        type=float,
+        help='Single-row predict latency budget; picks the smallest tree count within --loss-tolerance',
+    )
+    parser.add_argument(
+        '--loss-tolerance',
+        type=float,
+        default=LOSS_TOLERANCE,
+        help='Relative early-stopping loss increase accepted for fewer trees under a latency budget',
+    )
+    parser.add_argument(
+        '--coverage',
+        type=float,
+        default=DEFAULT_COVERAGE,
+        help='Target coverage of the conformal prediction intervals stored with the model',
+    )
+    parser.add_argument(
+        '--calibration-bucket',
+        choices=BUCKET_MODES,
+        default='hour',
+        help='Bucket interval calibration by hour of day, irradiance level, or not at all',
+    )
+    parser.add_argument(
+        '--quantiles',
+        type=float,
+        nargs='+',
+        help='Also fit quantile LightGBM models for probabilistic bands; at least two levels (e.g. --quantiles 0.1 0.5 0.9)',
+    )
+    parser.add_argument(
+        '--ensemble',
+        action='store_true',
+        help='Also train and persist the random forest ensemble members used by ensemble_mode',
+    )
+    parser.add_argument(
+        '--anomaly-detector',
+        action='store_true',
+        help='Refit the persisted data-quality anomaly detector on the latest history rows',
+    )
+    parser.add_argument(
+        '--dataset-cache',
+        type=Path,
+        default=DATASET_CACHE_DIR,
+        help='Directory for cached feature matrices and binned LightGBM datasets',
+    )
+    parser.add_argument(
+        '--no-dataset-cache',
+        action='store_true',
+        help='Rebuild features and datasets from scratch without reading or writing the cache',
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
     horizons = args.horizons or [args.horizon]
-    results = {}
-    for horizon in horizons:
-        metrics = train_model(args.data, horizon)
-        results[horizon] = metrics
+    results: Dict[Any, dict] = train_horizons(
+        args.data,
+        horizons,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        cache_dir=None if args.no_dataset_cache else args.dataset_cache,
+        ensemble=args.ensemble,
+        coverage=args.coverage,
+        calibration_bucket=args.calibration_bucket,
+        quantiles=args.quantiles,
+        early_stopping_rounds=args.early_stopping_rounds,
+        latency_budget_ms=args.latency_budget_ms,
+        loss_tolerance=args.loss_tolerance,
+    )
+    if args.anomaly_detector:
+        results['anomaly_detector'] = train_anomaly_detector(args.data)
     if len(results) == 1:
         print(json.dumps(next(iter(results.values())), indent=2))
     else:
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare pydantic response construction against the fast JSON path.
+
+Run from the backend directory: ``python -m benchmarks.serialization_benchmark``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from app.api.schemas import ScenarioForecastResponse
+from app.api.serialization import FastJSONResponse, orjson, project_records
+
+
+def build_records(count: int) -> List[Dict[str, Any]]:
+    base = datetime(2022, 7, 1)
+    records = [
+        {
+            'scenario_id': idx % 100,
+            'scenario_name': f'Scenario {idx % 100 + 1}',
+            'prediction_wh': 412.5 + idx * 0.01,
+            'horizon_steps': 4,
+            'timestamp': (base + timedelta(minutes=15 * idx)).isoformat(),
+            'step_index': idx % 4 + 1,
+            'weather_conditions': {'GHI': 600, 'temp': 22},
+            'confidence_interval': {'lower': 380.0, 'upper': 445.0, 'std': 16.5},
+        }
+        for idx in range(count)
+    ]
+    # Scenarios that fail to build come back as error records without a prediction.
+    for idx in range(0, count, 100):
+        records[idx] = {
+            'scenario_id': idx % 100,
+            'scenario_name': f'Scenario {idx % 100 + 1}',
+            'prediction_wh': None,
+            'horizon_steps': 4,
+            'error': 'could not convert string to float',
+            'timestamp': base.isoformat(),
+        }
+    return records
+
+
+def pydantic_path(records: List[Dict[str, Any]]) -> bytes:
+    # Mirrors FastAPI: model construction, response_model validation, jsonable_encoder, JSONResponse.
+    models = [ScenarioForecastResponse(**item) for item in records]
+    validated = [ScenarioForecastResponse.model_validate(model.model_dump()) for model in models]
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def fast_path(records: List[Dict[str, Any]]) -> bytes:
+    return FastJSONResponse(project_records(records, ScenarioForecastResponse)).body
+
+
+def check_equivalence(records: List[Dict[str, Any]]) -> None:
+    """Both paths must produce the same JSON, and reject the same invalid records."""
+    if json.loads(fast_path(records)) != json.loads(pydantic_path(records)):
+        raise SystemExit('fast path output differs from the pydantic path')
+    invalid = [{'scenario_id': 0, 'scenario_name': 'Scenario 1', 'error': 'missing horizon'}]
+    for func in (pydantic_path, fast_path):
+        try:
+            func(invalid)
+        except ValidationError:
+            continue
+        raise SystemExit(f'{func.__name__} accepted a record without a required field')
+
+
+def best_of(func: Callable[[List[Dict[str, Any]]], bytes], records: List[Dict[str, Any]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(records)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark forecast response serialization.')
+    parser.add_argument('--records', type=int, default=10_000, help='Number of forecast records per batch.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs (best is reported).')
+    args = parser.parse_args()
+
+    records = build_records(args.records)
+    check_equivalence(records)
+    baseline = best_of(pydantic_path, records, args.repeat)
+    fast = best_of(fast_path, records, args.repeat)
+
+    encoder = 'orjson' if orjson is not None else 'json'
+    print(f'records:        {args.records}')
+    print(f'pydantic path:  {baseline * 1000:.1f} ms')
+    print(f'fast path:      {fast * 1000:.1f} ms ({encoder})')
+    print(f'speedup:        {baseline / fast:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
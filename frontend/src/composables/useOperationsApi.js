@@ -16,5 +16,10 @@ export function useOperationsApi() {
     return data;
   };
 
-  return { fetchHistoricalAnalysis, fetchModelStatus, triggerModelRetrain };
+  const fetchRetrainJob = async (jobId) => {
+    const { data } = await apiClient.get(`/models/retrain/${jobId}`);
+    return data;
+  };
+
+  return { fetchHistoricalAnalysis, fetchModelStatus, triggerModelRetrain, fetchRetrainJob };
 }
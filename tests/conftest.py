@@ -0,0 +1,82 @@
+"""Shared fixtures for the backend unit tests.
+
+``test_enhanced_features.py`` is a smoke script against a running server and
+is run directly, not collected here.
+"""
+
+import sys
+from pathlib import Path
+
+import lightgbm as lgb
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from app.domain.entities import ModelState  # noqa: E402
+from app.infrastructure.services.feature_engineering import make_features  # noqa: E402
+
+collect_ignore = ['test_enhanced_features.py']
+
+DATASET = ROOT / 'Renewable.csv'
+# Weather drivers a caller supplies in future_weather; clock and sun columns are derived.
+WEATHER_DRIVERS = (
+    'GHI', 'temp', 'pressure', 'humidity', 'wind_speed', 'rain_1h', 'snow_1h', 'clouds_all', 'weather_type',
+)
+
+
+class NonNegativeModel:
+    """Clips predictions at zero, as energy readings below zero are dropped when features are rebuilt."""
+
+    def __init__(self, model) -> None:
+        self._model = model
+
+    def predict(self, features, **kwargs):
+        return self._model.predict(features, **kwargs).clip(min=0.0)
+
+
+class StaticModelGateway:
+    def __init__(self, state: ModelState) -> None:
+        self.state = state
+
+    def is_ready(self, horizon=None) -> bool:
+        return True
+
+    def available_horizons(self) -> list[int]:
+        return [self.state.horizon]
+
+    def get_state(self, horizon=None) -> ModelState:
+        return self.state
+
+    def get_ensemble_members(self, horizon: int) -> dict:
+        return {}
+
+
+class FrameHistoryGateway:
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.frame = frame
+
+    def load(self, limit=None) -> pd.DataFrame:
+        return self.frame.tail(limit).copy() if limit else self.frame.copy()
+
+
+@pytest.fixture(scope='session')
+def raw() -> pd.DataFrame:
+    """Two months of summer readings from the bundled dataset."""
+    frame = pd.read_csv(DATASET)
+    times = pd.to_datetime(frame['Time'], dayfirst=True)
+    return frame[(times >= '2022-05-01') & (times < '2022-07-01')].reset_index(drop=True)
+
+
+@pytest.fixture(scope='session')
+def model_state(raw: pd.DataFrame) -> ModelState:
+    """A small horizon-1 booster over the full production feature set."""
+    train = make_features(raw.iloc[:-4 * 96], horizon=1)
+    features = [column for column in train.columns if column not in {'energy_wh', 'target'}]
+    booster = lgb.train(
+        {'objective': 'regression', 'learning_rate': 0.1, 'num_leaves': 15, 'verbosity': -1, 'num_threads': 1},
+        lgb.Dataset(train[features], train['target']),
+        num_boost_round=60,
+    )
+    return ModelState(model=NonNegativeModel(booster), features=features, horizon=1, metrics={})
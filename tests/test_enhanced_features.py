@@ -144,15 +144,15 @@ def test_model_management():
     print("[TEST] Testing Model Management...")
     
     tests = [
-        ("GET", "/models/status"),
-        ("POST", "/models/retrain"),
+        ("GET", "/models/status", 200),
+        ("POST", "/models/retrain", 202),
     ]
     
     passed = 0
     total = len(tests)
     
-    for method, endpoint in tests:
-        if test_endpoint(method, endpoint):
+    for method, endpoint, expected_status in tests:
+        if test_endpoint(method, endpoint, expected_status=expected_status):
             passed += 1
     
     print(f"Model Management: {passed}/{total} passed\n")
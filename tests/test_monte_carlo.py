@@ -0,0 +1,47 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+from conftest import WEATHER_DRIVERS, FrameHistoryGateway, StaticModelGateway
+
+from app.application import advanced_forecasting_service
+from app.application.advanced_forecasting_service import AdvancedForecastingService
+from app.infrastructure.services.feature_engineering import FeatureEngineer
+
+STEPS = 96
+
+
+def monte_carlo_inputs(raw: pd.DataFrame, origin: str) -> tuple[pd.DataFrame, list[dict]]:
+    times = pd.to_datetime(raw['Time'], dayfirst=True)
+    history = raw[times <= origin].tail(500).reset_index(drop=True)
+    future = raw[times > origin].head(STEPS)[['Time', *WEATHER_DRIVERS]]
+    return history, future.to_dict('records')
+
+
+def test_monte_carlo_bands_collapse_at_night(raw, model_state):
+    history, future = monte_carlo_inputs(raw, '2022-06-27 16:00')
+    service = AdvancedForecastingService(StaticModelGateway(model_state), FeatureEngineer(), FrameHistoryGateway(history))
+
+    result = service.forecast_monte_carlo(future, steps=STEPS, samples=200, seed=0)
+
+    hours = pd.to_datetime(result['timestamps']).hour
+    night = hours.isin([22, 23, 0, 1, 2])
+    upper, lower = np.array(result['percentiles']['p95']), np.array(result['percentiles']['p5'])
+    assert upper[night].max() < 5.0
+    # The weather noise still spreads the bands once the sun is back up.
+    morning = hours.isin([9, 10, 11])
+    assert (upper - lower)[morning].mean() > 20.0
+
+
+def test_monte_carlo_reduces_samples_to_the_tree_budget(raw, model_state, monkeypatch):
+    history, future = monte_carlo_inputs(raw, '2022-06-27 16:00')
+    booster = model_state.model._model
+    state = replace(model_state, model=booster)
+    service = AdvancedForecastingService(StaticModelGateway(state), FeatureEngineer(), FrameHistoryGateway(history))
+    monkeypatch.setattr(advanced_forecasting_service, 'MONTE_CARLO_TREE_BUDGET', booster.num_trees() * STEPS * 10)
+
+    result = service.forecast_monte_carlo(future, steps=STEPS, samples=1000, seed=0)
+
+    assert result['samples'] == 10
+    assert result['requested_samples'] == 1000
+    assert len(result['mean']) == STEPS
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import WEATHER_DRIVERS, FrameHistoryGateway, StaticModelGateway
+
+from app.application.services import ForecastingService
+from app.infrastructure.services.feature_engineering import (
+    FeatureEngineer,
+    SLOTS_PER_DAY,
+    feature_frame,
+    make_feature_base,
+)
+
+STEPS = 96
+
+
+def split_at(raw: pd.DataFrame, origin: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    times = pd.to_datetime(raw['Time'], dayfirst=True)
+    history = raw[times <= origin].tail(500).reset_index(drop=True)
+    future = raw[times > origin].head(STEPS).reset_index(drop=True)
+    return history, future
+
+
+def weather_payload(future: pd.DataFrame) -> list[dict]:
+    return future[['Time', *WEATHER_DRIVERS]].to_dict('records')
+
+
+def rebuild(history: pd.DataFrame, future: pd.DataFrame, state) -> np.ndarray:
+    """Recompute ``make_features`` for every step, feeding predictions back as energy.
+
+    The row at ``t`` predicts ``t+1``, so step ``k`` scores the row of the
+    ``k-1``-th future slot, and slots without sun produce nothing. Future rows
+    carry only the weather drivers;
+    ``hour`` and ``month`` come from the timestamp and the sun columns from
+    the same slot a day earlier.
+    """
+    rows = future[['Time', *WEATHER_DRIVERS]].copy()
+    times = pd.to_datetime(rows['Time'], dayfirst=True)
+    rows['hour'] = times.dt.hour
+    rows['month'] = times.dt.month
+    for column in ('isSun', 'sunlightTime', 'dayLength', 'SunlightTime/daylength'):
+        rows[column] = history[column].iloc[-SLOTS_PER_DAY:].to_numpy()
+
+    predictions = np.empty(STEPS)
+    for step in range(STEPS):
+        combined = pd.concat([history, rows.iloc[:step]], ignore_index=True)
+        features, _ = make_feature_base(combined)
+        latest = features[state.features].to_numpy(dtype=float)[-1:]
+        predictions[step] = state.model.predict(feature_frame(latest, state.features))[0]
+        if rows.loc[step, 'isSun'] == 0:
+            predictions[step] = 0.0
+        rows.loc[step, 'Energy delta[Wh]'] = predictions[step]
+    return predictions
+
+
+def service_for(history: pd.DataFrame, state) -> ForecastingService:
+    return ForecastingService(StaticModelGateway(state), FrameHistoryGateway(history), FeatureEngineer())
+
+
+def test_recursive_forecast_matches_step_by_step_rebuild(raw, model_state):
+    history, future = split_at(raw, '2022-06-27 16:00')
+    service = service_for(history, model_state)
+
+    records = service.forecast_recursive({'steps': STEPS, 'future_weather': weather_payload(future)})
+    engine = np.array([record['prediction_wh'] for record in records])
+
+    np.testing.assert_allclose(engine, rebuild(history, future, model_state), rtol=1e-9, atol=1e-6)
+    night = pd.to_datetime([record['timestamp'] for record in records]).hour.isin([22, 23, 0, 1, 2])
+    assert engine[night].max() < 5.0
+
+
+def test_recursive_forecast_rejects_missing_weather_drivers(raw, model_state):
+    history, future = split_at(raw, '2022-06-27 16:00')
+    service = service_for(history, model_state)
+
+    with pytest.raises(ValueError, match='pressure'):
+        service.forecast_recursive({'steps': STEPS, 'future_weather': future[['Time', 'GHI', 'temp']].to_dict('records')})
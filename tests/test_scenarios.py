@@ -0,0 +1,48 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+from conftest import FrameHistoryGateway, StaticModelGateway
+
+from app.application.advanced_forecasting_service import AdvancedForecastingService
+from app.infrastructure.services.feature_engineering import FeatureEngineer
+
+HORIZON = 16
+
+
+class RecordingModel:
+    """Returns each row's ``hour`` column, so the predictions expose the features scored."""
+
+    def __init__(self, features: list[str]) -> None:
+        self._hour = features.index('hour')
+
+    def predict(self, features):
+        return features.to_numpy()[:, self._hour]
+
+
+def scenario_service(raw, model_state, model=None) -> AdvancedForecastingService:
+    times = pd.to_datetime(raw['Time'], dayfirst=True)
+    history = raw[times <= '2022-06-27 21:00'].tail(500).reset_index(drop=True)
+    state = replace(model_state, horizon=HORIZON, model=model or model_state.model)
+    return AdvancedForecastingService(StaticModelGateway(state), FeatureEngineer(), FrameHistoryGateway(history))
+
+
+def test_scenario_steps_advance_the_clock(raw, model_state):
+    service = scenario_service(raw, model_state, RecordingModel(model_state.features))
+
+    records = service.forecast_multiple_scenarios([{'GHI': 0.0}], horizon=HORIZON)
+
+    hours = [record['prediction_wh'] for record in records]
+    assert hours == [float(pd.Timestamp(record['timestamp']).hour) for record in records]
+    assert hours[0] == 21.0 and hours[-1] == 1.0
+
+
+def test_grid_matches_scenarios_step_for_step(raw, model_state):
+    service = scenario_service(raw, model_state)
+    values = [0.0, 300.0, 700.0]
+
+    grid = service.forecast_scenario_grid({'GHI': {'values': values}}, horizon=HORIZON)
+    records = service.forecast_multiple_scenarios([{'GHI': value} for value in values], horizon=HORIZON)
+
+    expected = np.array([record['prediction_wh'] for record in records])
+    np.testing.assert_allclose(grid['predictions'], expected)
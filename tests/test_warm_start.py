@@ -0,0 +1,53 @@
+import lightgbm as lgb
+import pandas as pd
+import pytest
+
+from app.infrastructure.services.feature_engineering import make_features
+from app.infrastructure.services.warm_start import MIN_CALIBRATION_ROWS, warm_start
+
+PREVIOUS_CALIBRATION = {
+    'coverage': 0.9,
+    'bucket': 'hour',
+    'global': {'halfwidth': 123.0, 'std': 45.0},
+    'buckets': {},
+    'quantiles': {'coverage': 0.8},
+}
+
+
+@pytest.fixture(scope='module')
+def frame(raw):
+    return make_features(raw, horizon=1)
+
+
+@pytest.fixture(scope='module')
+def weak_model(model_state):
+    """A truncated copy of the test booster, so continued boosting is accepted."""
+    booster = model_state.model._model
+    return lgb.Booster(model_str=booster.model_to_string(num_iteration=3))
+
+
+def test_small_window_keeps_the_previous_calibration(frame, weak_model, model_state):
+    watermark = frame.index[-3 * 96 - 1]
+
+    result = warm_start(frame, weak_model, model_state.features, watermark, PREVIOUS_CALIBRATION, rounds=20)
+
+    assert result['status'] == 'accepted'
+    assert result['calibration_rows'] == 0
+    assert result['calibration'] is PREVIOUS_CALIBRATION
+    # The held-out rows only chose the candidate, so later runs may train on them.
+    assert pd.Timestamp(result['trained_through']) < pd.Timestamp(result['holdout_start'])
+
+
+def test_calibration_slice_is_disjoint_from_the_holdout(frame, weak_model, model_state):
+    watermark = frame.index[-4 * MIN_CALIBRATION_ROWS - 1]
+
+    result = warm_start(frame, weak_model, model_state.features, watermark, PREVIOUS_CALIBRATION, rounds=20)
+
+    assert result['status'] == 'accepted'
+    assert result['calibration_rows'] == MIN_CALIBRATION_ROWS
+    assert result['holdout_rows'] == MIN_CALIBRATION_ROWS
+    calibration = result['calibration']
+    assert calibration['global'] != PREVIOUS_CALIBRATION['global']
+    assert (calibration['coverage'], calibration['bucket']) == (0.9, 'hour')
+    assert calibration['quantiles'] == PREVIOUS_CALIBRATION['quantiles']
+    assert result['trained_through'] == str(frame.index[-1])